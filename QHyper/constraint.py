@@ -20,29 +20,35 @@ hand sides of the constraints, and the operator.
 
 """
 
+import hashlib
 import uuid
 from enum import Enum
 
-from QHyper.polynomial import Polynomial, PolynomialType
+from QHyper.polynomial import Polynomial, CompiledPolynomial, PolynomialType
 
 
 class MethodsForInequalities(Enum):
     """Enum class with different methods for handling inequalities.
 
-    There are two available methods for handling inequalities:
+    There are three available methods for handling inequalities:
     .. list-table::
 
         * - SLACKS_LOG_2
-          - UNBALANCED_PENALIZATION 
+          - UNBALANCED_PENALIZATION
+          - BOUNDED_SLACKS
         * - the method uses slack variables in number of log2(n)
           - the method uses unbalanced penalization
+          - the method uses log2 slack variables sized from the range
+            of the left hand side, no slacks if it can't be violated
     """
     SLACKS_LOG_2 = 0
     UNBALANCED_PENALIZATION = 1
+    BOUNDED_SLACKS = 2
 
 
 SLACKS_LOG_2 = MethodsForInequalities.SLACKS_LOG_2
 UNBALANCED_PENALIZATION = MethodsForInequalities.UNBALANCED_PENALIZATION
+BOUNDED_SLACKS = MethodsForInequalities.BOUNDED_SLACKS
 
 
 class Operator(Enum):
@@ -66,8 +72,9 @@ class Constraint:
     operator : Operator, default Operator.EQ
         The operator of the constraint. It can be ==, >=, <=.
     method_for_inequalities : MethodsForInequalities, optional
-        The method to be used for inequalities. It can be SLACKS_LOG_2 or
-        UNBALANCED_PENALIZATION. It is required when the operator is not ==.
+        The method to be used for inequalities. It can be SLACKS_LOG_2,
+        UNBALANCED_PENALIZATION or BOUNDED_SLACKS. It is required when the
+        operator is not ==.
     label : str, optional
         The label of the constraint. If not provided, it will be set to a
         random string.
@@ -86,8 +93,10 @@ class Constraint:
         label: str = "",
         group: int = -1,
     ) -> None:
-        self.lhs = lhs if isinstance(lhs, Polynomial) else Polynomial(lhs)
-        self.rhs = rhs if isinstance(rhs, Polynomial) else Polynomial(rhs)
+        self.lhs = (lhs if isinstance(lhs, (Polynomial, CompiledPolynomial))
+                    else Polynomial(lhs))
+        self.rhs = (rhs if isinstance(rhs, (Polynomial, CompiledPolynomial))
+                    else Polynomial(rhs))
         self.operator: Operator = operator
 
         if operator != Operator.EQ and method_for_inequalities is None:
@@ -108,6 +117,28 @@ class Constraint:
     def get_variables(self) -> set[str]:
         return self.lhs.get_variables() | self.rhs.get_variables()
 
+    def fingerprint(self) -> str:
+        """Returns the structural hash of the constraint.
+
+        The hash covers both sides, the operator, the method for
+        inequalities and the group. The label is included only for
+        inequalities handled with slack variables, because it determines
+        the names of the slack variables.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        parts = [
+            self.lhs.fingerprint(), self.rhs.fingerprint(),
+            self.operator.value, str(self.group),
+            self.method_for_inequalities.name
+            if self.method_for_inequalities else "",
+        ]
+        if (self.operator != Operator.EQ
+                and self.method_for_inequalities in (
+                    SLACKS_LOG_2, BOUNDED_SLACKS)):
+            parts.append(self.label)
+        digest.update("\n".join(parts).encode())
+        return digest.hexdigest()
+
 
 def get_number_of_constraints(constraints: list[Constraint]) -> int:
     """Returns the number of unique groups in the constraints list.
@@ -13,28 +13,244 @@ objects to ConstrainedQuadraticModel, DiscreteQuadraticModel, and QUBO formats.
     :toctree: generated
     
     Converter
+    ParametricQubo
+    IsingModel
 
 """
 
 
-from typing import cast
+import itertools
+from dataclasses import dataclass, field
+from typing import Sequence, cast
 
 import dimod
 import re
 import warnings
-from dimod import ConstrainedQuadraticModel, DiscreteQuadraticModel
-from QHyper.polynomial import Polynomial
+import scipy.sparse
+from dimod import (
+    BinaryQuadraticModel, ConstrainedQuadraticModel, DiscreteQuadraticModel)
+from QHyper.polynomial import (
+    Polynomial, CompiledPolynomial, PolynomialBuilder)
 from QHyper.constraint import (
-    Constraint, SLACKS_LOG_2, UNBALANCED_PENALIZATION, Operator)
-from QHyper.problems.base import Problem
+    Constraint, MethodsForInequalities, SLACKS_LOG_2, UNBALANCED_PENALIZATION,
+    BOUNDED_SLACKS, Operator)
+from QHyper.problems.base import Problem, ProblemException, ReducedProblem
 import numpy as np
+import numpy.typing as npt
 
 
 class ProblemWarning(Warning):
     pass
 
 
+@dataclass
+class IsingModel:
+    """
+    Problem in the spin form, binary variables are replaced with
+    x = (1 - s) / 2, where s is in {-1, 1} (the eigenvalue of Pauli Z).
+
+    Energy is sum_i h_i s_i + sum_{i<j} J_ij s_i s_j + offset plus the
+    terms of the higher order.
+
+    Attributes
+    ----------
+    h : npt.NDArray[np.float64]
+        Linear coefficients.
+    J : scipy.sparse.coo_matrix
+        Upper triangular matrix of the couplings.
+    offset : float
+        Constant term.
+    variables : list[str]
+        Names of the variables, order of h and J.
+    higher_order : dict[tuple[int, ...], float], default {}
+        Spin products of degree above 2 (ids of the variables) and their
+        coefficients.
+    """
+
+    h: npt.NDArray[np.float64]
+    J: scipy.sparse.coo_matrix
+    offset: float
+    variables: list[str]
+    higher_order: dict[tuple[int, ...], float] = field(default_factory=dict)
+
+    def energies(self, spins: npt.ArrayLike) -> npt.NDArray[np.float64]:
+        """Returns energies of the spin configurations (one per row)."""
+        spins = np.atleast_2d(np.asarray(spins, dtype=np.float64))
+        result = (spins @ self.h
+                  + np.einsum('ij,ij->i', spins @ self.J.tocsr().T, spins)
+                  + self.offset)
+        for ids, coefficient in self.higher_order.items():
+            result += coefficient * spins[:, list(ids)].prod(axis=1)
+        return result
+
+
+class ParametricQubo:
+    """
+    QUBO of the problem as a function of the penalty weights.
+
+    The objective function and the penalties of the constraints are
+    expanded once, and the coefficients of every term are stored per
+    weight. Then the QUBO for the given weights is the product of the
+    (terms x weights) sparse matrix and the weight vector, instead of
+    expanding the squares of the constraints again.
+
+    Parameters
+    ----------
+    problem : Problem
+        The problem to be converted.
+    binary : bool, default False
+        If True, terms like x*x are reduced to x
+        (see :py:meth:`Converter.create_qubo`).
+
+    Attributes
+    ----------
+    variables : tuple[str, ...]
+        Variable table of the created QUBOs.
+    num_weights : int
+        Number of the penalty weights (including the objective weight).
+    binary : bool
+        Whether the created QUBOs are binary.
+    """
+
+    def __init__(self, problem: Problem, binary: bool = False) -> None:
+        objective = problem.objective_function
+        if isinstance(objective, CompiledPolynomial):
+            objective = objective.to_polynomial()
+        self.binary = binary or objective.binary
+
+        # slot 0 is the objective function, constraints' slots follow
+        components: list[list[Polynomial | CompiledPolynomial]] = [
+            [objective]]
+        for weight_slots, constraint in Converter.penalty_weight_slots(
+                problem.constraints):
+            for slot, component in zip(
+                    weight_slots,
+                    Converter.penalty_components(constraint)):
+                while len(components) <= slot + 1:
+                    components.append([])
+                components[slot + 1].append(component)
+        self.num_weights = len(components)
+
+        registry = problem.variable_registry.copy()
+        compiled: list[CompiledPolynomial] = []
+        for polynomials in components:
+            total = Polynomial(0, self.binary)
+            for polynomial in polynomials:
+                if isinstance(polynomial, CompiledPolynomial):
+                    polynomial = polynomial.to_polynomial()
+                total += polynomial
+            if self.binary:
+                total = total.as_binary()
+            compiled.append(total.compile(registry).merge_duplicates())
+        self.variables = registry.names
+
+        width = max(c.indices.shape[1] for c in compiled)
+        indices = np.full(
+            (sum(len(c) for c in compiled), width), -1, dtype=np.int64)
+        start = 0
+        for part in compiled:
+            indices[start:start + len(part),
+                    :part.indices.shape[1]] = part.indices
+            start += len(part)
+        if len(indices) and width:
+            self._indices, inverse = np.unique(
+                indices, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+        else:
+            self._indices = indices[:1]
+            inverse = np.zeros(len(indices), dtype=np.int64)
+
+        self._matrix = scipy.sparse.csr_matrix(
+            (np.concatenate([c.coefficients for c in compiled]),
+             (inverse, np.repeat(np.arange(len(compiled)),
+                                 [len(c) for c in compiled]))),
+            shape=(len(self._indices), len(compiled)))
+
+    def __call__(self, penalty_weights: list[float]) -> CompiledPolynomial:
+        """Returns the QUBO for the given penalty weights, equal to
+        :py:meth:`Converter.create_qubo` called with them.
+
+        Parameters
+        ----------
+        penalty_weights : list[float]
+            Weights of the objective function and constraints' penalties.
+
+        Returns
+        -------
+        CompiledPolynomial
+            The QUBO.
+        """
+        weights = np.asarray(penalty_weights, dtype=np.float64)
+        if len(weights) == 0 and self.num_weights == 1:
+            weights = np.ones(1)
+        if len(weights) < self.num_weights:
+            raise ValueError(
+                f"Expected {self.num_weights} penalty weights, "
+                f"got {len(weights)}")
+        coefficients = self._matrix @ weights[:self.num_weights]
+        non_zero = coefficients != 0
+        return CompiledPolynomial(
+            self.variables, self._indices[non_zero], coefficients[non_zero],
+            self.binary)
+
+
 class Converter:
+    @staticmethod
+    def square(polynomial: Polynomial | CompiledPolynomial
+               ) -> Polynomial | CompiledPolynomial:
+        """
+        Square the penalty polynomial.
+
+        Linear polynomials a^T x + c (the most common constraints) are
+        squared with NumPy - x^T (a a^T) x + 2c a^T x + c^2 - instead of
+        multiplying the terms one by one.
+
+        Parameters
+        ----------
+        polynomial : Polynomial | CompiledPolynomial
+            The polynomial to be squared.
+
+        Returns
+        -------
+        Polynomial | CompiledPolynomial
+            The square of the polynomial.
+        """
+        if (isinstance(polynomial, CompiledPolynomial)
+                or any(len(term) > 1 for term in polynomial.terms)):
+            return polynomial ** 2
+
+        constant = polynomial.terms.get(tuple(), 0)
+        linear = sorted(
+            (term[0], c) for term, c in polynomial.terms.items() if term)
+        names = np.array([name for name, _ in linear], dtype=object)
+        coefficients = np.array([c for _, c in linear], dtype=np.float64)
+
+        # names are sorted, so the pairs from the upper triangle of a a^T
+        # are canonical terms; products of different variables are doubled
+        first, second = np.triu_indices(len(names), 1)
+        products = 2 * coefficients[first] * coefficients[second]
+        non_zero = products != 0
+        first, second = first[non_zero], second[non_zero]
+        terms = dict(zip(
+            zip(names[first].tolist(), names[second].tolist()),
+            products[non_zero].tolist()))
+
+        squares = coefficients ** 2
+        linear_terms = 2 * constant * coefficients
+        if polynomial.binary:
+            # x*x = x
+            linear_terms = linear_terms + squares
+        else:
+            terms.update(
+                ((name, name), square) for name, square
+                in zip(names.tolist(), squares.tolist()) if square != 0)
+        terms.update(
+            ((name,), coefficient) for name, coefficient
+            in zip(names.tolist(), linear_terms.tolist()) if coefficient != 0)
+        if constant != 0:
+            terms[tuple()] = constant ** 2
+        return Polynomial.from_canonical(terms, polynomial.binary)
+
     @staticmethod
     def calc_slack_coefficients(constant: int) -> list[int]:
         num_slack = int(np.floor(np.log2(constant)))
@@ -67,62 +283,217 @@ class Converter:
         lhs = constraint.lhs - rhs_without_const
         slacks = Converter.use_slacks(rhs_const, constraint.label)
 
-        return weight[0] * (lhs + slacks - rhs_const) ** 2
+        return weight[0] * Converter.square(lhs + slacks - rhs_const)
+
+    @staticmethod
+    def binary_bounds(polynomial: Polynomial | CompiledPolynomial
+                      ) -> tuple[float, float]:
+        """
+        Return the bounds of the polynomial over the binary assignments.
+
+        Every term is either 0 or equal to its coefficient, so the bounds
+        are the constant plus the sum of the negative (positive)
+        coefficients. They are exact for linear polynomials.
+
+        Parameters
+        ----------
+        polynomial : Polynomial | CompiledPolynomial
+            The polynomial, variables are treated as binary.
+
+        Returns
+        -------
+        tuple[float, float]
+            The lower and the upper bound.
+        """
+        if isinstance(polynomial, Polynomial):
+            polynomial = polynomial.compile()
+        polynomial, constant = polynomial.as_binary().separate_const()
+        coefficients = polynomial.coefficients
+        return (float(constant + coefficients[coefficients < 0].sum()),
+                float(constant + coefficients[coefficients > 0].sum()))
+
+    @staticmethod
+    def apply_bounded_slacks(
+        constraint: Constraint, weight: list[float]
+    ) -> Polynomial:
+        """
+        Return the penalty of the inequality with the slack register
+        sized from the range of its left hand side.
+
+        The constraint is written as g(x) <= 0. The slack has to cover
+        only the values [0, -min g], so it needs log2(-min g) variables,
+        which is fewer than log2(rhs) when the left hand side can't reach
+        0. If max g <= 0 the constraint always holds and the penalty is
+        empty, without any slack variables.
+
+        Parameters
+        ----------
+        constraint : Constraint
+            The inequality.
+        weight : list[float]
+            The weight of the penalty, a list of length 1.
+
+        Returns
+        -------
+        Polynomial
+            The penalty.
+        """
+        if len(weight) != 1:
+            raise ValueError("Weight must be a list of length 1")
+
+        difference = constraint.lhs - constraint.rhs
+        if constraint.operator == Operator.GE:
+            difference = -difference
+        lower, upper = Converter.binary_bounds(difference)
+        if upper <= 0:
+            return Polynomial(0)
+
+        slack_range = int(np.floor(-lower))
+        if slack_range > 0:
+            difference = difference + Converter.use_slacks(
+                slack_range, constraint.label)
+        return weight[0] * Converter.square(difference)
 
     @staticmethod
     def use_unbalanced_penalization(
         constraint: Constraint, weight: list[float]
     ) -> Polynomial:
         lhs = constraint.lhs - constraint.rhs
-        return weight[0]*lhs + weight[1]*lhs**2
+        return weight[0]*lhs + weight[1]*Converter.square(lhs)
 
     @staticmethod
-    def assign_penalty_weights_to_constraints(
-        constraints_weights: list[float], constraints: list[Constraint]
-    ) -> list[tuple[list[float], Constraint]]:
-        weights_constraints_list = []
+    def penalty_weight_slots(constraints: list[Constraint]
+                             ) -> list[tuple[list[int], Constraint]]:
+        """
+        Return the positions of the constraints' weights in the list of
+        the penalty weights without the objective function's weight.
+
+        Constraints handled with unbalanced penalization have two weights,
+        the other ones have one weight. Constraints of the same group
+        (other than -1) share the weights.
+
+        Parameters
+        ----------
+        constraints : list[Constraint]
+            The constraints.
+
+        Returns
+        -------
+        list[tuple[list[int], Constraint]]
+            Positions of the weights of every constraint.
+        """
+        slots_constraints_list = []
         idx = 0
-        group_to_weight: dict[int, list[float]] = {}
+        group_to_slots: dict[int, list[int]] = {}
         for constraint in constraints:
-            if constraint.method_for_inequalities == UNBALANCED_PENALIZATION:
-                if constraint.group == -1:
-                    weights = constraints_weights[idx: idx + 2]
-                    idx += 2
-                elif constraint.group in group_to_weight:
-                    weights = group_to_weight[constraint.group]
-                else:
-                    weights = constraints_weights[idx: idx + 2]
-                    group_to_weight[constraint.group] = weights
-                    idx += 2
-
-                weights_constraints_list.append(
-                    (weights, constraint)
-                )
+            if constraint.group in group_to_slots:
+                slots = group_to_slots[constraint.group]
             else:
-                if constraint.group == -1:
-                    weights = [constraints_weights[idx]]
-                    idx += 1
-                elif constraint.group in group_to_weight:
-                    weights = group_to_weight[constraint.group]
-                else:
-                    weights = [constraints_weights[idx]]
-                    group_to_weight[constraint.group] = weights
-                    idx += 1
-                weights_constraints_list.append((weights, constraint))
-        return weights_constraints_list
-
-    @staticmethod
-    def create_qubo(problem: Problem, penalty_weights: list[float]) -> Polynomial:
+                size = (2 if constraint.method_for_inequalities
+                        == UNBALANCED_PENALIZATION else 1)
+                slots = list(range(idx, idx + size))
+                idx += size
+                if constraint.group != -1:
+                    group_to_slots[constraint.group] = slots
+            slots_constraints_list.append((slots, constraint))
+        return slots_constraints_list
+
+    @staticmethod
+    def assign_penalty_weights_to_constraints(
+        constraints_weights: list[float], constraints: list[Constraint]
+    ) -> list[tuple[list[float], Constraint]]:
+        return [
+            ([constraints_weights[i] for i in slots
+              if i < len(constraints_weights)], constraint)
+            for slots, constraint
+            in Converter.penalty_weight_slots(constraints)
+        ]
+
+    @staticmethod
+    def penalty_components(constraint: Constraint) -> list[Polynomial]:
+        """
+        Return the penalty of the constraint split by the weights,
+        i.e. the penalty is the sum of the components multiplied by
+        the weights assigned to the constraint.
+
+        Parameters
+        ----------
+        constraint : Constraint
+            The constraint.
+
+        Returns
+        -------
+        list[Polynomial]
+            One component per weight of the constraint.
+        """
+        if constraint.operator == Operator.EQ:
+            return [Converter.square(constraint.lhs - constraint.rhs)]
+        if constraint.method_for_inequalities == SLACKS_LOG_2:
+            return [Converter.apply_slacks(constraint, [1.])]
+        if constraint.method_for_inequalities == BOUNDED_SLACKS:
+            return [Converter.apply_bounded_slacks(constraint, [1.])]
+        if constraint.method_for_inequalities == UNBALANCED_PENALIZATION:
+            lhs = constraint.lhs - constraint.rhs
+            return [lhs, Converter.square(lhs)]
+        return []
+
+    @staticmethod
+    def create_parametric_qubo(problem: Problem, binary: bool = False
+                               ) -> ParametricQubo:
+        """
+        Expand the objective function and the penalties of the problem
+        once, so the QUBO can be created for many penalty weights cheaply.
+
+        Parameters
+        ----------
+        problem : Problem
+            The problem to be converted.
+        binary : bool, default False
+            If True, the QUBO is created in the binary domain.
+
+        Returns
+        -------
+        ParametricQubo
+            Function from the penalty weights to the QUBO.
+        """
+        return ParametricQubo(problem, binary)
+
+    @staticmethod
+    def create_qubo(problem: Problem, penalty_weights: list[float],
+                    binary: bool = False
+                    ) -> Polynomial | CompiledPolynomial:
+        """
+        Convert problem to QUBO by adding the constraints as penalties
+        to the objective function.
+
+        Parameters
+        ----------
+        problem : Problem
+            The problem to be converted.
+        penalty_weights : list[float]
+            Weights of the objective function and constraints' penalties.
+        binary : bool, default False
+            If True, the QUBO is created in the binary domain, so terms
+            like x*x are reduced to x. The same happens if the objective
+            function is already a binary polynomial.
+
+        Returns
+        -------
+        Polynomial | CompiledPolynomial
+            The QUBO. Compiled, if the objective function is compiled.
+        """
         of_weight = penalty_weights[0] if len(penalty_weights) else 1
         result = float(of_weight) * problem.objective_function
+        if binary:
+            result = result.as_binary()
 
         constraints_penalty_weights = penalty_weights[1:]
         for weight, constraint in Converter.assign_penalty_weights_to_constraints(
             constraints_penalty_weights, problem.constraints
         ):
             if constraint.operator == Operator.EQ:
-                result += float(weight[0]) * (
-                    constraint.lhs - constraint.rhs) ** 2
+                result += float(weight[0]) * Converter.square(
+                    constraint.lhs - constraint.rhs)
                 continue
 
             lhs = constraint.lhs - constraint.rhs
@@ -131,6 +502,8 @@ class Converter:
 
             if constraint.method_for_inequalities == SLACKS_LOG_2:
                 result += Converter.apply_slacks(constraint, weight)
+            elif constraint.method_for_inequalities == BOUNDED_SLACKS:
+                result += Converter.apply_bounded_slacks(constraint, weight)
             elif (constraint.method_for_inequalities
                   == UNBALANCED_PENALIZATION):
                 result += Converter.use_unbalanced_penalization(
@@ -138,24 +511,542 @@ class Converter:
                 )
         return result
 
+    @staticmethod
+    def substitute_expressions(polynomial: Polynomial | CompiledPolynomial,
+                               expressions: dict[str, Polynomial]
+                               ) -> Polynomial:
+        """
+        Replace the variables with polynomials, e.g. x -> 1 - y - z.
+
+        All variables are replaced at once, so the expressions shouldn't
+        contain the replaced variables.
+
+        Parameters
+        ----------
+        polynomial : Polynomial | CompiledPolynomial
+            The polynomial.
+        expressions : dict[str, Polynomial]
+            Replaced variables and their expressions.
+
+        Returns
+        -------
+        Polynomial
+            The polynomial after the replacement.
+        """
+        if isinstance(polynomial, CompiledPolynomial):
+            polynomial = polynomial.to_polynomial()
+        if not expressions.keys() & polynomial.get_variables():
+            return Polynomial.from_canonical(
+                polynomial.terms.copy(), polynomial.binary)
+
+        factors = {variable: list(expression.terms.items())
+                   for variable, expression in expressions.items()}
+        builder = PolynomialBuilder()
+        for term, coefficient in polynomial.terms.items():
+            if not any(variable in factors for variable in term):
+                builder.add_term(term, coefficient)
+                continue
+            for combination in itertools.product(*(
+                factors.get(variable, [((variable,), 1.)])
+                for variable in term
+            )):
+                product = coefficient
+                for _, factor in combination:
+                    product *= factor
+                builder.add_term(
+                    tuple(itertools.chain.from_iterable(
+                        part for part, _ in combination)),
+                    product)
+        result = builder.build()
+        return result.as_binary() if polynomial.binary else result
+
+    @staticmethod
+    def eliminate_equalities(
+        problem: Problem,
+        method_for_inequalities: MethodsForInequalities = (
+            UNBALANCED_PENALIZATION),
+    ) -> ReducedProblem:
+        """
+        Eliminate the variables of the linear equality constraints by
+        substitution instead of penalizing the constraints.
+
+        For every equality with integer coefficients, one of its variables
+        with coefficient 1 or -1 (the pivot) is expressed by the other
+        variables, e.g. x0 + x1 + x2 = 1 gives x0 = 1 - x1 - x2, and
+        replaced in the objective function and the remaining constraints.
+        Among the candidates the pivot is the variable in the fewest terms
+        of the objective function. Equalities without such variable or
+        with higher-order terms are kept.
+
+        The expression of the pivot has to be 0 or 1, so the constraints
+        -expression <= 0 and expression <= 1 are added when the bounds of
+        the expression (see :py:meth:`binary_bounds`) don't guarantee
+        them. They are handled with ``method_for_inequalities``.
+        UNBALANCED_PENALIZATION doesn't add any variables, so every pivot
+        removes one qubit, e.g. a one-hot row of n variables becomes the
+        penalty of n - 1 variables. The slack methods would add at least
+        one slack variable per pivot, so with them only the pivots with
+        guaranteed bounds are eliminated (e.g. x0 + x1 = 1). Since the
+        constraints change, the penalty weights of the reduced problem
+        differ from the penalty weights of the original problem.
+
+        Parameters
+        ----------
+        problem : Problem
+            The problem to be reduced.
+        method_for_inequalities : MethodsForInequalities, optional
+            The method used for the constraints of the pivots' values,
+            by default UNBALANCED_PENALIZATION.
+
+        Returns
+        -------
+        ReducedProblem
+            Problem without the pivots, which lifts the solutions
+            to the original problem (the pivots are kept in
+            ``substitutions``).
+
+        Raises
+        ------
+        ProblemException
+            If the equalities contradict each other.
+        """
+        objective = problem.objective_function
+        counts = dict.fromkeys(problem.variable_registry, 0)
+        for term in objective.terms:
+            for variable in set(term):
+                counts[variable] = counts.get(variable, 0) + 1
+
+        expressions: dict[str, Polynomial] = {}
+        remaining: list[Constraint] = []
+        for constraint in problem.constraints:
+            lhs = Converter.substitute_expressions(
+                constraint.lhs, expressions)
+            rhs = Converter.substitute_expressions(
+                constraint.rhs, expressions)
+            difference = lhs - rhs
+            if not difference.get_variables():
+                value = difference.separate_const()[1]
+                if not {
+                    Operator.EQ: value == 0,
+                    Operator.LE: value <= 0,
+                    Operator.GE: value >= 0,
+                }[constraint.operator]:
+                    raise ProblemException(
+                        f"Constraint {constraint} can't be satisfied")
+                continue
+
+            candidates = []
+            if (constraint.operator == Operator.EQ
+                    and all(len(term) <= 1 for term in difference.terms)
+                    and all(coefficient == int(coefficient)
+                            for coefficient in difference.terms.values())):
+                candidates = sorted(
+                    (term[0] for term, coefficient
+                     in difference.terms.items()
+                     if len(term) == 1 and abs(coefficient) == 1),
+                    key=lambda v: counts.get(v, 0))
+
+            pivot, expression = None, Polynomial(0)
+            for candidate in candidates:
+                sign = difference.terms[(candidate,)]
+                expression = Polynomial.from_canonical({
+                    term: -coefficient / sign
+                    for term, coefficient in difference.terms.items()
+                    if term != (candidate,)
+                })
+                lower, upper = Converter.binary_bounds(expression)
+                # with slacks the constraints of the pivot's value cost
+                # at least the removed qubit
+                if (method_for_inequalities == UNBALANCED_PENALIZATION
+                        or (lower >= 0 and upper <= 1)):
+                    pivot = candidate
+                    break
+            if pivot is None:
+                remaining.append(Constraint(
+                    lhs, rhs, constraint.operator,
+                    constraint.method_for_inequalities, constraint.label,
+                    constraint.group))
+                continue
+
+            for variable, expr in expressions.items():
+                if pivot in expr.get_variables():
+                    expressions[variable] = Converter.substitute_expressions(
+                        expr, {pivot: expression})
+            expressions[pivot] = expression
+
+        constraints = [
+            Constraint(
+                Converter.substitute_expressions(constraint.lhs, expressions),
+                Converter.substitute_expressions(constraint.rhs, expressions),
+                constraint.operator, constraint.method_for_inequalities,
+                constraint.label, constraint.group)
+            for constraint in remaining
+        ]
+        for pivot, expression in expressions.items():
+            lower, upper = Converter.binary_bounds(expression)
+            # written as <= for the methods assuming this operator
+            if lower < 0:
+                constraints.append(Constraint(
+                    -expression, Polynomial(0), Operator.LE,
+                    method_for_inequalities, f"{pivot}_lower"))
+            if upper > 1:
+                constraints.append(Constraint(
+                    expression, Polynomial(1), Operator.LE,
+                    method_for_inequalities, f"{pivot}_upper"))
+
+        reduced: Polynomial | CompiledPolynomial = (
+            Converter.substitute_expressions(objective, expressions))
+        if isinstance(objective, CompiledPolynomial):
+            reduced = reduced.compile()
+        return ReducedProblem(problem, reduced, constraints, expressions)
+
+    @staticmethod
+    def estimate_penalty_weights(problem: Problem,
+                                 strategy: str = "momc") -> list[float]:
+        """
+        Estimate the penalty weights from the coefficients of the problem,
+        without solving it.
+
+        The objective function is treated as binary. For every variable
+        the change of the objective after flipping it is bounded by the
+        coefficients of the terms containing the variable. Available
+        strategies:
+
+        - ``"upper_bound"`` - sum of the absolute coefficients of the
+          objective function, a bound of its range,
+        - ``"mqc"`` - maximum absolute coefficient of the objective
+          function (maximum QUBO coefficient),
+        - ``"vlm"`` - maximum change of the objective after a single flip
+          (Verma and Lewis),
+        - ``"momc"`` - the maximum change of the objective after a single
+          flip divided by the minimum violation of the constraint, i.e.
+          the smallest change of its penalty after flipping one variable
+          of the feasible solution (the squared smallest coefficient).
+
+        Weights of the grouped constraints are the maximum over the group.
+        The weights can be passed to the solver or used as the starting
+        point of the search, e.g.
+        ``OptimizationParameter(init=weights, min=..., max=...)``.
+
+        Parameters
+        ----------
+        problem : Problem
+            The problem.
+        strategy : str, default "momc"
+            One of "upper_bound", "mqc", "vlm" and "momc".
+
+        Returns
+        -------
+        list[float]
+            Penalty weights, the first one (the objective function's
+            weight) is 1.
+        """
+        if strategy not in ("upper_bound", "mqc", "vlm", "momc"):
+            raise ValueError(f"Unknown strategy: {strategy}")
+
+        objective = problem.objective_function
+        if isinstance(objective, Polynomial):
+            objective = objective.compile()
+        objective, _ = objective.as_binary().separate_const()
+        coefficients = objective.coefficients
+        indices = objective.indices
+        used = indices >= 0
+        ids = indices[used]
+        terms = np.broadcast_to(
+            np.arange(len(indices))[:, None], indices.shape)[used]
+        weights = coefficients[terms]
+        linear = objective.degrees[terms] == 1
+        size = len(objective.variables)
+
+        # bounds of the change after switching the variable on
+        base = np.bincount(
+            ids, weights=np.where(linear, weights, 0), minlength=size)
+        lower = base + np.bincount(
+            ids, weights=np.where(linear, 0, np.minimum(weights, 0)),
+            minlength=size)
+        upper = base + np.bincount(
+            ids, weights=np.where(linear, 0, np.maximum(weights, 0)),
+            minlength=size)
+        flip_change = float(np.max(
+            np.maximum(np.abs(lower), np.abs(upper)), initial=0))
+        bound = {
+            "upper_bound": float(np.abs(coefficients).sum()),
+            "mqc": float(np.max(np.abs(coefficients), initial=0)),
+            "vlm": flip_change,
+            "momc": flip_change,
+        }[strategy]
+
+        slots = Converter.penalty_weight_slots(problem.constraints)
+        estimates = [0.] * (max(
+            (slot for weight_slots, _ in slots for slot in weight_slots),
+            default=-1) + 1)
+        for weight_slots, constraint in slots:
+            value = bound
+            if strategy == "momc":
+                difference, _ = (
+                    constraint.lhs - constraint.rhs).separate_const()
+                steps = np.abs(np.array(
+                    list(difference.terms.values()), dtype=float))
+                step = float(np.min(steps[steps > 0], initial=np.inf))
+                if (constraint.operator != Operator.EQ
+                        and constraint.method_for_inequalities
+                        in (SLACKS_LOG_2, BOUNDED_SLACKS)):
+                    # the first slack variable has coefficient 1
+                    step = min(step, 1.)
+                if np.isfinite(step):
+                    value = bound / step ** 2
+            for slot in weight_slots:
+                estimates[slot] = max(estimates[slot], value)
+        return [1.] + [value if value > 0 else 1. for value in estimates]
+
+    @staticmethod
+    def prune_qubo(qubo: Polynomial | CompiledPolynomial,
+                   abs_tol: float = 0, rel_tol: float = 0,
+                   levels: int | None = None
+                   ) -> tuple[Polynomial | CompiledPolynomial, float]:
+        """
+        Remove negligible terms of the QUBO and optionally quantize
+        its coefficients, see :py:meth:`~QHyper.polynomial.Polynomial.prune`
+        and :py:meth:`~QHyper.polynomial.Polynomial.quantize`.
+
+        Parameters
+        ----------
+        qubo : Polynomial | CompiledPolynomial
+            The QUBO.
+        abs_tol : float, default 0
+            Absolute tolerance of the pruned coefficients.
+        rel_tol : float, default 0
+            Tolerance relative to the largest absolute coefficient.
+        levels : int | None, default None
+            Number of the quantization levels, no quantization if None.
+
+        Returns
+        -------
+        tuple[Polynomial | CompiledPolynomial, float]
+            The reduced QUBO and the bound of the energy error.
+        """
+        error = 0.
+        if abs_tol or rel_tol:
+            qubo, error = qubo.prune(abs_tol, rel_tol)
+        if levels is not None:
+            qubo, quantization_error = qubo.quantize(levels)
+            error += quantization_error
+        return qubo, error
+
+    @staticmethod
+    def polynomial_to_bqm(qubo: Polynomial | CompiledPolynomial,
+                          variable_order: Sequence[str] | None = None
+                          ) -> BinaryQuadraticModel:
+        """
+        Convert the quadratic polynomial to BQM, variables are treated
+        as binary (x*x = x).
+
+        Parameters
+        ----------
+        qubo : Polynomial | CompiledPolynomial
+            Polynomial of degree at most 2.
+        variable_order : Sequence[str], optional
+            Order of the variables in the BQM, by default the variable
+            table of the compiled polynomial.
+
+        Returns
+        -------
+        BinaryQuadraticModel
+            BQM created from the arrays of the coefficients.
+        """
+        if isinstance(qubo, Polynomial):
+            qubo = qubo.compile()
+        matrix, linear, offset, variables = (
+            qubo.as_binary().to_sparse_qubo(variable_order))
+        return BinaryQuadraticModel.from_numpy_vectors(
+            linear, (matrix.row, matrix.col, matrix.data), offset,
+            dimod.BINARY, variable_order=variables)
+
+    @staticmethod
+    def _used_variables(polynomial: CompiledPolynomial) -> list[str]:
+        # variables present in the terms, in the order of the table
+        ids = np.unique(polynomial.indices[polynomial.indices >= 0])
+        return [polynomial.variables[i] for i in ids]
+
+    @staticmethod
+    def to_bqm(problem: Problem, penalty_weights: list[float]
+               ) -> BinaryQuadraticModel:
+        """
+        Convert problem to BQM, the variables are ordered by the
+        variable registry of the problem.
+
+        Parameters
+        ----------
+        problem : Problem
+            The problem to be converted.
+        penalty_weights : list[float]
+            Weights of the objective function and constraints' penalties.
+
+        Returns
+        -------
+        BinaryQuadraticModel
+            The QUBO of the problem as BQM.
+        """
+        qubo = Converter.create_parametric_qubo(problem)(penalty_weights)
+        return Converter.polynomial_to_bqm(
+            qubo, Converter._used_variables(qubo))
+
+    @staticmethod
+    def _cqm_constraint_terms(polynomial: Polynomial | CompiledPolynomial
+                              ) -> tuple[list[tuple], float]:
+        terms: list[tuple] = []
+        constant = 0.
+        for term, coefficient in polynomial.terms.items():
+            if not term:
+                constant += coefficient
+            elif len(term) == 1 or (len(term) == 2 and term[0] == term[1]):
+                # x*x = x for binary variables
+                terms.append((term[0], coefficient))
+            elif len(term) == 2:
+                terms.append((term[0], term[1], coefficient))
+            else:
+                raise ValueError(
+                    "CQM supports only quadratic constraints, "
+                    f"got term {term}")
+        return terms, constant
+
+    @staticmethod
+    def qubo_to_ising(qubo: Polynomial | CompiledPolynomial,
+                      variable_order: Sequence[str] | None = None
+                      ) -> IsingModel:
+        """
+        Convert the binary polynomial to the spin form, see
+        :py:class:`IsingModel`.
+
+        Term c*x_1*...*x_k is expanded to c/2^k times the sum of
+        (-1)^|S| prod_{i in S} s_i over all subsets S, with one array
+        operation per subset for all terms of the same degree.
+
+        Parameters
+        ----------
+        qubo : Polynomial | CompiledPolynomial
+            Polynomial of any degree, variables are treated as binary.
+        variable_order : Sequence[str], optional
+            Order of the variables, by default the variable table of the
+            compiled polynomial.
+
+        Returns
+        -------
+        IsingModel
+            The spin model.
+        """
+        if isinstance(qubo, Polynomial):
+            qubo = qubo.compile()
+        qubo = qubo.as_binary().merge_duplicates()
+        width = qubo.indices.shape[1]
+
+        indices, coefficients = [], []
+        for degree in np.unique(qubo.degrees).tolist():
+            rows = qubo.degrees == degree
+            terms = qubo.indices[rows, :degree]
+            scaled = qubo.coefficients[rows] / 2 ** degree
+            for subset in itertools.product([False, True], repeat=degree):
+                subset_indices = np.full((len(terms), width), -1,
+                                         dtype=np.int64)
+                size = sum(subset)
+                subset_indices[:, :size] = terms[:, list(subset)]
+                indices.append(subset_indices)
+                coefficients.append(scaled * (-1) ** size)
+
+        spin = CompiledPolynomial(
+            qubo.variables,
+            np.vstack(indices) if indices else qubo.indices,
+            np.concatenate(coefficients) if coefficients else qubo.coefficients,
+        ).merge_duplicates()
+
+        quadratic = spin.degrees <= 2
+        matrix, h, offset, variables = CompiledPolynomial(
+            spin.variables, spin.indices[quadratic],
+            spin.coefficients[quadratic]).to_sparse_qubo(variable_order)
+        position = {name: i for i, name in enumerate(variables)}
+        higher_order = {
+            tuple(sorted(position[spin.variables[i]] for i in row[:degree])):
+                coefficient
+            for row, degree, coefficient in zip(
+                spin.indices[~quadratic].tolist(),
+                spin.degrees[~quadratic].tolist(),
+                spin.coefficients[~quadratic].tolist())
+        }
+        return IsingModel(h, matrix, offset, variables, higher_order)
+
+    @staticmethod
+    def to_ising(problem: Problem, penalty_weights: list[float]
+                 ) -> IsingModel:
+        """
+        Convert problem to the spin form, the variables are ordered by
+        the variable registry of the problem.
+
+        Parameters
+        ----------
+        problem : Problem
+            The problem to be converted.
+        penalty_weights : list[float]
+            Weights of the objective function and constraints' penalties.
+
+        Returns
+        -------
+        IsingModel
+            The QUBO of the problem in the spin form.
+        """
+        qubo = Converter.create_parametric_qubo(problem)(penalty_weights)
+        return Converter.qubo_to_ising(
+            qubo, Converter._used_variables(qubo))
+
     @staticmethod
     def to_cqm(problem: Problem) -> ConstrainedQuadraticModel:
-        binary_polynomial = dimod.BinaryPolynomial(
-            problem.objective_function.terms, dimod.BINARY
-        )
-        cqm = dimod.make_quadratic_cqm(binary_polynomial)
+        """
+        Convert problem to CQM format.
+
+        All variables are added at once, ordered by the variable registry
+        of the problem. Quadratic objective function is passed as the BQM
+        built from the coefficient arrays
+        (see :py:meth:`polynomial_to_bqm`), only the objective of higher
+        degree is reduced with :py:func:`dimod.make_quadratic_cqm`.
+        Constraints are added with
+        :py:meth:`dimod.ConstrainedQuadraticModel.add_constraint_from_iterable`,
+        which is the cheapest way to add many small models.
 
-        variables = problem.objective_function.get_variables()
+        Parameters
+        ----------
+        problem : Problem
+            The problem to be converted.
+
+        Returns
+        -------
+        ConstrainedQuadraticModel
+            The CQM with one constraint per constraint of the problem,
+            labeled with its index.
+        """
+        objective = problem.objective_function
+        variables = set(objective.get_variables())
         for constraint in problem.constraints:
-            variables.update(constraint.lhs.get_variables())
+            variables |= constraint.get_variables()
+        variables = problem.variable_registry.copy().sort(variables)
 
-        for variable in variables:
-            cqm.add_variable(dimod.BINARY, str(variable))
+        if objective.degree() > 2:
+            cqm = dimod.make_quadratic_cqm(
+                dimod.BinaryPolynomial(objective.terms, dimod.BINARY))
+            cqm.add_variables(dimod.BINARY, variables)
+        else:
+            cqm = ConstrainedQuadraticModel()
+            cqm.add_variables(dimod.BINARY, variables)
+            cqm.set_objective(Converter.polynomial_to_bqm(
+                objective, problem.variable_registry.copy().sort(
+                    objective.get_variables())))
 
         for i, constraint in enumerate(problem.constraints):
-            lhs = [tuple([*key, value])
-                   for key, value in constraint.lhs.terms.items()]
-            cqm.add_constraint(lhs, constraint.operator.value, label=i)
+            lhs, lhs_constant = Converter._cqm_constraint_terms(
+                constraint.lhs)
+            rhs, rhs_constant = Converter._cqm_constraint_terms(
+                -constraint.rhs)
+            cqm.add_constraint_from_iterable(
+                lhs + rhs, constraint.operator.value,
+                -lhs_constant - rhs_constant, label=i)
 
         return cqm
 
@@ -181,27 +1072,13 @@ class Converter:
         cases: int, default 1
             Number of variable cases (values)
             1 is denoting binary variable.
-        """
-
-        def binary_to_discrete(v: str) -> str:
-            for i in range(len(v)):
-                if v[i].isdigit():
-                    break
 
-            prefix = v[:i]
-            numeric_part = v[i:]
-
-            discrete_id = int(numeric_part) // cases
-            new_v = prefix + str(discrete_id)
-
-            return new_v
-
-        def extract_number(element) -> int:
-            match = re.search(r'(\d+)', element)
-            prefix = element[:match.start()]
-            number = int(match.group(1))
-
-            return (prefix, number)
+        Binary variable <str><int> is mapped to the discrete variable
+        <str><int // cases>. The mapping is computed once per variable and
+        the biases of all terms are set at once with
+        :py:meth:`dimod.DiscreteQuadraticModel.from_numpy_vectors`
+        (bias of the term is set for all cases, the last term wins).
+        """
 
         if problem.constraints:
             warnings.warn(
@@ -210,44 +1087,76 @@ class Converter:
                 ProblemWarning
             )
 
-        pattern = re.compile(r'^[a-zA-Z]+\d+$')
-        for variable in problem.objective_function.get_variables():
-            if not pattern.match(variable):
+        objective = problem.objective_function
+        if isinstance(objective, Polynomial):
+            # terms keep the order of the dictionary, so the same biases
+            # are overwritten in the same order as before
+            objective = CompiledPolynomial.from_terms(
+                objective.terms, merge=False)
+
+        # mapping of the binary variables to the discrete variables is
+        # computed once per variable, terms are mapped with arrays
+        pattern = re.compile(r'^([a-zA-Z]+)(\d+)$')
+        discrete_names = []
+        for variable in objective.variables:
+            match = pattern.match(variable)
+            if match is None:
                 raise ValueError(
                     f"Objective funtion variable '{variable}'"
                     "should be written in the format <str><int> (e.g. x10, yz1)."
                 )
+            discrete_names.append(
+                match.group(1) + str(int(match.group(2)) // cases))
 
-        dqm = dimod.DiscreteQuadraticModel()
-        objective_function_variables = sorted(
-            problem.objective_function.get_variables(), key=extract_number)
+        used_variables = objective.get_variables()
+        objective_function_variables = [
+            v for v in problem.variable_registry if v in used_variables]
+        discrete_name = dict(zip(objective.variables, discrete_names))
+        labels = list(dict.fromkeys(
+            discrete_name[v] for v in objective_function_variables[:: cases]))
+        label_ids = {label: i for i, label in enumerate(labels)}
+        discrete_ids = np.array(
+            [label_ids.get(name, -1) for name in discrete_names] + [-1],
+            dtype=np.int64)
 
-        variables = [
-            binary_to_discrete(str(v))
-            for v in objective_function_variables[:: cases]
-        ]
-        cases_offset = cases == 1
-
-        for variable in variables:
-            if variable not in dqm.variables:
-                dqm.add_variable(cases + cases_offset, variable)
-
-        for vars, bias in problem.objective_function.terms.items():
-            s_i, *s_j = vars
-            x_i = binary_to_discrete(s_i)
-            xi_idx: int = cast(int, dqm.variables.index(x_i))
-            if s_j:
-                x_j = binary_to_discrete(*s_j)
-                xj_idx: int = cast(int, dqm.variables.index(x_j))
-                dqm.set_quadratic(
-                    dqm.variables[xi_idx],
-                    dqm.variables[xj_idx],
-                    {(case, case): bias for case in range(cases + cases_offset)},
-                )
-            else:
-                dqm.set_linear(
-                    dqm.variables[xi_idx],
-                    [bias] * (cases + cases_offset),
-                )
+        num_cases = cases + (cases == 1)
+        degrees = objective.degrees
+        if degrees.max(initial=0) > 2:
+            raise ValueError("DQM supports only quadratic objective functions")
+        padded = np.full((len(objective), 2), -1, dtype=np.int64)
+        padded[:, :objective.indices.shape[1]] = objective.indices
+        indices = discrete_ids[padded]
+        if (indices[padded >= 0] < 0).any():
+            raise ValueError(
+                "Every discrete variable must have its first case "
+                "in the objective function")
+
+        # when the same bias is set many times, the last value is used
+        def last_occurrence(keys: np.ndarray) -> np.ndarray:
+            reversed_keys = keys[::-1]
+            _, first = np.unique(reversed_keys, return_index=True)
+            return len(keys) - 1 - first
+
+        linear_rows = np.flatnonzero(degrees == 1)
+        linear_rows = linear_rows[last_occurrence(indices[linear_rows, 0])]
+        linear_biases = np.zeros(len(labels) * num_cases)
+        linear_biases[(indices[linear_rows, :1] * num_cases
+                       + np.arange(num_cases)).reshape(-1)] = np.repeat(
+            objective.coefficients[linear_rows], num_cases)
+
+        quadratic_rows = np.flatnonzero(degrees == 2)
+        pairs = np.sort(indices[quadratic_rows, :2], axis=1)
+        if (pairs[:, 0] == pairs[:, 1]).any():
+            raise ValueError(
+                "Quadratic terms must connect different discrete variables")
+        last = last_occurrence(pairs[:, 0] * len(labels) + pairs[:, 1])
+        pairs, quadratic_rows = pairs[last], quadratic_rows[last]
+        case_range = np.arange(num_cases)
+        rows = (pairs[:, :1] * num_cases + case_range).reshape(-1)
+        columns = (pairs[:, 1:] * num_cases + case_range).reshape(-1)
+        biases = np.repeat(objective.coefficients[quadratic_rows], num_cases)
 
-        return dqm
+        return DiscreteQuadraticModel.from_numpy_vectors(
+            np.arange(len(labels)) * num_cases, linear_biases,
+            (rows, columns, biases), labels=labels,
+            offset=float(objective.coefficients[degrees == 0].sum()))
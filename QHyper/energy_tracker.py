@@ -0,0 +1,141 @@
+# This work was supported by the EuroHPC PL infrastructure funded at the
+# Smart Growth Operational Programme (2014-2020), Measure 4.2
+# under the grant agreement no. POIR.04.02.00-00-D014/20-00
+
+
+"""Module for the incremental evaluation of the QUBO energy.
+
+Local search and annealing flip one bit at a time, so evaluating the
+whole QUBO after every flip wastes most of the work. The tracker keeps the
+energy change of flipping every variable and after the accepted flip
+updates only the neighbours of the flipped variable:
+
+.. code-block:: python
+
+    tracker = EnergyTracker(qubo)
+    for i in rng.integers(len(tracker), size=steps):
+        if tracker.delta(i) < 0:
+            tracker.flip(i)
+    solution = tracker.assignment()
+
+.. rubric:: Main class
+
+.. autosummary::
+    :toctree: generated
+
+    EnergyTracker  -- energy of the QUBO updated after single flips.
+
+"""
+
+from typing import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from QHyper.polynomial import Polynomial, CompiledPolynomial
+
+
+class EnergyTracker:
+    """
+    Class tracking the energy of the binary QUBO during single-bit flips.
+
+    The energy is E(x) = x^T J x / 2 + h^T x + offset, with symmetric J.
+    For every variable the tracker keeps the local field
+    f_i = h_i + sum_j J_ij x_j and the flip delta (1 - 2 x_i) f_i, so
+    :py:meth:`delta` is O(1) and :py:meth:`flip` is O(degree of the
+    variable).
+
+    Parameters
+    ----------
+    qubo : Polynomial | CompiledPolynomial
+        Polynomial of degree at most 2, variables are treated as binary.
+    state : npt.ArrayLike, optional
+        Initial values of the variables, by default all are 0.
+    variable_order : Sequence[str], optional
+        Order of the variables (ids used by the methods), by default
+        the variable table of the compiled polynomial.
+
+    Attributes
+    ----------
+    variables : list[str]
+        Names of the variables ordered by their ids.
+    """
+
+    def __init__(self, qubo: Polynomial | CompiledPolynomial,
+                 state: npt.ArrayLike | None = None,
+                 variable_order: Sequence[str] | None = None) -> None:
+        if isinstance(qubo, Polynomial):
+            qubo = qubo.compile()
+        matrix, self._linear, self._offset, self.variables = (
+            qubo.as_binary().to_sparse_qubo(variable_order))
+        # upper triangular matrix -> symmetric matrix of the couplings
+        matrix = matrix.tocsr()
+        couplings = (matrix + matrix.T).tocsr()
+        couplings.sum_duplicates()
+        self._indptr = couplings.indptr
+        self._neighbours = couplings.indices
+        self._weights = couplings.data
+        self._couplings = couplings
+        self.reset(state)
+
+    def __len__(self) -> int:
+        return len(self.variables)
+
+    def reset(self, state: npt.ArrayLike | None = None) -> None:
+        """Sets the values of all variables and recomputes the energy."""
+        if state is None:
+            state = np.zeros(len(self.variables), dtype=np.int8)
+        state = np.asarray(state, dtype=np.int8)
+        if state.shape != (len(self.variables),):
+            raise ValueError(
+                f"State must have {len(self.variables)} values, "
+                f"got shape {state.shape}")
+        self._state = state.copy()
+        self._field = self._linear + self._couplings @ self._state
+        self._deltas = (1 - 2 * self._state) * self._field
+        self._energy = float(
+            self._offset + self._state @ (self._linear + self._field) / 2)
+
+    @property
+    def energy(self) -> float:
+        """Energy of the current state."""
+        return self._energy
+
+    @property
+    def state(self) -> npt.NDArray[np.int8]:
+        """Current values of the variables (read-only view)."""
+        view = self._state.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def deltas(self) -> npt.NDArray[np.float64]:
+        """Energy changes of flipping every variable (read-only view)."""
+        view = self._deltas.view()
+        view.flags.writeable = False
+        return view
+
+    def delta(self, i: int) -> float:
+        """Returns the energy change of flipping the variable i."""
+        return float(self._deltas[i])
+
+    def flip(self, i: int) -> float:
+        """Flips the variable i and returns the energy change."""
+        delta = float(self._deltas[i])
+        self._energy += delta
+        # +1 if the variable is switched on, -1 otherwise
+        direction = 1 - 2 * int(self._state[i])
+        self._state[i] ^= 1
+        self._deltas[i] = -delta
+
+        start, end = self._indptr[i], self._indptr[i + 1]
+        neighbours = self._neighbours[start:end]
+        change = direction * self._weights[start:end]
+        self._field[neighbours] += change
+        self._deltas[neighbours] += (
+            (1 - 2 * self._state[neighbours]) * change)
+        return delta
+
+    def assignment(self) -> dict[str, int]:
+        """Returns the current values of the variables by their names."""
+        return dict(zip(self.variables, self._state.tolist()))
@@ -6,6 +6,19 @@ from tqdm import tqdm
 from QHyper.optimizers.base import OptimizationResult
 
 
+_worker_func: Callable[[list[float]], OptimizationResult] | None = None
+
+
+def _init_worker(func: Callable[[list[float]], OptimizationResult]) -> None:
+    global _worker_func
+    _worker_func = func
+
+
+def _call_worker(arg: list[float]) -> OptimizationResult:
+    assert _worker_func is not None
+    return _worker_func(arg)
+
+
 def run_parallel(
         func: Callable[[list[float]], OptimizationResult],
         args: list[list[float]],
@@ -19,6 +32,11 @@ def run_parallel(
             results.append(result)
         return results
 
-    with mp.Pool(processes=processes) as pool:
+    # func (with the solver and its problem) is sent to every worker once,
+    # tasks contain only the arguments
+    chunksize = max(1, len(args) // (4 * processes))
+    with mp.Pool(processes=processes, initializer=_init_worker,
+                 initargs=(func,)) as pool:
         return list(tqdm(
-            pool.imap(func, args), total=len(args), disable=disable_tqdm))
+            pool.imap(_call_worker, args, chunksize=chunksize),
+            total=len(args), disable=disable_tqdm))
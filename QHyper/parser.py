@@ -2,8 +2,10 @@
 
 This module provides a way to parse sympy expressions and string to 
 :py:class:`~QHyper.polynomial.Polynomial`.
-It is not recommended to use this module for large polynomials as it is very
-slow in comparison to creating Polynomial directly from the dict.
+Sums of products of numbers and variables (e.g. the expanded sympy
+expressions) are parsed in a single pass, the terms are collected in the
+:py:class:`~QHyper.polynomial.PolynomialBuilder`. Other expressions
+(e.g. with parentheses) fall back to the slower ast parser.
 
 .. rubric:: Functions
 
@@ -14,9 +16,11 @@ slow in comparison to creating Polynomial directly from the dict.
 """
 
 import ast
+import re
+
 import sympy
 
-from QHyper.polynomial import Polynomial
+from QHyper.polynomial import Polynomial, PolynomialBuilder
 
 
 class ParserException(Exception):
@@ -91,11 +95,84 @@ def to_sympy(poly: Polynomial) -> str:
     return sympy.parse_expr(polynomial, evaluate=False)
 
 
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)"
+    r"|(?P<name>[A-Za-z_]\w*)|(?P<operator>\*\*|[-+*]))")
+
+
+def _number(token: str) -> float:
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+
+def _parse_terms(equation: str) -> PolynomialBuilder | None:
+    """Parses the sum of products of numbers and variables in one pass.
+    Returns None if the equation has a different form."""
+    builder = PolynomialBuilder()
+    position, end = 0, len(equation.rstrip())
+    sign, coefficient, term = 1, 1, []
+    last: tuple[str, str] | None = None
+    expect_operand = True
+
+    while position < end:
+        match = _TOKEN_PATTERN.match(equation, position)
+        if match is None:
+            return None
+        position = match.end()
+        kind = match.lastgroup
+        token = match.group(kind)
+
+        if expect_operand:
+            if kind == 'operator':
+                # unary signs are allowed only at the beginning of the term
+                if token == '*' or token == '**' or last is not None:
+                    return None
+                if token == '-':
+                    sign = -sign
+                continue
+            if kind == 'number':
+                coefficient *= _number(token)
+            else:
+                term.append(token)
+            last = kind, token
+            expect_operand = False
+        elif token == '*':
+            expect_operand = True
+        elif token == '**':
+            match = _TOKEN_PATTERN.match(equation, position)
+            if (last is None or match is None
+                    or not match.group('number')
+                    or not match.group('number').isdigit()
+                    or int(match.group('number')) == 0):
+                return None
+            position = match.end()
+            power = int(match.group('number'))
+            if last[0] == 'number':
+                coefficient *= _number(last[1]) ** (power - 1)
+            else:
+                term.extend([last[1]] * (power - 1))
+            last = None
+        elif token in '+-':
+            builder.add_term(tuple(term), sign * coefficient)
+            sign, coefficient, term = (1 if token == '+' else -1), 1, []
+            last = None
+            expect_operand = True
+        else:
+            return None
+
+    if expect_operand:
+        return None
+    builder.add_term(tuple(term), sign * coefficient)
+    return builder
+
+
 def from_str(equation: str) -> Polynomial:
     """Method to parse a string to a polynomial.
-    Uses ast parser to parse the equation. This method is very slow in 
-    comparison to creating Polynomial directly from the dict. Although, for 
-    smaller polynomials, it is not noticeable.
+    Sums of products of numbers and variables (with integer powers) are
+    parsed in linear time without creating intermediate polynomials.
+    Other equations are parsed with the ast parser, which is much slower.
 
     Parameters
     ----------
@@ -108,6 +185,10 @@ def from_str(equation: str) -> Polynomial:
         The parsed polynomial.
     """
 
+    builder = _parse_terms(equation)
+    if builder is not None:
+        return builder.build()
+
     parser = Parser()
     ast_tree = ast.parse(equation)
     parser.visit(ast_tree)
@@ -119,9 +200,9 @@ def from_str(equation: str) -> Polynomial:
 
 def from_sympy(equation: sympy.core.Expr) -> Polynomial:
     """Method to convert a sympy expression to a polynomial.
-    Uses ast parser to parse the equation. This method is very slow in 
-    comparison to creating Polynomial directly from the dict. Although, for 
-    smaller polynomials, it is not noticeable.
+    Polynomial expressions are expanded by :py:class:`sympy.Poly`, which
+    returns the terms directly. Other expressions are expanded and parsed
+    from the string with :py:func:`from_str`.
 
     Parameters
     ----------
@@ -134,4 +215,20 @@ def from_sympy(equation: sympy.core.Expr) -> Polynomial:
         The converted polynomial.
     """
 
-    return from_str(str(sympy.expand(equation)))
+    symbols = sorted(equation.free_symbols, key=lambda s: s.name)
+    if not symbols:
+        return from_str(str(sympy.expand(equation)))
+    try:
+        poly = sympy.Poly(equation, *symbols)
+    except sympy.PolynomialError:
+        return from_str(str(sympy.expand(equation)))
+
+    names = [symbol.name for symbol in symbols]
+    terms = {}
+    for powers, coefficient in poly.as_dict().items():
+        # symbols are sorted, so the terms are canonical
+        term = tuple(name for name, power in zip(names, powers)
+                     for _ in range(power))
+        terms[term] = (int(coefficient) if coefficient.is_Integer
+                       else float(coefficient))
+    return Polynomial.from_canonical(terms)
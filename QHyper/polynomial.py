@@ -1,5 +1,8 @@
 """ Module for polynomial representation.
 Implementation of the polynomials using dictionaries. Used in the whole system.
+For large polynomials there is also an array-backed compiled form, which
+stores the terms in NumPy arrays and performs the arithmetic in a vectorized
+way.
 
 .. rubric:: Main class
 
@@ -7,6 +10,9 @@ Implementation of the polynomials using dictionaries. Used in the whole system.
     :toctree: generated
 
     Polynomial  -- implementation of the polynomial.
+    CompiledPolynomial  -- array-backed implementation of the polynomial.
+    FrozenPolynomial  -- immutable and hashable polynomial.
+    PolynomialBuilder  -- bulk construction of the polynomial.
 
 
 .. rubric:: MyPy Type
@@ -15,10 +21,23 @@ Implementation of the polynomials using dictionaries. Used in the whole system.
 
 """
 
+import hashlib
+import os
+import struct
+import sys
+import zipfile
 from dataclasses import dataclass, field
 from collections import defaultdict
+from itertools import chain
+from types import MappingProxyType
 
-from typing import overload
+import numpy as np
+import numpy.typing as npt
+import scipy.sparse
+
+from typing import Any, Iterable, Mapping, Sequence, overload
+
+from QHyper.variables import VariableRegistry, natural_key
 
 
 @dataclass
@@ -45,29 +64,87 @@ class Polynomial:
         of variables and the value is the coefficient of the term
         For example, the polynomial 3*x + 2 + 4*x^2 is represented as
         {('x',): 3, ('x', 'x'): 4, (): 2}
+    binary : bool, default False
+        If True, all variables are treated as binary, so x*x is reduced to x.
+        Then the polynomial 3*x + 2 + 4*x^2 is represented as
+        {('x',): 7, (): 2}. Result of the operation on two polynomials
+        is binary if any of them is binary.
     """
 
     terms: dict[tuple[str, ...], float] = field(default_factory=dict)
+    binary: bool = False
 
     @overload
-    def __init__(self, terms: float | int) -> None: ...
+    def __init__(self, terms: float | int, binary: bool = False) -> None: ...
 
     @overload
-    def __init__(self, terms: dict[tuple[str, ...], float]) -> None: ...
+    def __init__(self, terms: dict[tuple[str, ...], float],
+                 binary: bool = False) -> None: ...
 
-    def __init__(self, terms: dict[tuple[str, ...], float] | float | int
-                 ) -> None:
+    def __init__(self, terms: dict[tuple[str, ...], float] | float | int,
+                 binary: bool = False) -> None:
         if isinstance(terms, (float, int)):
             terms = {tuple(): float(terms)}
         else:
             terms = terms.copy() if terms else {tuple(): 0}
 
         self.terms = defaultdict(float)
+        self.binary = binary
 
         for term, coefficient in terms.items():
             if coefficient == 0:
                 continue
-            self.terms[tuple(sorted(term))] += coefficient
+            self.terms[self._canonical(term)] += coefficient
+
+        if len(self.terms) < len(terms):
+            for term in [term for term, coefficient in self.terms.items()
+                         if coefficient == 0]:
+                del self.terms[term]
+
+    def _canonical(self, term: tuple[str, ...]) -> tuple[str, ...]:
+        if self.binary:
+            return tuple(sorted(set(term)))
+        return tuple(sorted(term))
+
+    @classmethod
+    def from_canonical(cls, terms: dict[tuple[str, ...], float],
+                       binary: bool = False) -> 'Polynomial':
+        """Trusted constructor for terms that are already canonical.
+
+        Unlike the regular constructor, it doesn't sort variables in the
+        keys and doesn't merge duplicates, so the caller has to guarantee
+        that every key is a sorted tuple and there are no zero coefficients.
+
+        Parameters
+        ----------
+        terms : dict[tuple[str, ...], float]
+            dictionary of terms with sorted keys
+        binary : bool, default False
+            If True, the polynomial is binary, then keys can't contain
+            repeated variables.
+
+        Returns
+        -------
+        Polynomial
+            Polynomial using provided terms.
+        """
+        polynomial = cls.__new__(cls)
+        polynomial.terms = defaultdict(float, terms)
+        polynomial.binary = binary
+        return polynomial
+
+    def as_binary(self) -> 'Polynomial':
+        """Method for converting the polynomial to the binary domain.
+
+        All variables are treated as binary, so repeated variables in the
+        terms are reduced e.g. x*x*y becomes x*y.
+
+        Returns
+        -------
+        Polynomial
+            Binary polynomial.
+        """
+        return Polynomial(self.terms, binary=True)
 
     @overload
     def __add__(self, other: float | int) -> 'Polynomial': ...
@@ -79,19 +156,46 @@ class Polynomial:
         if isinstance(other, (float, int)):
             return Polynomial({tuple(): float(other)}) + self
 
+        if isinstance(other, CompiledPolynomial):
+            return NotImplemented
         if not isinstance(other, Polynomial):
             raise TypeError(f"Unsupported operation: {self} + {other}")
 
-        new_terms = self.terms.copy()
+        new_terms = defaultdict(float, self.terms)
 
         for term, coefficient in other.terms.items():
             new_terms[term] += coefficient
 
-        return Polynomial(new_terms)
+        return Polynomial(new_terms, self.binary or other.binary)
 
     def __radd__(self, other: float | int) -> 'Polynomial':
         return self + other
 
+    def _accumulate(self, other: 'Polynomial', sign: float) -> None:
+        if self.binary and not other.binary:
+            other = other.as_binary()
+        elif other.binary and not self.binary:
+            # same result as self + other, which is binary as well
+            self.terms = self.as_binary().terms
+            self.binary = True
+        terms = self.terms
+        items = (list(other.terms.items()) if other is self
+                 else other.terms.items())
+        for term, coefficient in items:
+            value = terms.get(term, 0) + sign * coefficient
+            if value == 0:
+                terms.pop(term, None)
+            else:
+                terms[term] = value
+
+    def __iadd__(self, other: 'Polynomial | float | int') -> 'Polynomial':
+        if isinstance(other, (float, int)):
+            other = Polynomial(other)
+        if not isinstance(other, Polynomial):
+            return NotImplemented
+        self._accumulate(other, 1)
+        return self
+
     @overload
     def __sub__(self, other: float | int) -> 'Polynomial': ...
 
@@ -101,19 +205,29 @@ class Polynomial:
     def __sub__(self, other: 'Polynomial | float | int') -> 'Polynomial':
         if isinstance(other, (float, int)):
             return Polynomial({tuple(): float(other)}) - self
+        if isinstance(other, CompiledPolynomial):
+            return NotImplemented
         if not isinstance(other, Polynomial):
             raise TypeError(f"Unsupported operation: {self} - {other}")
 
-        new_terms = self.terms.copy()
+        new_terms = defaultdict(float, self.terms)
 
         for term, coefficient in other.terms.items():
             new_terms[term] -= coefficient
 
-        return Polynomial(new_terms)
+        return Polynomial(new_terms, self.binary or other.binary)
 
     def __rsub__(self, other: float | int) -> 'Polynomial':
         return -self + other
 
+    def __isub__(self, other: 'Polynomial | float | int') -> 'Polynomial':
+        if isinstance(other, (float, int)):
+            other = Polynomial(other)
+        if not isinstance(other, Polynomial):
+            return NotImplemented
+        self._accumulate(other, -1)
+        return self
+
     @overload
     def __mul__(self, other: float | int) -> 'Polynomial': ...
 
@@ -123,19 +237,22 @@ class Polynomial:
     def __mul__(self, other: 'Polynomial | float | int') -> 'Polynomial':
         if isinstance(other, (float, int)):
             return Polynomial({tuple(): float(other)}) * self
+        if isinstance(other, CompiledPolynomial):
+            return NotImplemented
         if not isinstance(other, Polynomial):
             raise TypeError(f"Unsupported operation: {self} * {other}")
 
-        new_terms = defaultdict(float)
+        binary = self.binary or other.binary
+        new_terms: defaultdict[tuple[str, ...], float] = defaultdict(float)
 
         for variables1, coefficient1 in self.terms.items():
             for variables2, coefficient2 in other.terms.items():
-                new_term = tuple(sorted(variables1 + variables2))
+                new_term = _multiply_terms(variables1, variables2, binary)
                 new_coefficient = coefficient1 * coefficient2
 
                 new_terms[new_term] += new_coefficient
 
-        return Polynomial(new_terms)
+        return Polynomial(new_terms, binary)
 
     def __rmul__(self, other: float | int) -> 'Polynomial':
         return self * other
@@ -152,24 +269,63 @@ class Polynomial:
             raise TypeError(f"Unsupported operation: {self} ** {power}")
         else:
             power_ = power
+        if power_ < 0:
+            raise ValueError(f"Unsupported operation: {self} ** {power}")
         if power_ == 0:
-            return Polynomial({tuple(): 1})
+            return Polynomial({tuple(): 1}, self.binary)
+        if power_ == 1:
+            return Polynomial.from_canonical(dict(self.terms), self.binary)
+        if power_ == 2:
+            return self.square()
 
-        result = self
-        for _ in range(power_ - 1):
-            result *= self
+        result: Polynomial | None = None
+        base = self
+        while power_:
+            if power_ & 1:
+                result = base if result is None else result * base
+            power_ >>= 1
+            if power_:
+                base = base.square()
 
+        assert result is not None
         return result
 
+    def square(self) -> 'Polynomial':
+        """Method for squaring the polynomial.
+
+        Uses the multinomial expansion - squares of the terms on the
+        diagonal and doubled products of the pairs of different terms,
+        so only half of the products is calculated in comparison to
+        the multiplication.
+
+        Returns
+        -------
+        Polynomial
+            Square of the polynomial.
+        """
+        items = list(self.terms.items())
+        new_terms: defaultdict[tuple[str, ...], float] = defaultdict(float)
+
+        for i, (variables1, coefficient1) in enumerate(items):
+            new_terms[_multiply_terms(variables1, variables1, self.binary)] += (
+                coefficient1 * coefficient1)
+            double = 2 * coefficient1
+            for variables2, coefficient2 in items[i + 1:]:
+                new_terms[_multiply_terms(
+                    variables1, variables2, self.binary)] += (
+                    double * coefficient2)
+
+        return Polynomial(new_terms, self.binary)
+
     def __neg__(self) -> 'Polynomial':
-        return Polynomial({
+        return Polynomial.from_canonical({
             term: -coefficient for term, coefficient in self.terms.items()
-        })
+        }, self.binary)
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, dict):
             terms = other
-        elif isinstance(other, Polynomial):
+        elif isinstance(other, (Polynomial, CompiledPolynomial)):
             terms = other.terms
         else:
             raise TypeError(f"Unsupported operation: {self} == {other}")
@@ -194,7 +350,7 @@ class Polynomial:
 
         _terms = self.terms.copy()
         constant = _terms.pop(tuple(), 0)
-        return Polynomial(_terms), constant
+        return Polynomial(_terms, self.binary), constant
 
     def degree(self) -> int:
         """Method for calculating the degree of the polynomial.
@@ -204,7 +360,7 @@ class Polynomial:
         int
             The degree of the polynomial.
         """
-        return max(len(term) for term in self.terms)
+        return max(map(len, self.terms), default=0)
 
     def get_variables(self) -> set[str]:
         """Method for extracting variables from the polynomial.
@@ -216,5 +372,1183 @@ class Polynomial:
         """
         return set(variable for term in self.terms for variable in term)
 
+    @classmethod
+    def from_qubo_matrix(cls, matrix: Any,
+                         linear: npt.ArrayLike | None = None,
+                         offset: float = 0,
+                         names: Sequence[str] | None = None,
+                         binary: bool = False) -> 'Polynomial':
+        """Method for creating the quadratic polynomial from the matrix.
+        See :py:meth:`CompiledPolynomial.from_qubo_matrix`.
+
+        Parameters
+        ----------
+        matrix : npt.ArrayLike | scipy.sparse.spmatrix
+            square matrix Q of the quadratic terms x^T Q x
+        linear : npt.ArrayLike, optional
+            coefficients of the linear terms
+        offset : float, default 0
+            constant term
+        names : Sequence[str], optional
+            names of the variables, by default x0, x1, ...
+        binary : bool, default False
+            If True, the polynomial is binary.
+
+        Returns
+        -------
+        Polynomial
+            Polynomial equal to x^T Q x + linear^T x + offset.
+        """
+        compiled = CompiledPolynomial.from_qubo_matrix(
+            matrix, linear, offset, names, binary)
+        return cls.from_canonical(compiled.terms, binary)
+
+    def to_sparse_qubo(self, variable_order: Sequence[str] | None = None
+                       ) -> tuple[scipy.sparse.coo_matrix,
+                                  npt.NDArray[np.float64], float, list[str]]:
+        """Method for exporting the quadratic polynomial to the matrix form.
+        See :py:meth:`CompiledPolynomial.to_sparse_qubo`.
+
+        Parameters
+        ----------
+        variable_order : Sequence[str], optional
+            order of the variables, by default the variables used in
+            the polynomial sorted by :py:func:`~QHyper.variables.natural_key`
+
+        Returns
+        -------
+        tuple[scipy.sparse.coo_matrix, npt.NDArray[np.float64], float,
+              list[str]]
+            Upper triangular matrix of the quadratic terms, linear
+            coefficients, offset and the order of the variables.
+        """
+        if variable_order is None:
+            variable_order = sorted(self.get_variables(), key=natural_key)
+        return self.compile().to_sparse_qubo(variable_order)
+
+    def evaluate_batch(self, bits: npt.NDArray[np.uint8],
+                       variable_order: Sequence[str],
+                       chunk_size: int | None = None
+                       ) -> npt.NDArray[np.float64]:
+        """Method for evaluating the polynomial for many assignments at once.
+        See :py:meth:`CompiledPolynomial.evaluate_batch`.
+
+        Parameters
+        ----------
+        bits : npt.NDArray[np.uint8]
+            array of shape (m, n) with m assignments of n binary variables
+        variable_order : Sequence[str]
+            names of the variables corresponding to the columns of bits
+        chunk_size : int, optional
+            number of assignments evaluated at once
+
+        Returns
+        -------
+        npt.NDArray[np.float64]
+            Values of the polynomial for every assignment.
+        """
+        return self.compile().evaluate_batch(bits, variable_order, chunk_size)
+
+    def compile(self, registry: VariableRegistry | None = None
+                ) -> 'CompiledPolynomial':
+        """Method for converting the polynomial to the array-backed form.
+
+        Parameters
+        ----------
+        registry : VariableRegistry, optional
+            Registry of the variables. If provided, ids of the variables
+            are taken from it (missing variables are registered), so all
+            polynomials compiled with the same registry share the ids.
+
+        Returns
+        -------
+        CompiledPolynomial
+            Polynomial with terms stored in NumPy arrays.
+        """
+        return CompiledPolynomial.from_terms(
+            self.terms, self.binary, registry)
+
+    def prune(self, abs_tol: float = 0, rel_tol: float = 0
+              ) -> tuple['Polynomial', float]:
+        """Method for removing terms with negligible coefficients.
+
+        Term is removed if the absolute value of its coefficient is not
+        greater than max(abs_tol, rel_tol * largest absolute coefficient).
+        The constant term is never removed.
+
+        Parameters
+        ----------
+        abs_tol : float, default 0
+            absolute tolerance
+        rel_tol : float, default 0
+            tolerance relative to the largest absolute coefficient of
+            the non-constant terms
+
+        Returns
+        -------
+        Polynomial
+            Polynomial without the removed terms.
+        float
+            Bound of the energy error for binary variables - sum of the
+            absolute values of the removed coefficients.
+        """
+        coefficients = [abs(c) for term, c in self.terms.items() if term]
+        tolerance = max(abs_tol, rel_tol * max(coefficients, default=0))
+        terms, error = {}, 0.
+        for term, coefficient in self.terms.items():
+            if term and abs(coefficient) <= tolerance:
+                error += abs(coefficient)
+            else:
+                terms[term] = coefficient
+        return Polynomial.from_canonical(terms, self.binary), error
+
+    def quantize(self, levels: int) -> tuple['Polynomial', float]:
+        """Method for rounding the coefficients to the uniform grid.
+
+        Coefficients of the non-constant terms are rounded to the nearest
+        multiple of the largest absolute coefficient divided by levels,
+        so at most 2 * levels + 1 different values remain. Terms rounded
+        to zero are removed.
+
+        Parameters
+        ----------
+        levels : int
+            number of the positive levels
+
+        Returns
+        -------
+        Polynomial
+            Polynomial with the rounded coefficients.
+        float
+            Bound of the energy error for binary variables - sum of the
+            absolute changes of the coefficients.
+
+        Raises
+        ------
+        ValueError
+            If levels is smaller than 1.
+        """
+        if levels < 1:
+            raise ValueError(f"Number of levels must be positive, got {levels}")
+        step = max((abs(c) for term, c in self.terms.items() if term),
+                   default=0) / levels
+        if step == 0:
+            return self.prune()
+        terms, error = {}, 0.
+        for term, coefficient in self.terms.items():
+            rounded = (round(coefficient / step) * step if term
+                       else coefficient)
+            error += abs(coefficient - rounded)
+            if rounded != 0:
+                terms[term] = rounded
+        return Polynomial.from_canonical(terms, self.binary), error
+
+    def substitute(self, assignment: Mapping[str, float]) -> 'Polynomial':
+        """Method for fixing the values of the variables.
+        See :py:meth:`CompiledPolynomial.substitute`.
+
+        Parameters
+        ----------
+        assignment : Mapping[str, float]
+            values of the fixed variables, e.g. {'x0': 1, 'x3': 0}
+
+        Returns
+        -------
+        Polynomial
+            Polynomial of the remaining variables.
+        """
+        # one pass over the terms, removing the fixed variables keeps
+        # the remaining ones sorted
+        terms: defaultdict[tuple[str, ...], float] = defaultdict(float)
+        for term, coefficient in self.terms.items():
+            if any(variable in assignment for variable in term):
+                remaining = []
+                for variable in term:
+                    if variable in assignment:
+                        coefficient *= assignment[variable]
+                    else:
+                        remaining.append(variable)
+                term = tuple(remaining)
+            terms[term] += coefficient
+        return Polynomial.from_canonical(
+            {term: coefficient for term, coefficient in terms.items()
+             if coefficient != 0}, self.binary)
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Method for saving the polynomial in the binary format.
+        See :py:meth:`CompiledPolynomial.save`.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            path of the file
+        """
+        self.compile().save(path)
+
+    @staticmethod
+    def load(path: str | os.PathLike, mmap: bool = True
+             ) -> 'CompiledPolynomial':
+        """Method for loading the polynomial saved with :py:meth:`save`.
+        See :py:meth:`CompiledPolynomial.load`.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            path of the file
+        mmap : bool, default True
+            If True, arrays are memory-mapped instead of being read.
+
+        Returns
+        -------
+        CompiledPolynomial
+            Loaded polynomial in the compiled form, it can be used in the
+            same places as the polynomial or converted back with
+            :py:meth:`CompiledPolynomial.to_polynomial`.
+        """
+        return CompiledPolynomial.load(path, mmap)
+
+    def fingerprint(self, decimals: int = 10) -> str:
+        """Method for calculating the structural hash of the polynomial.
+
+        The hash is calculated over the sorted terms with coefficients
+        rounded to the given number of decimals, so it doesn't depend
+        on the order in which the polynomial was built and it is stable
+        across processes (unlike the built-in hash of the strings).
+
+        Parameters
+        ----------
+        decimals : int, default 10
+            number of decimals the coefficients are rounded to
+
+        Returns
+        -------
+        str
+            128-bit hash as a hexadecimal string.
+        """
+        return _fingerprint(self.terms.items(), decimals)
+
+    def freeze(self) -> 'FrozenPolynomial':
+        """Method for creating the immutable copy of the polynomial.
+
+        Returns
+        -------
+        FrozenPolynomial
+            Immutable and hashable polynomial with the same terms.
+        """
+        if isinstance(self, FrozenPolynomial):
+            return self
+        return FrozenPolynomial.from_canonical(self.terms, self.binary)
+
+    def __reduce__(self) -> tuple:
+        # terms are pickled as the table of the variable names and the
+        # packed array of their ids, instead of the dict of tuples of str
+        compiled = CompiledPolynomial.from_terms(self.terms)
+        return _unpickle_polynomial, (
+            type(self), compiled.variables, _pack_indices(compiled),
+            compiled.coefficients, self.binary)
+
+
+class FrozenPolynomial(Polynomial):
+    """
+    Immutable variant of the :py:class:`Polynomial`.
+
+    Terms can't be modified and in-place operators return new
+    polynomials, so the frozen polynomial can be safely shared and used
+    as a key in dictionaries. The hash is based on
+    :py:meth:`Polynomial.fingerprint`. Results of the arithmetic
+    operations are regular polynomials.
+    """
+
+    _hash: int | None
+
+    def __init__(self, terms: dict[tuple[str, ...], float] | float | int,
+                 binary: bool = False) -> None:
+        polynomial = Polynomial(terms, binary)
+        self._freeze(polynomial.terms, binary)
+
+    def _freeze(self, terms: dict[tuple[str, ...], float],
+                binary: bool) -> None:
+        object.__setattr__(
+            self, 'terms', MappingProxyType(dict(terms)))
+        object.__setattr__(self, 'binary', binary)
+        object.__setattr__(self, '_hash', None)
+
+    @classmethod
+    def from_canonical(cls, terms: dict[tuple[str, ...], float],
+                       binary: bool = False) -> 'FrozenPolynomial':
+        polynomial = cls.__new__(cls)
+        polynomial._freeze(terms, binary)
+        return polynomial
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __iadd__(self, other: 'Polynomial | float | int') -> 'Polynomial':
+        return self + other
+
+    def __isub__(self, other: 'Polynomial | float | int') -> 'Polynomial':
+        return self - other
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            value = int(self.fingerprint(), 16)
+            object.__setattr__(self, '_hash', value)
+            return value
+        return self._hash
+
+
+def _pack_indices(polynomial: 'CompiledPolynomial') -> np.ndarray:
+    dtype = np.int16 if len(polynomial.variables) < 2**15 else np.int32
+    return polynomial.indices.astype(dtype)
+
+
+def _unpickle_polynomial(cls: type[Polynomial], variables: tuple[str, ...],
+                         indices: np.ndarray, coefficients: np.ndarray,
+                         binary: bool) -> Polynomial:
+    # names are interned, so polynomials of one problem share the strings
+    variables = tuple(map(sys.intern, variables))
+    degrees = (indices >= 0).sum(axis=1)
+    terms = {
+        tuple(variables[i] for i in row[:degree]): coefficient
+        for row, degree, coefficient in zip(
+            indices.tolist(), degrees.tolist(), coefficients.tolist())
+    }
+    return cls.from_canonical(terms, binary)
+
+
+def _fingerprint(terms: Iterable[tuple[tuple[str, ...], float]],
+                 decimals: int) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for term, coefficient in sorted(terms):
+        coefficient = round(float(coefficient), decimals)
+        if coefficient == 0:
+            continue
+        digest.update(
+            f"{chr(31).join(term)}{chr(30)}{coefficient!r}\n".encode())
+    return digest.hexdigest()
+
+
+def _memmap_npz(path: str | os.PathLike) -> dict[str, np.ndarray]:
+    """Memory-maps arrays stored without compression in the npz file."""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as file:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Array {info.filename} is compressed")
+            # data starts after the local file header, which has 30 bytes
+            # followed by the file name and the extra field
+            file.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH', file.read(4))
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                header = np.lib.format.read_array_header_1_0(file)
+            else:
+                header = np.lib.format.read_array_header_2_0(file)
+            shape, fortran_order, dtype = header
+            name = info.filename.removesuffix('.npy')
+            if dtype.hasobject:
+                raise ValueError(f"Array {name} contains Python objects")
+            if 0 in shape:
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+            arrays[name] = np.memmap(
+                file, dtype=dtype, mode='r', offset=file.tell(),
+                shape=shape, order='F' if fortran_order else 'C')
+    return arrays
+
+
+def _multiply_terms(variables1: tuple[str, ...], variables2: tuple[str, ...],
+                    binary: bool) -> tuple[str, ...]:
+    if binary:
+        return tuple(sorted(set(variables1 + variables2)))
+    return tuple(sorted(variables1 + variables2))
+
+
+def _sort_rows(indices: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    """Sort variables in every term, keeping the padding at the end."""
+    if indices.size == 0:
+        return indices
+    padding = np.iinfo(np.int64).max
+    keyed = np.where(indices < 0, padding, indices)
+    keyed.sort(axis=1)
+    return np.where(keyed == padding, -1, keyed)
+
+
+def _reduce_binary_rows(indices: npt.NDArray[np.int64]
+                        ) -> npt.NDArray[np.int64]:
+    """Remove repeated variables from every term (x*x = x)."""
+    indices = _sort_rows(indices)
+    if indices.shape[1] < 2:
+        return indices
+    repeated = np.zeros(indices.shape, dtype=bool)
+    repeated[:, 1:] = ((indices[:, 1:] == indices[:, :-1])
+                       & (indices[:, 1:] >= 0))
+    if not repeated.any():
+        return indices
+    return _sort_rows(np.where(repeated, -1, indices))
+
+
+def _pad_columns(indices: npt.NDArray[np.int64], width: int
+                 ) -> npt.NDArray[np.int64]:
+    if indices.shape[1] >= width:
+        return indices
+    padding = np.full(
+        (indices.shape[0], width - indices.shape[1]), -1, dtype=np.int64)
+    return np.hstack((indices, padding))
+
+
+@dataclass
+class CompiledPolynomial:
+    """
+    Array-backed representation of the polynomial.
+
+    Variables are stored once in the variable table and every term refers
+    to them by their integer id. Terms are kept in a 2D array, where each row
+    contains ids of the variables in the term, padded with -1 up to the
+    highest degree. Thanks to that addition, scaling, multiplication and
+    merging of duplicated terms are performed with NumPy instead of Python
+    loops, which matters for polynomials with tens of thousands of terms.
+    Compiled polynomial can be used in the same places as
+    :py:class:`Polynomial` e.g. as an objective function of the problem.
+    All methods return polynomials in the canonical form (sorted variables
+    in terms, no duplicated terms, no zero coefficients). When creating it
+    directly from arrays, call :py:meth:`merge_duplicates` to obtain it.
+
+    Attributes
+    ----------
+    variables : tuple[str, ...]
+        variable table, id of the variable is its position in the table
+    indices : npt.NDArray[np.int64]
+        array of shape (number of terms, maximal degree) with variable ids
+        of each term, padded with -1
+    coefficients : npt.NDArray[np.float64]
+        coefficients of the terms
+    binary : bool, default False
+        If True, all variables are treated as binary, so x*x is reduced to x.
+    degrees : npt.NDArray[np.int64]
+        degrees of the terms, calculated from indices
+    """
+
+    variables: tuple[str, ...]
+    indices: npt.NDArray[np.int64]
+    coefficients: npt.NDArray[np.float64]
+    binary: bool = False
+    degrees: npt.NDArray[np.int64] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.variables = tuple(self.variables)
+        self.coefficients = np.asarray(self.coefficients, dtype=np.float64)
+        indices = np.asarray(self.indices, dtype=np.int64)
+        if indices.ndim != 2:
+            indices = indices.reshape(
+                len(self.coefficients), -1 if indices.size else 0)
+        if len(indices) != len(self.coefficients):
+            raise ValueError(
+                "Number of terms and coefficients must be the same")
+        self.indices = indices
+        self.degrees = (indices >= 0).sum(axis=1)
+
+    @staticmethod
+    def from_terms(terms: dict[tuple[str, ...], float], binary: bool = False,
+                   registry: VariableRegistry | None = None,
+                   merge: bool = True) -> 'CompiledPolynomial':
+        """Method for creating compiled polynomial from the dictionary of
+        terms, the same as used in :py:class:`Polynomial`.
+
+        Parameters
+        ----------
+        terms : dict[tuple[str, ...], float]
+            dictionary of terms and their coefficients
+        binary : bool, default False
+            If True, variables are treated as binary.
+        registry : VariableRegistry, optional
+            Registry providing ids of the variables. By default the ids
+            are assigned in the alphabetical order of the variables.
+        merge : bool, default True
+            If False, terms are assumed to be unique and they are kept
+            in the order of the dictionary.
+
+        Returns
+        -------
+        CompiledPolynomial
+            Compiled polynomial with merged duplicated terms.
+        """
+        keys = list(terms)
+        degrees = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+        used_variables = set(chain.from_iterable(keys))
+        if registry is None:
+            variables = sorted(used_variables)
+            position = {variable: i for i, variable in enumerate(variables)}
+            flat = np.fromiter(
+                (position[variable] for key in keys for variable in key),
+                dtype=np.int64, count=int(degrees.sum())
+            )
+        else:
+            registry.register_many(used_variables)
+            variables = list(registry.names)
+            flat = registry.indices(chain.from_iterable(keys))
+        width = int(degrees.max(initial=0))
+        indices = np.full((len(keys), width), -1, dtype=np.int64)
+        indices[np.arange(width) < degrees[:, None]] = flat
+        coefficients = np.fromiter(
+            terms.values(), dtype=np.float64, count=len(keys))
+        if binary:
+            indices = _reduce_binary_rows(indices)
+
+        compiled = CompiledPolynomial(
+            tuple(variables), indices, coefficients, binary)
+        return compiled.merge_duplicates() if merge else compiled
+
+    def to_polynomial(self) -> Polynomial:
+        """Method for converting compiled polynomial back to the
+        dictionary representation.
+
+        Returns
+        -------
+        Polynomial
+            Polynomial with the same terms.
+        """
+        return Polynomial.from_canonical(self.terms, self.binary)
+
+    @property
+    def terms(self) -> dict[tuple[str, ...], float]:
+        """Dictionary of terms in the same form as :py:attr:`Polynomial.terms`.
+        """
+        variables = self.variables
+        return {
+            tuple(sorted(variables[i] for i in row[:degree])): coefficient
+            for row, degree, coefficient in zip(
+                self.indices.tolist(), self.degrees.tolist(),
+                self.coefficients.tolist())
+        }
+
+    def __len__(self) -> int:
+        return len(self.coefficients)
+
+    def __reduce__(self) -> tuple:
+        return CompiledPolynomial, (
+            self.variables, _pack_indices(self), self.coefficients,
+            self.binary)
+
+    def merge_duplicates(self) -> 'CompiledPolynomial':
+        """Method for merging terms with the same variables.
+
+        Variables in every term are sorted, coefficients of the duplicated
+        terms are summed up, and the terms with zero coefficients are removed.
+
+        Returns
+        -------
+        CompiledPolynomial
+            Polynomial in the canonical form.
+        """
+        indices = _sort_rows(self.indices)
+        if len(indices) == 0:
+            return CompiledPolynomial(
+                self.variables, np.empty((0, 0), dtype=np.int64),
+                np.empty(0), self.binary)
+
+        if indices.shape[1] == 0:
+            unique = indices[:1]
+            coefficients = np.array([self.coefficients.sum()])
+        else:
+            unique, inverse = np.unique(
+                indices, axis=0, return_inverse=True)
+            coefficients = np.bincount(
+                inverse.reshape(-1), weights=self.coefficients,
+                minlength=len(unique))
+
+        non_zero = coefficients != 0
+        unique = unique[non_zero]
+        width = int((unique >= 0).sum(axis=1).max(initial=0))
+        return CompiledPolynomial(
+            self.variables, unique[:, :width], coefficients[non_zero],
+            self.binary)
+
+    def _aligned(self, other: 'CompiledPolynomial'
+                 ) -> tuple[tuple[str, ...], npt.NDArray[np.int64],
+                            npt.NDArray[np.int64]]:
+        """Returns common variable table and indices of both polynomials
+        expressed in it."""
+        # polynomials compiled with the same registry share the prefix
+        # of the variable table, so no remapping is needed
+        if self.variables[:len(other.variables)] == other.variables:
+            return self.variables, self.indices, other.indices
+        if other.variables[:len(self.variables)] == self.variables:
+            return other.variables, self.indices, other.indices
+
+        position = {variable: i for i, variable in enumerate(self.variables)}
+        variables = list(self.variables)
+        for variable in other.variables:
+            if variable not in position:
+                position[variable] = len(variables)
+                variables.append(variable)
+
+        mapping = np.array(
+            [position[variable] for variable in other.variables],
+            dtype=np.int64)
+        other_indices = np.where(
+            other.indices < 0, -1,
+            mapping[np.maximum(other.indices, 0)] if len(mapping)
+            else other.indices)
+        return tuple(variables), self.indices, other_indices
+
+    @staticmethod
+    def _compile(other: 'PolynomialType | CompiledPolynomial'
+                 ) -> 'CompiledPolynomial':
+        if isinstance(other, CompiledPolynomial):
+            return other
+        if isinstance(other, Polynomial):
+            return other.compile()
+        if isinstance(other, (float, int)):
+            return CompiledPolynomial(
+                (), np.empty((1, 0), dtype=np.int64),
+                np.array([other], dtype=np.float64)).merge_duplicates()
+        if isinstance(other, dict):
+            return CompiledPolynomial.from_terms(other)
+        raise TypeError(f"Unsupported operand: {other}")
+
+    def add(self, other: 'CompiledPolynomial') -> 'CompiledPolynomial':
+        """Vectorized addition of two compiled polynomials."""
+        variables, indices, other_indices = self._aligned(other)
+        width = max(indices.shape[1], other_indices.shape[1])
+        binary = self.binary or other.binary
+        indices = np.vstack((_pad_columns(indices, width),
+                             _pad_columns(other_indices, width)))
+        if binary and not (self.binary and other.binary):
+            indices = _reduce_binary_rows(indices)
+        return CompiledPolynomial(
+            variables, indices,
+            np.concatenate((self.coefficients, other.coefficients)), binary
+        ).merge_duplicates()
+
+    def scale(self, factor: float) -> 'CompiledPolynomial':
+        """Vectorized multiplication of the polynomial by a number."""
+        return CompiledPolynomial(
+            self.variables, self.indices, self.coefficients * factor,
+            self.binary
+        ).merge_duplicates()
+
+    def multiply(self, other: 'CompiledPolynomial') -> 'CompiledPolynomial':
+        """Vectorized multiplication of two compiled polynomials.
+
+        Every term of the first polynomial is multiplied by every term
+        of the second one, then duplicated terms are merged.
+        """
+        variables, indices, other_indices = self._aligned(other)
+        binary = self.binary or other.binary
+        indices = np.hstack((np.repeat(indices, len(other_indices), axis=0),
+                             np.tile(other_indices, (len(indices), 1))))
+        if binary:
+            indices = _reduce_binary_rows(indices)
+        return CompiledPolynomial(
+            variables, indices,
+            np.outer(self.coefficients, other.coefficients).reshape(-1),
+            binary
+        ).merge_duplicates()
+
+    def as_binary(self) -> 'CompiledPolynomial':
+        """Method for converting the polynomial to the binary domain,
+        repeated variables in the terms are reduced."""
+        return CompiledPolynomial(
+            self.variables, _reduce_binary_rows(self.indices),
+            self.coefficients, True
+        ).merge_duplicates()
+
+    def square(self) -> 'CompiledPolynomial':
+        """Vectorized squaring of the polynomial.
+
+        Only pairs from the upper triangle are multiplied, products of
+        different terms are doubled.
+        """
+        first, second = np.triu_indices(len(self.coefficients))
+        indices = np.hstack((self.indices[first], self.indices[second]))
+        if self.binary:
+            indices = _reduce_binary_rows(indices)
+        coefficients = self.coefficients[first] * self.coefficients[second]
+        coefficients[first != second] *= 2
+        return CompiledPolynomial(
+            self.variables, indices, coefficients, self.binary
+        ).merge_duplicates()
+
+    def __add__(self, other: 'PolynomialType | CompiledPolynomial'
+                ) -> 'CompiledPolynomial':
+        return self.add(self._compile(other))
+
+    def __radd__(self, other: 'PolynomialType') -> 'CompiledPolynomial':
+        return self._compile(other).add(self)
+
+    def __sub__(self, other: 'PolynomialType | CompiledPolynomial'
+                ) -> 'CompiledPolynomial':
+        return self.add(self._compile(other).scale(-1))
+
+    def __rsub__(self, other: 'PolynomialType') -> 'CompiledPolynomial':
+        return self._compile(other).add(self.scale(-1))
+
+    def __mul__(self, other: 'PolynomialType | CompiledPolynomial'
+                ) -> 'CompiledPolynomial':
+        if isinstance(other, (float, int)):
+            return self.scale(other)
+        return self.multiply(self._compile(other))
+
+    def __rmul__(self, other: 'PolynomialType') -> 'CompiledPolynomial':
+        if isinstance(other, (float, int)):
+            return self.scale(other)
+        return self._compile(other).multiply(self)
+
+    def __neg__(self) -> 'CompiledPolynomial':
+        return self.scale(-1)
+
+    def __pow__(self, power: int) -> 'CompiledPolynomial':
+        if not isinstance(power, int) or power < 0:
+            raise TypeError(f"Unsupported operation: {self} ** {power}")
+        if power == 2:
+            return self.square()
+
+        result = CompiledPolynomial(
+            (), np.empty((1, 0), dtype=np.int64), np.ones(1), self.binary)
+        for _ in range(power):
+            result = result.multiply(self)
+        return result
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Polynomial, CompiledPolynomial)):
+            return self.terms == other.terms
+        if isinstance(other, dict):
+            return self.terms == other
+        raise TypeError(f"Unsupported operation: {self} == {other}")
+
+    def separate_const(self) -> tuple['CompiledPolynomial', float]:
+        """Method for separating constant term from the rest of the polynomial.
+
+        Returns
+        -------
+        CompiledPolynomial
+            Polynomial without the constant term.
+        float
+            Constant term of the polynomial.
+        """
+        constant = self.degrees == 0
+        return (
+            CompiledPolynomial(
+                self.variables, self.indices[~constant],
+                self.coefficients[~constant], self.binary),
+            float(self.coefficients[constant].sum())
+        )
+
+    def degree(self) -> int:
+        """Method for calculating the degree of the polynomial.
+
+        Returns
+        -------
+        int
+            The degree of the polynomial.
+        """
+        return int(self.degrees.max(initial=0))
+
+    @staticmethod
+    def from_qubo_matrix(matrix: Any, linear: npt.ArrayLike | None = None,
+                         offset: float = 0,
+                         names: Sequence[str] | None = None,
+                         binary: bool = False) -> 'CompiledPolynomial':
+        """Method for creating the quadratic polynomial from the matrix.
+
+        Diagonal entries of the matrix become the squares of the variables
+        (or linear terms when the polynomial is binary) and the pairs of
+        symmetric entries Q[i, j], Q[j, i] are summed up into one term.
+        Matrix can be dense or any scipy.sparse matrix, only its non-zero
+        entries are processed.
+
+        Parameters
+        ----------
+        matrix : npt.ArrayLike | scipy.sparse.spmatrix
+            square matrix Q of the quadratic terms x^T Q x
+        linear : npt.ArrayLike, optional
+            coefficients of the linear terms
+        offset : float, default 0
+            constant term
+        names : Sequence[str], optional
+            names of the variables, by default x0, x1, ...
+        binary : bool, default False
+            If True, the polynomial is binary.
+
+        Returns
+        -------
+        CompiledPolynomial
+            Polynomial equal to x^T Q x + linear^T x + offset.
+        """
+        coo = scipy.sparse.coo_matrix(matrix)
+        size = coo.shape[0]
+        if coo.shape != (size, size):
+            raise ValueError(f"QUBO matrix must be square, got {coo.shape}")
+        if names is None:
+            names = [f"x{i}" for i in range(size)]
+        if len(names) != size:
+            raise ValueError(
+                f"Expected {size} names of the variables, got {len(names)}")
+
+        row = coo.row.astype(np.int64)
+        col = coo.col.astype(np.int64)
+        quadratic = np.column_stack(
+            (np.minimum(row, col), np.maximum(row, col)))
+        if binary:
+            quadratic[row == col, 1] = -1
+        coefficients = [coo.data.astype(np.float64)]
+        indices = [quadratic]
+
+        if linear is not None:
+            linear = np.asarray(linear, dtype=np.float64).reshape(-1)
+            if len(linear) != size:
+                raise ValueError(
+                    f"Expected {size} linear coefficients, got {len(linear)}")
+            non_zero = np.flatnonzero(linear)
+            indices.append(np.column_stack(
+                (non_zero, np.full(len(non_zero), -1))))
+            coefficients.append(linear[non_zero])
+
+        indices.append(np.array([[-1, -1]]))
+        coefficients.append(np.array([offset], dtype=np.float64))
+
+        return CompiledPolynomial(
+            tuple(names), np.vstack(indices), np.concatenate(coefficients),
+            binary
+        ).merge_duplicates()
+
+    def to_sparse_qubo(self, variable_order: Sequence[str] | None = None
+                       ) -> tuple[scipy.sparse.coo_matrix,
+                                  npt.NDArray[np.float64], float, list[str]]:
+        """Method for exporting the quadratic polynomial to the matrix form.
+
+        Inverse of :py:meth:`from_qubo_matrix`, the polynomial is equal
+        to x^T Q x + linear^T x + offset, where Q is upper triangular
+        and its diagonal contains the squares of the variables.
+
+        Parameters
+        ----------
+        variable_order : Sequence[str], optional
+            order of the variables, by default the variable table
+
+        Returns
+        -------
+        tuple[scipy.sparse.coo_matrix, npt.NDArray[np.float64], float,
+              list[str]]
+            Upper triangular matrix of the quadratic terms, linear
+            coefficients, offset and the order of the variables.
+        """
+        if self.degree() > 2:
+            raise ValueError(
+                "Only polynomials of degree at most 2 can be exported "
+                f"to QUBO matrix, got degree {self.degree()}")
+
+        indices = _pad_columns(self.indices, 2)[:, :2]
+        if variable_order is None:
+            variable_order = list(self.variables)
+        else:
+            variable_order = list(variable_order)
+            position = {name: i for i, name in enumerate(variable_order)}
+            missing = self.get_variables() - position.keys()
+            if missing:
+                raise ValueError(
+                    f"Variables {sorted(missing)} are missing in the order")
+            mapping = np.array(
+                [position.get(name, -1) for name in self.variables] + [-1],
+                dtype=np.int64)
+            indices = mapping[indices]
+
+        size = len(variable_order)
+        degrees = self.degrees
+        offset = float(self.coefficients[degrees == 0].sum())
+        linear = np.bincount(
+            indices[degrees == 1, 0], weights=self.coefficients[degrees == 1],
+            minlength=size).astype(np.float64)
+        quadratic = indices[degrees == 2]
+        matrix = scipy.sparse.coo_matrix(
+            (self.coefficients[degrees == 2],
+             (quadratic.min(axis=1), quadratic.max(axis=1))),
+            shape=(size, size))
+        return matrix, linear, offset, variable_order
+
+    def evaluate_batch(self, bits: npt.NDArray[np.uint8],
+                       variable_order: Sequence[str],
+                       chunk_size: int | None = None
+                       ) -> npt.NDArray[np.float64]:
+        """Method for evaluating the polynomial for many assignments at once.
+
+        Values of the variables are gathered for every term, multiplied
+        along the term and summed up with the coefficients. Assignments
+        are processed in chunks to bound the memory usage.
+
+        Parameters
+        ----------
+        bits : npt.NDArray[np.uint8]
+            array of shape (m, n) with m assignments of n binary variables
+        variable_order : Sequence[str]
+            names of the variables corresponding to the columns of bits
+        chunk_size : int, optional
+            number of assignments evaluated at once, by default it is chosen
+            so that the intermediate array has about 4M elements
+
+        Returns
+        -------
+        npt.NDArray[np.float64]
+            Values of the polynomial for every assignment.
+        """
+        bits = np.asarray(bits)
+        if bits.ndim != 2 or bits.shape[1] != len(variable_order):
+            raise ValueError(
+                "Bits must be 2D array with column for each variable")
+
+        column = {variable: i for i, variable in enumerate(variable_order)}
+        missing = self.get_variables() - column.keys()
+        if missing:
+            raise ValueError(f"Missing values of variables: {missing}")
+
+        mapping = np.array(
+            [column.get(variable, -1) for variable in self.variables] + [-1],
+            dtype=np.int64)
+        # padding refers to the additional column filled with ones
+        columns = np.where(self.indices < 0, len(variable_order),
+                           mapping[self.indices])
+
+        if chunk_size is None:
+            chunk_size = max(1, (1 << 22) // max(1, len(self.coefficients)))
+
+        energies = np.empty(len(bits), dtype=np.float64)
+        for start in range(0, len(bits), chunk_size):
+            chunk = bits[start:start + chunk_size]
+            # variables in rows, so gathering copies contiguous memory
+            values = np.ones((len(variable_order) + 1, len(chunk)),
+                             dtype=np.uint8)
+            values[:-1] = chunk.T
+            products = np.ones(
+                (len(self.coefficients), len(chunk)), dtype=np.uint8)
+            for k in range(columns.shape[1]):
+                products &= values[columns[:, k]]
+            energies[start:start + chunk_size] = self.coefficients @ products
+        return energies
+
+    def get_variables(self) -> set[str]:
+        """Method for extracting variables used in the polynomial.
+
+        Returns
+        -------
+        set[str]
+            Set of variables used in the polynomial.
+        """
+        used = np.unique(self.indices[self.indices >= 0])
+        return set(self.variables[i] for i in used.tolist())
+
+    def prune(self, abs_tol: float = 0, rel_tol: float = 0
+              ) -> tuple['CompiledPolynomial', float]:
+        """Method for removing terms with negligible coefficients.
+        See :py:meth:`Polynomial.prune`."""
+        magnitudes = np.abs(self.coefficients)
+        constant = self.degrees == 0
+        tolerance = max(
+            abs_tol, rel_tol * magnitudes[~constant].max(initial=0))
+        removed = (magnitudes <= tolerance) & ~constant
+        return CompiledPolynomial(
+            self.variables, self.indices[~removed],
+            self.coefficients[~removed], self.binary
+        ), float(magnitudes[removed].sum())
+
+    def quantize(self, levels: int) -> tuple['CompiledPolynomial', float]:
+        """Method for rounding the coefficients to the uniform grid.
+        See :py:meth:`Polynomial.quantize`."""
+        if levels < 1:
+            raise ValueError(f"Number of levels must be positive, got {levels}")
+        constant = self.degrees == 0
+        step = np.abs(self.coefficients[~constant]).max(initial=0) / levels
+        if step == 0:
+            return self, 0.
+        rounded = np.where(
+            constant, self.coefficients,
+            np.round(self.coefficients / step) * step)
+        kept = rounded != 0
+        return CompiledPolynomial(
+            self.variables, self.indices[kept], rounded[kept], self.binary
+        ), float(np.abs(self.coefficients - rounded).sum())
+
+    def substitute(self, assignment: Mapping[str, float]
+                   ) -> 'CompiledPolynomial':
+        """Method for fixing the values of the variables.
+
+        Fixed variables are removed from the terms and their values are
+        multiplied into the coefficients, then the terms which became
+        the same are merged (e.g. the constants are folded). Variables
+        missing in the polynomial are ignored.
+
+        Parameters
+        ----------
+        assignment : Mapping[str, float]
+            values of the fixed variables, e.g. {'x0': 1, 'x3': 0}
+
+        Returns
+        -------
+        CompiledPolynomial
+            Polynomial of the remaining variables, with the same
+            variable table.
+        """
+        # the last element corresponds to the padding (-1)
+        values = np.ones(len(self.variables) + 1)
+        fixed = np.zeros(len(self.variables) + 1, dtype=bool)
+        for i, variable in enumerate(self.variables):
+            if variable in assignment:
+                values[i] = assignment[variable]
+                fixed[i] = True
+        if not fixed.any():
+            return self
+
+        fixed_terms = fixed[self.indices]
+        return CompiledPolynomial(
+            self.variables,
+            np.where(fixed_terms, -1, self.indices),
+            self.coefficients * values[self.indices].prod(axis=1),
+            self.binary
+        ).merge_duplicates()
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Method for saving the polynomial in the binary format.
+
+        Polynomial is saved as an uncompressed npz archive with the
+        columnar layout used by the compiled polynomial: the variable
+        table, padded variable ids of the terms and the coefficients.
+        Thanks to that it can be loaded with :py:meth:`load` without
+        copying and parsing the terms.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            path of the file
+        """
+        with open(path, 'wb') as file:
+            np.savez(
+                file,
+                variables=np.array(self.variables, dtype=str),
+                indices=self.indices,
+                coefficients=self.coefficients,
+                binary=np.array(self.binary),
+            )
+
+    @staticmethod
+    def load(path: str | os.PathLike, mmap: bool = True
+             ) -> 'CompiledPolynomial':
+        """Method for loading the polynomial saved with :py:meth:`save`.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            path of the file
+        mmap : bool, default True
+            If True, the terms are memory-mapped (read-only) instead of
+            being read into the memory, so many processes can share one
+            large polynomial through the page cache.
+
+        Returns
+        -------
+        CompiledPolynomial
+            Loaded polynomial.
+        """
+        if mmap:
+            arrays = _memmap_npz(path)
+        else:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+        return CompiledPolynomial(
+            tuple(arrays['variables'].tolist()),
+            arrays['indices'],
+            arrays['coefficients'],
+            bool(arrays['binary']),
+        )
+
+    def fingerprint(self, decimals: int = 10) -> str:
+        """Method for calculating the structural hash of the polynomial.
+        Equal to the :py:meth:`Polynomial.fingerprint` of the same terms."""
+        return _fingerprint(self.terms.items(), decimals)
+
+
+class PolynomialBuilder:
+    """
+    Class for building large polynomials term by term.
+
+    Adding terms one by one to the :py:class:`Polynomial` creates a new
+    polynomial each time. The builder only collects pairs of term and
+    coefficient and normalizes them once, when :py:meth:`build` is called.
+
+    Example:
+
+    .. code-block:: python
+
+        builder = PolynomialBuilder()
+        for i, weight in enumerate(weights):
+            builder.add_term((f"x{i}",), weight)
+        builder.add_constant(-capacity)
+        polynomial = builder.build()
+    """
+
+    def __init__(self) -> None:
+        self._terms: list[tuple[str, ...]] = []
+        self._coefficients: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add_term(self, term: tuple[str, ...], coefficient: float
+                 ) -> 'PolynomialBuilder':
+        """Adds a single term with its coefficient."""
+        self._terms.append(term)
+        self._coefficients.append(coefficient)
+        return self
+
+    def add_terms(self, terms: Iterable[tuple[tuple[str, ...], float]]
+                  ) -> 'PolynomialBuilder':
+        """Adds pairs of term and coefficient."""
+        for term, coefficient in terms:
+            self._terms.append(term)
+            self._coefficients.append(coefficient)
+        return self
+
+    def add_constant(self, constant: float) -> 'PolynomialBuilder':
+        """Adds a constant term."""
+        return self.add_term(tuple(), constant)
+
+    def add_polynomial(self, polynomial: 'Polynomial | CompiledPolynomial',
+                       scale: float = 1) -> 'PolynomialBuilder':
+        """Adds all terms of the polynomial multiplied by scale."""
+        for term, coefficient in polynomial.terms.items():
+            self._terms.append(term)
+            self._coefficients.append(scale * coefficient)
+        return self
+
+    def build(self, canonical: bool = False) -> Polynomial:
+        """Creates polynomial from the collected terms.
+
+        Parameters
+        ----------
+        canonical : bool, default False
+            If True, the terms are assumed to have sorted variables
+            and sorting is skipped.
+
+        Returns
+        -------
+        Polynomial
+            Polynomial with merged duplicated terms.
+        """
+        terms: defaultdict[tuple[str, ...], float] = defaultdict(float)
+        if canonical:
+            for term, coefficient in zip(self._terms, self._coefficients):
+                terms[term] += coefficient
+        else:
+            for term, coefficient in zip(self._terms, self._coefficients):
+                terms[tuple(sorted(term))] += coefficient
+
+        return Polynomial.from_canonical(
+            {term: coefficient for term, coefficient in terms.items()
+             if coefficient != 0})
+
 
-PolynomialType = Polynomial | float | int | dict[tuple[str, ...], float]
+PolynomialType = (Polynomial | CompiledPolynomial | float | int
+                  | dict[tuple[str, ...], float])
@@ -0,0 +1,127 @@
+# This work was supported by the EuroHPC PL infrastructure funded at the
+# Smart Growth Operational Programme (2014-2020), Measure 4.2
+# under the grant agreement no. POIR.04.02.00-00-D014/20-00
+
+
+"""Module for shrinking the QUBO before solving.
+
+Values of some variables can be proven optimal without solving the
+problem. This module implements the first-order persistency check:
+variable x_i can be fixed to 0 if switching it on never decreases
+the energy, whatever the values of the other variables are, i.e. its
+linear coefficient plus all negative coefficients of the higher-order
+terms containing it is non-negative (and symmetrically for 1). Fixing
+variables can make other variables persistent, so the check is repeated
+until nothing changes.
+
+The result is a :py:class:`~QHyper.problems.base.ReducedProblem`, which
+can be passed to any solver instead of the original problem:
+
+.. code-block:: python
+
+    reduced = preprocess(problem, penalty_weights=[1, 2, 2])
+    result = QAOA(reduced, ...).solve()
+    solutions = reduced.lift(result.probabilities)
+
+.. rubric:: Functions
+
+.. autofunction:: find_persistencies
+.. autofunction:: preprocess
+
+"""
+
+import numpy as np
+
+from QHyper.converter import Converter
+from QHyper.polynomial import Polynomial, CompiledPolynomial
+from QHyper.problems.base import Problem, ReducedProblem
+
+
+def find_persistencies(polynomial: Polynomial | CompiledPolynomial
+                       ) -> dict[str, int]:
+    """Finds variables of the binary polynomial with provably optimal
+    values.
+
+    Fixing all returned variables preserves at least one minimum of the
+    polynomial. Terms of any degree are supported.
+
+    Parameters
+    ----------
+    polynomial : Polynomial | CompiledPolynomial
+        Minimized polynomial, variables are treated as binary.
+
+    Returns
+    -------
+    dict[str, int]
+        Fixed variables and their values.
+    """
+    if isinstance(polynomial, Polynomial):
+        polynomial = polynomial.compile()
+    polynomial = polynomial.as_binary()
+    size = len(polynomial.variables)
+    assignment: dict[str, int] = {}
+
+    while True:
+        indices = polynomial.indices
+        used = indices >= 0
+        ids = indices[used]
+        terms = np.broadcast_to(
+            np.arange(len(indices))[:, None], indices.shape)[used]
+        weights = polynomial.coefficients[terms]
+        linear = polynomial.degrees[terms] == 1
+
+        # bounds of the change of the energy after switching the variable
+        # on, over all values of the other variables
+        base = np.bincount(
+            ids, weights=np.where(linear, weights, 0), minlength=size)
+        lower = base + np.bincount(
+            ids, weights=np.where(linear, 0, np.minimum(weights, 0)),
+            minlength=size)
+        upper = base + np.bincount(
+            ids, weights=np.where(linear, 0, np.maximum(weights, 0)),
+            minlength=size)
+        present = np.bincount(ids, minlength=size) > 0
+
+        zeros = present & (lower >= 0)
+        ones = present & (upper <= 0) & ~zeros
+        if not zeros.any() and not ones.any():
+            return assignment
+
+        fixed = {polynomial.variables[i]: 0 for i in np.flatnonzero(zeros)}
+        fixed.update(
+            {polynomial.variables[i]: 1 for i in np.flatnonzero(ones)})
+        assignment.update(fixed)
+        polynomial = polynomial.substitute(fixed)
+
+
+def preprocess(problem: Problem, penalty_weights: list[float] | None = None
+               ) -> ReducedProblem:
+    """Converts the problem to QUBO and fixes its persistent variables.
+
+    Parameters
+    ----------
+    problem : Problem
+        Problem to be reduced.
+    penalty_weights : list[float], optional
+        Penalty weights used for creating the QUBO, by default all are 1.
+        The reduced problem has only the objective function (the QUBO),
+        so the solver should use the default weights.
+
+    Returns
+    -------
+    ReducedProblem
+        Problem with the reduced QUBO as the objective function, which
+        lifts the solutions to the original problem.
+    """
+    if penalty_weights is None:
+        penalty_weights = [1.] * (len(problem.constraints) + 1)
+    qubo = Converter.create_qubo(problem, penalty_weights)
+    assignment = find_persistencies(qubo)
+
+    return ReducedProblem(
+        problem,
+        qubo.substitute(assignment),
+        [],
+        {variable: Polynomial(float(value))
+         for variable, value in assignment.items()},
+    )
@@ -3,10 +3,13 @@
 # under the grant agreement no. POIR.04.02.00-00-D014/20-00
 
 
+import hashlib
 from abc import ABC
 import numpy as np
 
-from QHyper.constraint import Constraint, Polynomial
+from QHyper.constraint import Constraint, Operator, Polynomial
+from QHyper.polynomial import CompiledPolynomial
+from QHyper.variables import VariableRegistry
 
 
 class ProblemException(Exception):
@@ -29,17 +32,57 @@ class Problem(ABC):
 
     Attributes
     ----------
-    objective_function: Polynomial
+    objective_function: Polynomial | CompiledPolynomial
         Objective_function represented as a 
-        :py:class:`~QHyper.polynomial.Polynomial`
+        :py:class:`~QHyper.polynomial.Polynomial` or its compiled form
+        :py:class:`~QHyper.polynomial.CompiledPolynomial`
     constraints : list[Polynomial], optional
         List of constraints represented as a 
         :py:class:`~QHyper.polynomial.Polynomial`
     """
 
-    objective_function: Polynomial
+    objective_function: Polynomial | CompiledPolynomial
     constraints: list[Constraint] = []
 
+    @property
+    def variable_registry(self) -> VariableRegistry:
+        """Registry of the variables of the problem.
+
+        Created lazily from the variables of the objective function and
+        the constraints (sorted by :py:func:`~QHyper.variables.natural_key`)
+        and shared by the converter and the solvers, so all of them use
+        the same order of the variables.
+        """
+        registry = self.__dict__.get('_variable_registry')
+        if registry is None:
+            variables = set(self.objective_function.get_variables())
+            for constraint in self.constraints:
+                variables |= constraint.get_variables()
+            registry = VariableRegistry.from_variables(
+                str(variable) for variable in variables)
+            self._variable_registry = registry
+        return registry
+
+    def fingerprint(self) -> str:
+        """Returns the structural hash of the problem.
+
+        Combines :py:meth:`~QHyper.polynomial.Polynomial.fingerprint` of
+        the objective function and fingerprints of the constraints
+        (in their order, as the order determines the penalty weights).
+        Problems with the same fingerprint have the same QUBO for the
+        same penalty weights, so it can be used as a cache key.
+
+        Returns
+        -------
+        str
+            128-bit hash as a hexadecimal string.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.objective_function.fingerprint().encode())
+        for constraint in self.constraints:
+            digest.update(constraint.fingerprint().encode())
+        return digest.hexdigest()
+
     def get_score(self, result: np.record, penalty: float = 0) -> float:
         """Returns score of the outcome provided as a binary string
 
@@ -67,5 +110,151 @@ class Problem(ABC):
         """
         raise NotImplementedError("Unimplemented")
 
+    def fix_variables(self, assignment: dict[str, int]) -> 'ReducedProblem':
+        """Returns the problem with some of the variables fixed.
+
+        Fixed variables are substituted in the objective function and the
+        constraints (see :py:meth:`~QHyper.polynomial.Polynomial.substitute`).
+        Constraints which don't depend on any variable anymore are dropped
+        if they are satisfied.
+
+        Parameters
+        ----------
+        assignment : dict[str, int]
+            Values of the fixed variables, e.g. {'x0': 1, 'x3': 0}.
+
+        Returns
+        -------
+        ReducedProblem
+            Problem of the remaining variables, which can lift its
+            solutions back to the variables of this problem.
+
+        Raises
+        ------
+        ProblemException
+            If the assignment violates one of the constraints.
+        ValueError
+            If the assignment contains variables unknown to the problem.
+        """
+        unknown = assignment.keys() - set(self.variable_registry)
+        if unknown:
+            raise ValueError(f"Unknown variables: {sorted(unknown)}")
+
+        constraints = []
+        for constraint in self.constraints:
+            lhs = constraint.lhs.substitute(assignment)
+            rhs = constraint.rhs.substitute(assignment)
+            if lhs.get_variables() or rhs.get_variables():
+                constraints.append(Constraint(
+                    lhs, rhs, constraint.operator,
+                    constraint.method_for_inequalities, constraint.label,
+                    constraint.group))
+                continue
+
+            lhs_value = lhs.separate_const()[1]
+            rhs_value = rhs.separate_const()[1]
+            if not {
+                Operator.EQ: lhs_value == rhs_value,
+                Operator.LE: lhs_value <= rhs_value,
+                Operator.GE: lhs_value >= rhs_value,
+            }[constraint.operator]:
+                raise ProblemException(
+                    f"Assignment violates the constraint {constraint}")
+
+        return ReducedProblem(
+            self,
+            self.objective_function.substitute(assignment),
+            constraints,
+            {variable: Polynomial(float(value))
+             for variable, value in assignment.items()},
+        )
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}"
+
+
+class ReducedProblem(Problem):
+    """Problem obtained from another problem by eliminating some variables.
+
+    Eliminated variables are expressed as polynomials of the remaining
+    variables (constants for the fixed variables), which allows lifting
+    solutions of the reduced problem back to the original problem.
+
+    Attributes
+    ----------
+    original : Problem
+        Problem before the reduction.
+    objective_function : Polynomial | CompiledPolynomial
+        Objective function of the remaining variables.
+    constraints : list[Constraint]
+        Constraints of the remaining variables.
+    substitutions : dict[str, Polynomial]
+        Eliminated variables and their values expressed as polynomials of
+        the remaining variables. Variables which are not part of the
+        original problem (e.g. slack variables) are not lifted.
+    """
+
+    def __init__(
+        self,
+        original: Problem,
+        objective_function: Polynomial | CompiledPolynomial,
+        constraints: list[Constraint],
+        substitutions: dict[str, Polynomial],
+    ) -> None:
+        self.original = original
+        self.objective_function = objective_function
+        self.constraints = constraints
+        self.substitutions = substitutions
+        self._variable_registry = VariableRegistry(
+            variable for variable in original.variable_registry
+            if variable not in substitutions)
+
+    def lift(self, solution: np.recarray) -> np.recarray:
+        """Lifts solutions of the reduced problem to the original problem.
+
+        Parameters
+        ----------
+        solution : np.recarray
+            Solutions of the reduced problem, e.g.
+            :py:attr:`~QHyper.solvers.base.SolverResult.probabilities`.
+
+        Returns
+        -------
+        np.recarray
+            Solutions with values of the eliminated variables. Variables
+            of the original problem come first in the order of its
+            registry, followed by the remaining fields of the solution
+            (e.g. probability).
+        """
+        names = solution.dtype.names
+        # variables missing in the solution (e.g. not present in the QUBO
+        # sent to the sampler) don't affect it, they are set to 0
+        columns = list(self._variable_registry)
+        bits = np.zeros((len(solution), len(columns)), dtype=np.uint8)
+        for i, name in enumerate(columns):
+            if name in names:
+                bits[:, i] = solution[name]
+
+        original_variables = list(self.original.variable_registry)
+        dtype = [(variable, 'i4') for variable in original_variables] + [
+            (name, solution.dtype[name]) for name in names
+            if name not in original_variables and name not in self.substitutions
+        ]
+        lifted = np.zeros(solution.shape, dtype=dtype).view(np.recarray)
+        for name in names:
+            if name not in self.substitutions:
+                lifted[name] = solution[name]
+        for variable, polynomial in self.substitutions.items():
+            if variable in self.original.variable_registry:
+                lifted[variable] = np.rint(
+                    polynomial.evaluate_batch(bits, columns))
+        return lifted
+
+    def get_score(self, result: np.record, penalty: float = 0) -> float:
+        """Returns score of the lifted outcome calculated by the original
+        problem."""
+        lifted = self.lift(np.array([result], dtype=result.dtype))
+        return self.original.get_score(lifted[0], penalty)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.original})"
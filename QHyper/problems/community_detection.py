@@ -8,6 +8,7 @@ from typing import Any, Iterable, Tuple, cast
 
 import networkx as nx
 import numpy as np
+import scipy.sparse
 import sympy
 from QHyper.problems.base import Problem
 from QHyper.constraint import Constraint
@@ -142,29 +143,22 @@ class CommunityDetectionProblem(Problem):
         return sympy.symbols(" ".join([f"x{i}" for i in range(len(self.community))]))
 
     def _set_objective_function(self) -> None:
-        equation: dict[tuple[str, ...], float] = {}
-        for i in range(len(self.B)):
-            for j in range(len(self.B)):
-                x_i, x_j = sympy.symbols(f"x{self.community[i]}"), sympy.symbols(
-                    f"x{self.community[j]}"
-                )
-                if self.one_hot_encoding:
-                    if i >= j:
-                        continue
-                    for case_val in range(self.cases):
-                        s_i = str(self._encode_discrete_to_one_hot(x_i, case_val))
-                        s_j = str(self._encode_discrete_to_one_hot(x_j, case_val))
-                        equation[(s_i, s_j)], equation[(s_j, s_i)] = (
-                            self.B[i, j],
-                            self.B[j, i],
-                        )
-                else:
-                    x_i, x_j = str(x_i), str(x_j)
-                    equation[(x_i, x_j)] = self.B[i, j]
-
-        equation = {key: -1 * val for key, val in equation.items()}
-
-        self.objective_function = Polynomial(equation)
+        discretes = [self.community[i] for i in range(len(self.B))]
+        if self.one_hot_encoding:
+            # each case of the discrete variable is a separate one-hot
+            # variable, only pairs in the same case interact
+            off_diagonal = self.B - np.diag(np.diag(self.B))
+            matrix = scipy.sparse.kron(
+                -off_diagonal, scipy.sparse.identity(self.cases))
+            names = [f"s{discrete * self.cases + case_val}"
+                     for discrete in discretes
+                     for case_val in range(self.cases)]
+        else:
+            matrix = -self.B
+            names = [f"x{discrete}" for discrete in discretes]
+
+        self.objective_function = Polynomial.from_qubo_matrix(
+            matrix, names=names)
 
     def _encode_discrete_to_one_hot(
         self, discrete_variable: sympy.Symbol, case_value: int
@@ -12,7 +12,7 @@ import sympy
 import numpy as np
 from collections import namedtuple
 
-from QHyper.polynomial import Polynomial
+from QHyper.polynomial import PolynomialBuilder
 from QHyper.problems.base import Problem
 from QHyper.constraint import Constraint
 
@@ -130,28 +130,27 @@ class KnapsackProblem(Problem):
         """
         Create the objective function items on defined in SymPy syntax
         """
-        equation = Polynomial(0)
-        for i in range(len(self.knapsack.items)):
-            equation += Polynomial({(f"x{i}", ): self.knapsack.items[i].value})
-        equation = -equation
+        builder = PolynomialBuilder()
+        for i, item in enumerate(self.knapsack.items):
+            builder.add_term((f"x{i}", ), -item.value)
 
-        self.objective_function = equation
+        self.objective_function = builder.build(canonical=True)
 
     def _set_constraints(self) -> None:
         """
         Create constraints defined in SymPy syntax
         """
         self.constraints: list[Constraint] = []
-        equation = Polynomial(1)
+        builder = PolynomialBuilder().add_constant(1)
         for i in range(self.knapsack.max_weight):
-            equation -= Polynomial({(f'x{i+len(self.knapsack)}',): 1})
-        self.constraints.append(Constraint(equation))
-        equation = Polynomial(0)
+            builder.add_term((f'x{i+len(self.knapsack)}',), -1)
+        self.constraints.append(Constraint(builder.build(canonical=True)))
+        builder = PolynomialBuilder()
         for i in range(self.knapsack.max_weight):
-            equation += Polynomial({(f'x{i+len(self.knapsack)}', ): (i+1)})
-        for i in range(len(self.knapsack.items)):
-            equation -= Polynomial({(f"x{i}",): self.knapsack.items[i].weight})
-        self.constraints.append(Constraint(equation))
+            builder.add_term((f'x{i+len(self.knapsack)}', ), (i+1))
+        for i, item in enumerate(self.knapsack.items):
+            builder.add_term((f"x{i}",), -item.weight)
+        self.constraints.append(Constraint(builder.build(canonical=True)))
 
     def get_score(self, result: np.record, penalty: float = 0) -> float:
         """Returns score for the provided numpy recor
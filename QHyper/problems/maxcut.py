@@ -6,7 +6,7 @@
 import numpy as np
 import sympy
 
-from QHyper.polynomial import Polynomial
+from QHyper.polynomial import PolynomialBuilder
 
 from QHyper.problems.base import Problem
 
@@ -42,14 +42,13 @@ class MaxCutProblem(Problem):
         self.constraints = []
 
     def _set_objective_function(self) -> None:
-        equation = Polynomial(0)
+        builder = PolynomialBuilder()
 
         for e in self.edges:
-            
             x_i = f"x{e[0]}"
             x_j = f"x{e[1]}"
-            equation -= Polynomial({(x_i,): 1, (x_j,): 1, (x_i, x_j): -2})
-        self.objective_function = equation
+            builder.add_terms([((x_i,), -1), ((x_j,), -1), ((x_i, x_j), 2)])
+        self.objective_function = builder.build()
 
     def get_score(self, result: np.record, penalty: float = 0) -> float:
         sum = 0
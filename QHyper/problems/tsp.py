@@ -3,16 +3,15 @@
 # under the grant agreement no. POIR.04.02.00-00-D014/20-00
 
 
-import itertools
-
 import sympy
 import numpy as np
+import scipy.sparse
 
 from typing import cast
 from QHyper.constraint import Constraint
 
 from QHyper.parser import from_sympy
-from QHyper.polynomial import Polynomial
+from QHyper.polynomial import Polynomial, PolynomialBuilder
 from QHyper.problems.base import Problem
 
 
@@ -127,35 +126,37 @@ class TravelingSalesmanProblem(Problem):
         return i + t * self.tsp_instance.number_of_cities
 
     def _get_objective_function(self) -> Polynomial:
-        equation = Polynomial(0)
-        for i, j in itertools.permutations(
-            range(0, self.tsp_instance.number_of_cities), 2
-        ):
-            curr = Polynomial(0)
-            for t in range(self.tsp_instance.number_of_cities):
-                inc_t = t + 1
-                if inc_t == self.tsp_instance.number_of_cities:
-                    inc_t = 0
-                curr += Polynomial({(f"x{self._calc_bit(i, t)}",
-                                     f"x{self._calc_bit(j, inc_t)}"): 1})
-            equation += (
-                self.tsp_instance.normalized_distance_matrix[i][j] * curr
-            )
-        return equation
+        number_of_cities = self.tsp_instance.number_of_cities
+        distances = np.array(
+            self.tsp_instance.normalized_distance_matrix, dtype=np.float64)
+        np.fill_diagonal(distances, 0)
+        # bit of the city i at the time t is i + t * number_of_cities,
+        # so the distance between consecutive cities forms the block
+        # (t, t + 1) of the matrix
+        steps = np.arange(number_of_cities)
+        next_step = scipy.sparse.coo_matrix(
+            (np.ones(number_of_cities),
+             (steps, (steps + 1) % number_of_cities)),
+            shape=(number_of_cities, number_of_cities))
+        return Polynomial.from_qubo_matrix(
+            scipy.sparse.kron(next_step, distances),
+            names=[f"x{i}" for i in range(number_of_cities ** 2)])
 
     def _get_constraints(self) -> list[Constraint]:
         constraints: list[Constraint] = []
         for i in range(self.tsp_instance.number_of_cities):
-            equation = Polynomial(1)
+            builder = PolynomialBuilder().add_constant(1)
             for t in range(self.tsp_instance.number_of_cities):
-                equation -= Polynomial({(f"x{self._calc_bit(i, t)}",): 1})
-            constraints.append(Constraint(equation, group=0))
+                builder.add_term((f"x{self._calc_bit(i, t)}",), -1)
+            constraints.append(Constraint(builder.build(canonical=True),
+                                          group=0))
 
         for t in range(self.tsp_instance.number_of_cities):
-            equation = Polynomial(1)
+            builder = PolynomialBuilder().add_constant(1)
             for i in range(self.tsp_instance.number_of_cities):
-                equation -= Polynomial({(f"x{self._calc_bit(i, t)}",): 1})
-            constraints.append(Constraint(equation, group=1))
+                builder.add_term((f"x{self._calc_bit(i, t)}",), -1)
+            constraints.append(Constraint(builder.build(canonical=True),
+                                          group=1))
         return constraints
 
     def _get_distance(self, order_result: np.ndarray) -> float:
@@ -0,0 +1,237 @@
+# This work was supported by the EuroHPC PL infrastructure funded at the
+# Smart Growth Operational Programme (2014-2020), Measure 4.2
+# under the grant agreement no. POIR.04.02.00-00-D014/20-00
+
+
+"""Module for reducing higher-order binary polynomials (HUBO) to QUBO.
+
+Solvers like D-Wave Advantage or Gurobi accept only quadratic models,
+while some problems (e.g. workflow scheduling with binary encoding of the
+machines) produce products of more than two variables. Such products are
+replaced with auxiliary variables, and the returned
+:py:class:`Quadratization` keeps the mapping needed to recover the
+original assignment.
+
+Available reductions:
+
+- Rosenberg substitution - every term is reduced pair by pair, the
+  auxiliary variable y = x_i*x_j is enforced with the penalty
+  M*(x_i*x_j - 2*x_i*y - 2*x_j*y + 3*y). Auxiliaries are reused only
+  for identical pairs.
+- Pairwise substitution - the pair of variables shared by the highest
+  number of terms is substituted first, so one auxiliary reduces many
+  terms at once.
+- Negative-term reduction - term -a*x_1*...*x_k (a > 0) is replaced with
+  a*y*(k - 1 - x_1 - ... - x_k), which needs one auxiliary per term and
+  no penalty.
+
+.. rubric:: Main class
+
+.. autosummary::
+    :toctree: generated
+
+    Quadratization  -- result of the quadratization.
+
+.. rubric:: Enum Classes
+
+.. autoclass:: QuadratizationMethod
+
+.. rubric:: Functions
+
+.. autofunction:: quadratize
+
+"""
+
+import itertools
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+import numpy.lib.recfunctions as rfn
+
+from QHyper.polynomial import Polynomial, CompiledPolynomial
+
+
+class QuadratizationMethod(Enum):
+    """Enum class with methods of substituting the positive terms.
+
+    .. list-table::
+
+        * - ROSENBERG
+          - PAIRWISE
+        * - terms are reduced one by one
+          - the most common pairs of variables are substituted first
+    """
+    ROSENBERG = 0
+    PAIRWISE = 1
+
+
+ROSENBERG = QuadratizationMethod.ROSENBERG
+PAIRWISE = QuadratizationMethod.PAIRWISE
+
+
+@dataclass
+class Quadratization:
+    """
+    Result of the quadratization.
+
+    Attributes
+    ----------
+    qubo : Polynomial
+        Binary polynomial of degree at most 2. For every assignment of the
+        original variables its minimum over the auxiliary variables is
+        equal to the value of the original polynomial.
+    auxiliaries : dict[str, tuple[str, ...]]
+        Auxiliary variables and the products of the original variables
+        they represent in the optimal solution.
+    penalty : float
+        Weight of the penalties enforcing the substitutions.
+    """
+
+    qubo: Polynomial
+    auxiliaries: dict[str, tuple[str, ...]]
+    penalty: float
+
+    def extend(self, assignment: dict[str, int]) -> dict[str, int]:
+        """Returns the assignment extended with the optimal values of the
+        auxiliary variables."""
+        extended = dict(assignment)
+        for auxiliary, product in self.auxiliaries.items():
+            extended[auxiliary] = int(all(assignment[v] for v in product))
+        return extended
+
+    def recover(self, solution: np.recarray | dict[str, int]
+                ) -> np.recarray | dict[str, int]:
+        """Returns the solution without the auxiliary variables.
+
+        Parameters
+        ----------
+        solution : np.recarray | dict[str, int]
+            Solution of the QUBO, either the recarray returned by the
+            solver or the single assignment.
+
+        Returns
+        -------
+        np.recarray | dict[str, int]
+            Solution containing only the original variables.
+        """
+        if isinstance(solution, dict):
+            return {variable: value for variable, value in solution.items()
+                    if variable not in self.auxiliaries}
+        auxiliaries = [name for name in solution.dtype.names
+                       if name in self.auxiliaries]
+        return rfn.drop_fields(
+            solution, auxiliaries, usemask=False, asrecarray=True)
+
+
+def quadratize(
+    polynomial: Polynomial | CompiledPolynomial,
+    method: QuadratizationMethod = PAIRWISE,
+    reduce_negative_terms: bool = True,
+    penalty: float | None = None,
+    prefix: str = "aux",
+) -> Quadratization:
+    """Reduces the binary polynomial to the polynomial of degree 2.
+
+    Variables are treated as binary, so the repeated variables in terms
+    are reduced first (x*x = x).
+
+    Parameters
+    ----------
+    polynomial : Polynomial | CompiledPolynomial
+        Polynomial to be reduced.
+    method : QuadratizationMethod, default PAIRWISE
+        Method of substituting the terms of degree above 2.
+    reduce_negative_terms : bool, default True
+        If True, terms with negative coefficients are reduced with
+        the negative-term reduction instead of the substitution.
+    penalty : float, optional
+        Weight of the substitution penalties. By default it is 1 + sum of
+        the absolute coefficients of the substituted terms, which
+        guarantees that the substitutions hold in the minimum.
+    prefix : str, default "aux"
+        Prefix of the names of the auxiliary variables.
+
+    Returns
+    -------
+    Quadratization
+        QUBO with the mapping of the auxiliary variables.
+    """
+    if isinstance(polynomial, CompiledPolynomial):
+        polynomial = polynomial.to_polynomial()
+    polynomial = polynomial.as_binary()
+
+    quadratic: defaultdict[tuple[str, ...], float] = defaultdict(float)
+    high_order: dict[tuple[str, ...], float] = {}
+    for term, coefficient in polynomial.terms.items():
+        if len(term) > 2:
+            high_order[term] = coefficient
+        else:
+            quadratic[term] += coefficient
+
+    used_names = polynomial.get_variables()
+    auxiliaries: dict[str, tuple[str, ...]] = {}
+    counter = itertools.count()
+
+    def new_auxiliary(product: tuple[str, ...]) -> str:
+        name = f"{prefix}{next(counter)}"
+        while name in used_names:
+            name = f"{prefix}{next(counter)}"
+        auxiliaries[name] = product
+        return name
+
+    if reduce_negative_terms:
+        for term, coefficient in list(high_order.items()):
+            if coefficient >= 0:
+                continue
+            del high_order[term]
+            auxiliary = new_auxiliary(term)
+            quadratic[(auxiliary,)] -= coefficient * (len(term) - 1)
+            for variable in term:
+                quadratic[(variable, auxiliary)] += coefficient
+
+    if penalty is None:
+        penalty = 1 + sum(abs(c) for c in high_order.values())
+
+    def substitute(first: str, second: str) -> str:
+        product = tuple(sorted(
+            set(auxiliaries.get(first, (first,)))
+            | set(auxiliaries.get(second, (second,)))))
+        auxiliary = new_auxiliary(product)
+        quadratic[(first, second)] += penalty
+        quadratic[(first, auxiliary)] -= 2 * penalty
+        quadratic[(second, auxiliary)] -= 2 * penalty
+        quadratic[(auxiliary,)] += 3 * penalty
+        return auxiliary
+
+    if method == ROSENBERG:
+        pairs: dict[tuple[str, ...], str] = {}
+        for term, coefficient in high_order.items():
+            variables = list(term)
+            while len(variables) > 2:
+                pair = (variables[0], variables[1])
+                if pair not in pairs:
+                    pairs[pair] = substitute(*pair)
+                variables = sorted([pairs[pair]] + variables[2:])
+            quadratic[tuple(variables)] += coefficient
+    else:
+        terms = {frozenset(term): c for term, c in high_order.items()}
+        while terms:
+            counts = Counter(
+                pair for term in terms
+                for pair in itertools.combinations(sorted(term), 2))
+            pair = max(counts, key=counts.__getitem__)
+            auxiliary = substitute(*pair)
+            reduced: dict[frozenset[str], float] = {}
+            for term, coefficient in terms.items():
+                if pair[0] in term and pair[1] in term:
+                    term = (term - set(pair)) | {auxiliary}
+                if len(term) > 2:
+                    reduced[term] = reduced.get(term, 0) + coefficient
+                else:
+                    quadratic[tuple(term)] += coefficient
+            terms = reduced
+
+    return Quadratization(
+        Polynomial(quadratic, binary=True), auxiliaries, penalty)
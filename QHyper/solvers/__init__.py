@@ -57,6 +57,17 @@ also available in this function.
     gate_based.pennylane.h_qaoa.H_QAOA -- Hyper QAOA solver.
 
 
+.. rubric:: Decomposition
+
+Solver splitting the QUBO into independent parts, which are solved
+separately with another solver.
+
+.. autosummary::
+    :toctree: generated/
+
+    decomposition.DecompositionSolver -- Decomposition solver.
+
+
 .. rubric:: Hyper-optimizer
 
 Not really a solver, but a class that can be used to optimize the hyperparameters
@@ -144,6 +155,9 @@ class Solvers:
         elif name_ in ["advantage"]:
             from .quantum_annealing.dwave.advantage import Advantage
             return Advantage
+        elif name_ in ["decomposition"]:
+            from .decomposition import DecompositionSolver
+            return DecompositionSolver
         else:
             raise SolverConfigException(f"Solver {name} not found")
 
@@ -11,11 +11,14 @@ import numpy as np
 import gurobipy as gp
 from QHyper.problems.base import Problem
 from QHyper.solvers.base import Solver, SolverResult
-from QHyper.polynomial import Polynomial
+from QHyper.polynomial import Polynomial, CompiledPolynomial
 from QHyper.constraint import Operator
+from QHyper.quadratize import quadratize
 
 
-def polynomial_to_gurobi(gurobi_vars: dict[str, Any], poly: Polynomial) -> Any:
+def polynomial_to_gurobi(
+    gurobi_vars: dict[str, Any], poly: Polynomial | CompiledPolynomial
+) -> Any:
     cost_function_1: float = 0
     for vars, coeff in poly.terms.items():
         tmp = 1
@@ -26,10 +29,13 @@ def polynomial_to_gurobi(gurobi_vars: dict[str, Any], poly: Polynomial) -> Any:
 
 
 @dataclass
-class Gurobi(Solver):  # todo works only for quadratic expressions
+class Gurobi(Solver):  # todo works only for quadratic constraints
     """
     Gurobi solver class.
 
+    Objective functions of degree above 2 are reduced with
+    :py:func:`~QHyper.quadratize.quadratize`.
+
     Attributes
     ----------
     problem : Problem
@@ -65,18 +71,22 @@ class Gurobi(Solver):  # todo works only for quadratic expressions
 
         gpm.setParam('Threads', self.threads)
 
-        all_vars = self.problem.objective_function.get_variables()
-        for con in self.problem.constraints:
-            all_vars |= con.get_variables()
-
         vars = {
-            str(var_name): gpm.addVar(vtype=gp.GRB.BINARY, name=str(var_name))
-            for var_name in all_vars
+            var_name: gpm.addVar(vtype=gp.GRB.BINARY, name=var_name)
+            for var_name in self.problem.variable_registry
         }
 
-        objective_function = polynomial_to_gurobi(
-            vars, self.problem.objective_function
-        )
+        objective = self.problem.objective_function
+        objective_vars = vars
+        if objective.degree() > 2:
+            quadratization = quadratize(objective)
+            objective = quadratization.qubo
+            objective_vars = vars | {
+                name: gpm.addVar(vtype=gp.GRB.BINARY, name=name)
+                for name in quadratization.auxiliaries
+            }
+
+        objective_function = polynomial_to_gurobi(objective_vars, objective)
         gpm.setObjective(objective_function, gp.GRB.MINIMIZE)
 
         for i, constraint in enumerate(self.problem.constraints):
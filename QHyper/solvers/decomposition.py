@@ -0,0 +1,238 @@
+# This work was supported by the EuroHPC PL infrastructure funded at the
+# Smart Growth Operational Programme (2014-2020), Measure 4.2
+# under the grant agreement no. POIR.04.02.00-00-D014/20-00
+
+
+import heapq
+import math
+import multiprocessing as mp
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import scipy.sparse
+from scipy.sparse.csgraph import connected_components
+
+from QHyper.converter import Converter
+from QHyper.polynomial import Polynomial, CompiledPolynomial
+from QHyper.problems.base import Problem
+from QHyper.solvers.base import Solver, SolverResult
+from QHyper.variables import VariableRegistry
+
+
+class ComponentProblem(Problem):
+    """Part of the QUBO with variables not interacting with the rest.
+
+    Score of the outcome is the value of the QUBO of the component,
+    so the scores of the components sum up to the value of the whole QUBO.
+
+    Attributes
+    ----------
+    objective_function : Polynomial
+        QUBO of the component.
+    constraints : list[Constraint]
+        Always empty, the constraints are already included in the QUBO.
+    """
+
+    def __init__(self, objective_function: Polynomial,
+                 variable_registry: VariableRegistry) -> None:
+        self.objective_function = objective_function
+        self.constraints = []
+        self._variable_registry = variable_registry
+
+    def get_score(self, result: np.record, penalty: float = 0) -> float:
+        variables = list(self._variable_registry)
+        bits = np.array([[result[variable] for variable in variables]])
+        return float(
+            self.objective_function.evaluate_batch(bits, variables)[0])
+
+
+def split_components(polynomial: Polynomial | CompiledPolynomial
+                     ) -> tuple[list[CompiledPolynomial], float]:
+    """Splits the polynomial into parts with disjoint variables.
+
+    Two variables are connected if they appear in the same term,
+    parts are the connected components of this graph.
+
+    Parameters
+    ----------
+    polynomial : Polynomial | CompiledPolynomial
+        Polynomial to be split.
+
+    Returns
+    -------
+    tuple[list[CompiledPolynomial], float]
+        Polynomials of the components (without the constant term)
+        and the constant term.
+    """
+    if isinstance(polynomial, Polynomial):
+        polynomial = polynomial.compile()
+    polynomial, constant = polynomial.separate_const()
+    indices = polynomial.indices
+    size = len(polynomial.variables)
+
+    # every variable of the term is connected with its first variable
+    used = indices >= 0
+    first = np.broadcast_to(indices[:, :1], indices.shape)[used]
+    graph = scipy.sparse.coo_matrix(
+        (np.ones(len(first)), (first, indices[used])), shape=(size, size))
+    _, labels = connected_components(graph, directed=False)
+
+    term_labels = labels[indices[:, 0]] if len(indices) else labels[:0]
+    components = []
+    for label in np.unique(term_labels):
+        in_component = term_labels == label
+        components.append(CompiledPolynomial(
+            polynomial.variables, indices[in_component],
+            polynomial.coefficients[in_component], polynomial.binary))
+    return components, constant
+
+
+def _solve_component(arguments: tuple[type[Solver], Problem, dict[str, Any]]
+                     ) -> SolverResult:
+    solver_class, problem, solver_args = arguments
+    return solver_class(problem, **solver_args).solve()
+
+
+@dataclass
+class DecompositionSolver(Solver):
+    """
+    Solver splitting the QUBO into independent parts.
+
+    Problem is converted to QUBO, which is split into the connected
+    components of its interaction graph (see :py:func:`split_components`).
+    Every component is solved separately with the provided solver, in
+    parallel when more processes are available. Then the results are
+    combined into one distribution, where the probability of the solution
+    is the product of the probabilities of its parts. Two components with
+    15 variables are much cheaper to simulate than one with 30 variables.
+
+    Attributes
+    ----------
+    problem : Problem
+        The problem to be solved.
+    solver_class : type[Solver] | str
+        Solver used for the components, or its name
+        (see :py:meth:`~QHyper.solvers.Solvers.get`).
+    solver_args : dict[str, Any], default {}
+        Arguments of the solver (except the problem). Penalty weights
+        shouldn't be provided, the components are already QUBOs.
+    penalty_weights : list[float] | None
+        Penalty weights used for converting Problem to QUBO. If not
+        specified, all penalty weights are set to 1.
+    processes : int, default 1
+        Number of processes solving the components.
+    limit_results : int | None, default 1000
+        Number of the most probable combined results. They are found
+        best-first from the sorted results of the components, without
+        building the whole product of the distributions. If None, the
+        whole product is returned, which grows exponentially with the
+        number of components.
+    """
+
+    problem: Problem
+    solver_class: type[Solver] | str
+    solver_args: dict[str, Any] = field(default_factory=dict)
+    penalty_weights: list[float] | None = None
+    processes: int = 1
+    limit_results: int | None = 1000
+
+    def __post_init__(self) -> None:
+        if isinstance(self.solver_class, str):
+            from QHyper.solvers import Solvers
+            self.solver_class = Solvers.get(self.solver_class)
+
+    def get_components(self, penalty_weights: list[float]
+                       ) -> list[ComponentProblem]:
+        """Returns problems of the independent parts of the QUBO."""
+        qubo = Converter.create_qubo(self.problem, penalty_weights)
+        components, _ = split_components(qubo)
+        registry = self.problem.variable_registry.copy()
+        return [
+            ComponentProblem(
+                component.to_polynomial(),
+                VariableRegistry(registry.sort(component.get_variables())))
+            for component in components
+        ]
+
+    @staticmethod
+    def _most_probable(probabilities: list[np.ndarray], limit: int
+                       ) -> list[np.ndarray]:
+        """Returns the rows of the most probable combinations of the
+        results (sorted by the decreasing probability) of the components.
+        """
+        def priority(row: tuple[int, ...]) -> float:
+            return -math.prod(
+                float(p[i]) for p, i in zip(probabilities, row))
+
+        # every combination is reached from (0, ..., 0) by increasing
+        # the positions in order, so it is pushed to the heap only once
+        start = (0,) * len(probabilities)
+        heap = [(priority(start), start, 0)]
+        rows: list[tuple[int, ...]] = []
+        while heap and len(rows) < limit:
+            _, row, first = heapq.heappop(heap)
+            rows.append(row)
+            for i in range(first, len(probabilities)):
+                if row[i] + 1 < len(probabilities[i]):
+                    successor = row[:i] + (row[i] + 1,) + row[i + 1:]
+                    heapq.heappush(heap, (priority(successor), successor, i))
+        return [np.array(column, dtype=np.int64) for column in zip(*rows)]
+
+    def _combine(self, components: list[ComponentProblem],
+                 results: list[SolverResult]) -> np.recarray:
+        parts = []
+        for result in results:
+            probabilities = result.probabilities
+            order = np.argsort(-probabilities['probability'], kind='stable')
+            parts.append(probabilities[order])
+
+        sizes = [len(part) for part in parts]
+        if self.limit_results is None:
+            size = int(np.prod(sizes))
+            rows = list(np.unravel_index(np.arange(size), sizes)
+                        ) if sizes else []
+        else:
+            rows = self._most_probable(
+                [part['probability'] for part in parts], self.limit_results)
+            size = len(rows[0]) if rows else 1
+
+        # variables missing in the QUBO don't affect it, they are set to 0
+        registry = self.problem.variable_registry.copy()
+        variables = registry.sort(set(registry).union(*(
+            component.variable_registry for component in components)))
+        combined = np.zeros(size, dtype=(
+            [(variable, 'i4') for variable in variables]
+            + [('probability', 'f8')])).view(np.recarray)
+        combined['probability'] = 1
+        for component, part, part_rows in zip(components, parts, rows):
+            combined['probability'] *= part['probability'][part_rows]
+            for variable in component.variable_registry:
+                combined[variable] = part[variable][part_rows]
+        return combined
+
+    def solve(self, penalty_weights: list[float] | None = None
+              ) -> SolverResult:
+        if penalty_weights is None and self.penalty_weights is None:
+            penalty_weights = [1.] * (len(self.problem.constraints) + 1)
+        penalty_weights = (self.penalty_weights if penalty_weights is None
+                           else penalty_weights)
+
+        components = self.get_components(penalty_weights)
+        arguments = [
+            (self.solver_class, component, self.solver_args)
+            for component in components
+        ]
+        if self.processes == 1 or len(arguments) == 1:
+            results = [_solve_component(argument) for argument in arguments]
+        else:
+            with mp.Pool(processes=min(self.processes, len(arguments))
+                         ) as pool:
+                results = pool.map(_solve_component, arguments)
+
+        return SolverResult(
+            self._combine(components, results),
+            {'penalty_weights': penalty_weights,
+             'components': [result.params for result in results]},
+            [],
+        )
@@ -9,8 +9,8 @@ from QHyper.problems.base import Problem
 from QHyper.optimizers import (
         OptimizationResult, Optimizer, Dummy, OptimizationParameter)
 
-from QHyper.converter import Converter
-from QHyper.polynomial import Polynomial
+from QHyper.converter import Converter, ParametricQubo
+from QHyper.polynomial import Polynomial, CompiledPolynomial
 from QHyper.solvers.base import Solver, SolverResult
 
 
@@ -40,10 +40,28 @@ class QAOA(Solver):
         Backend for PennyLane.
     mixer : str
         Mixer name. Currently only 'pl_x_mixer' is supported.
-    qubo_cache : dict[tuple[float, ...], qml.Hamiltonian]
-        Cache for QUBO.
+    prune_abs_tol : float, default 0
+        Terms of the QUBO with absolute coefficients not greater than this
+        value are removed before creating the Hamiltonian.
+    prune_rel_tol : float, default 0
+        Same as prune_abs_tol, but relative to the largest coefficient.
+    quantization_levels : int | None, default None
+        If provided, coefficients of the QUBO are rounded to this number
+        of levels (see :py:meth:`~QHyper.polynomial.Polynomial.quantize`).
+    qubo_cache : dict[tuple[str, tuple[float, ...]], qml.Hamiltonian]
+        Cache for QUBO, keyed by the fingerprint of the problem and
+        the penalty weights.
+    parametric_qubos : dict[str, ParametricQubo]
+        QUBOs of the problems as functions of the penalty weights, keyed
+        by the fingerprint of the problem.
+    problem_fingerprint : tuple[Problem, str] | None
+        The last problem passed to the cost operator and its fingerprint,
+        so the fingerprint is computed once per problem.
     dev : qml.devices.LegacyDevice
         PennyLane device instance.
+    pruning_error : float
+        Bound of the energy error introduced by the pruning and the
+        quantization of the last created Hamiltonian.
     """
 
     problem: Problem
@@ -54,9 +72,17 @@ class QAOA(Solver):
     penalty_weights: list[float] | None = None
     backend: str = "default.qubit"
     mixer: str = "pl_x_mixer"
-    qubo_cache: dict[tuple[float, ...], qml.Hamiltonian] = field(
+    prune_abs_tol: float = 0
+    prune_rel_tol: float = 0
+    quantization_levels: int | None = None
+    qubo_cache: dict[tuple[str, tuple[float, ...]], qml.Hamiltonian] = field(
         default_factory=dict, init=False)
+    parametric_qubos: dict[str, ParametricQubo] = field(
+        default_factory=dict, init=False)
+    problem_fingerprint: tuple[Problem, str] | None = field(
+        default=None, init=False)
     dev: qml.devices.LegacyDevice | None = field(default=None, init=False)
+    pruning_error: float = field(default=0., init=False)
 
     def __init__(
             self,
@@ -67,7 +93,10 @@ class QAOA(Solver):
             penalty_weights: list[float] | None = None,
             optimizer: Optimizer = Dummy(),
             backend: str = "default.qubit",
-            mixer: str = "pl_x_mixer"
+            mixer: str = "pl_x_mixer",
+            prune_abs_tol: float = 0,
+            prune_rel_tol: float = 0,
+            quantization_levels: int | None = None,
     ) -> None:
         self.problem = problem
         self.optimizer = optimizer
@@ -77,7 +106,12 @@ class QAOA(Solver):
         self.layers = layers
         self.backend = backend
         self.mixer = mixer
+        self.prune_abs_tol = prune_abs_tol
+        self.prune_rel_tol = prune_rel_tol
+        self.quantization_levels = quantization_levels
         self.qubo_cache = {}
+        self.parametric_qubos = {}
+        self.problem_fingerprint = None
 
     def _get_num_of_wires(self) -> int:
         if self.dev is None:
@@ -87,36 +121,56 @@ class QAOA(Solver):
     def create_cost_operator(self, problem: Problem,
                              penalty_weights: list[float]
                              ) -> qml.Hamiltonian:
-        if tuple(penalty_weights) not in self.qubo_cache:
-            qubo = Converter.create_qubo(problem, penalty_weights)
-            self.qubo_cache[tuple(
-                penalty_weights)] = self._create_cost_operator(qubo)
-        return self.qubo_cache[tuple(penalty_weights)]
-
-    def _create_cost_operator(self, qubo: Polynomial) -> qml.Hamiltonian:
-        result: qml.Hamiltonian | None = None
-        const = 0
-
-        for variables, coeff in qubo.terms.items():
-            if not variables:
-                const += coeff
-                continue
-
-            summand: qml.Hamiltonian | None = None
-            for var in variables:
-                if summand and str(var) in summand.wires:
-                    continue
-                encoded_var = cast(
-                    qml.Hamiltonian,
-                    0.5 * qml.Identity(str(var)) - 0.5 * qml.PauliZ(str(var))
-                )
-
-                summand = (summand @ encoded_var if summand
-                           else coeff * encoded_var)
-            result = result + summand if result else summand
-
-        assert result is not None
-        return (result + const * qml.Identity(result.wires[0])).simplify()
+        if (self.problem_fingerprint is None
+                or self.problem_fingerprint[0] is not problem):
+            self.problem_fingerprint = (problem, problem.fingerprint())
+        fingerprint = self.problem_fingerprint[1]
+        key = (fingerprint, tuple(penalty_weights))
+        if key not in self.qubo_cache:
+            if fingerprint not in self.parametric_qubos:
+                self.parametric_qubos[fingerprint] = (
+                    Converter.create_parametric_qubo(problem))
+            qubo = self.parametric_qubos[fingerprint](penalty_weights)
+            qubo, self.pruning_error = Converter.prune_qubo(
+                qubo, self.prune_abs_tol, self.prune_rel_tol,
+                self.quantization_levels)
+            self.qubo_cache[key] = self._create_cost_operator(qubo)
+        return self.qubo_cache[key]
+
+    def _create_cost_operator(self, qubo: Polynomial | CompiledPolynomial
+                              ) -> qml.Hamiltonian:
+        # x = (1 - Z) / 2, the spin form is computed with arrays
+        ising = Converter.qubo_to_ising(qubo)
+        wires = [str(variable) for variable in ising.variables]
+        assert wires, "QUBO has no variables"
+
+        coefficients: list[float] = []
+        operators: list[qml.operation.Operator] = []
+        for i, h in enumerate(ising.h.tolist()):
+            if h:
+                coefficients.append(h)
+                operators.append(qml.PauliZ(wires[i]))
+        for i, j, coupling in zip(ising.J.row.tolist(), ising.J.col.tolist(),
+                                  ising.J.data.tolist()):
+            if coupling:
+                coefficients.append(coupling)
+                operators.append(qml.PauliZ(wires[i]) @ qml.PauliZ(wires[j]))
+        for ids, coefficient in ising.higher_order.items():
+            coefficients.append(coefficient)
+            operators.append(qml.prod(*(qml.PauliZ(wires[i]) for i in ids)))
+        # offset is placed on the used wire, so the pruned variables
+        # don't become idle qubits
+        identity_wire = operators[0].wires[0] if operators else wires[0]
+        coefficients.insert(0, ising.offset)
+        operators.insert(0, qml.Identity(identity_wire))
+        return qml.Hamiltonian(coefficients, operators)
+
+    def _create_device(self, problem: Problem,
+                       cost_operator: qml.Hamiltonian
+                       ) -> qml.devices.LegacyDevice:
+        wires = problem.variable_registry.copy().sort(
+            str(wire) for wire in cost_operator.wires)
+        return qml.device(self.backend, wires=wires)
 
     def _hadamard_layer(self, cost_operator: qml.Hamiltonian) -> None:
         for i in cost_operator.wires:
@@ -144,7 +198,7 @@ class QAOA(Solver):
     ) -> Callable[[list[float]], OptimizationResult]:
         cost_operator = self.create_cost_operator(self.problem, penalty_weights)
 
-        self.dev = qml.device(self.backend, wires=cost_operator.wires)
+        self.dev = self._create_device(self.problem, cost_operator)
 
         @qml.qnode(self.dev)
         def expval_circuit(angles: list[float]) -> OptimizationResult:
@@ -175,13 +229,13 @@ class QAOA(Solver):
         """
         cost_operator = self.create_cost_operator(problem, penalty_weights)
 
-        self.dev = qml.device(self.backend, wires=cost_operator.wires)
+        self.dev = self._create_device(problem, cost_operator)
 
         @qml.qnode(self.dev)
         def probability_circuit(angles: list[float]) -> list[float]:
             self._circuit(angles, cost_operator)
             return cast(
-                list[float], qml.probs(wires=cost_operator.wires)
+                list[float], qml.probs(wires=self.dev.wires)
             )
 
         return probability_circuit
@@ -10,6 +10,7 @@ from typing import Any, cast, Callable
 import pennylane as qml
 
 from QHyper.problems.base import Problem
+from QHyper.converter import ParametricQubo
 from QHyper.optimizers.qml_gradient_descent import QmlGradientDescent
 from QHyper.optimizers import (
     OptimizationResult, Optimizer, OptimizationParameter)
@@ -43,10 +44,27 @@ class QML_QAOA(QAOA):
         Backend for PennyLane.
     mixer : str
         Mixer name. Currently only 'pl_x_mixer' is supported.
-    qubo_cache : dict[tuple[float, ...], qml.Hamiltonian]
+    prune_abs_tol : float, default 0
+        Terms of the QUBO with absolute coefficients not greater than this
+        value are removed before creating the Hamiltonian.
+    prune_rel_tol : float, default 0
+        Same as prune_abs_tol, but relative to the largest coefficient.
+    quantization_levels : int | None, default None
+        If provided, coefficients of the QUBO are rounded to this number
+        of levels (see :py:meth:`~QHyper.polynomial.Polynomial.quantize`).
+    qubo_cache : dict[tuple[str, tuple[float, ...]], qml.Hamiltonian]
         Cache for QUBO.
+    parametric_qubos : dict[str, ParametricQubo]
+        QUBOs of the problems as functions of the penalty weights, keyed
+        by the fingerprint of the problem.
+    problem_fingerprint : tuple[Problem, str] | None
+        The last problem passed to the cost operator and its fingerprint,
+        so the fingerprint is computed once per problem.
     dev : qml.devices.LegacyDevice
         PennyLane device instance.
+    pruning_error : float
+        Bound of the energy error introduced by the pruning and the
+        quantization of the last created Hamiltonian.
     """
     problem: Problem
     layers: int
@@ -56,9 +74,17 @@ class QML_QAOA(QAOA):
     penalty_weights: list[float] | None = None
     mixer: str = "pl_x_mixer"
     backend: str = "default.qubit"
-    qubo_cache: dict[tuple[float, ...], qml.Hamiltonian] = field(
+    prune_abs_tol: float = 0
+    prune_rel_tol: float = 0
+    quantization_levels: int | None = None
+    qubo_cache: dict[tuple[str, tuple[float, ...]], qml.Hamiltonian] = field(
         default_factory=dict, init=False)
+    parametric_qubos: dict[str, ParametricQubo] = field(
+        default_factory=dict, init=False)
+    problem_fingerprint: tuple[Problem, str] | None = field(
+        default=None, init=False)
     dev: qml.devices.LegacyDevice | None = field(default=None, init=False)
+    pruning_error: float = field(default=0., init=False)
 
     def __post_init__(self) -> None:
         if not isinstance(self.optimizer, QmlGradientDescent):
@@ -70,7 +96,7 @@ class QML_QAOA(QAOA):
         cost_operator = self.create_cost_operator(
             self.problem, penalty_weights)
 
-        self.dev = qml.device(self.backend, wires=cost_operator.wires)
+        self.dev = self._create_device(self.problem, cost_operator)
 
         @qml.qnode(self.dev)
         def expval_circuit(angles: list[float]) -> Any:
@@ -6,6 +6,7 @@ from typing import Callable
 from dataclasses import dataclass, field
 
 from QHyper.problems.base import Problem
+from QHyper.converter import ParametricQubo
 from QHyper.optimizers import OptimizationResult, Optimizer, Dummy, OptimizationParameter
 
 from QHyper.util import weighted_avg_evaluation
@@ -48,10 +49,27 @@ class WF_QAOA(QAOA):
         Backend for PennyLane.
     mixer : str, default 'pl_x_mixer'
         Mixer name. Currently only 'pl_x_mixer' is supported.
-    qubo_cache : dict[tuple[float, ...], qml.Hamiltonian]
+    prune_abs_tol : float, default 0
+        Terms of the QUBO with absolute coefficients not greater than this
+        value are removed before creating the Hamiltonian.
+    prune_rel_tol : float, default 0
+        Same as prune_abs_tol, but relative to the largest coefficient.
+    quantization_levels : int | None, default None
+        If provided, coefficients of the QUBO are rounded to this number
+        of levels (see :py:meth:`~QHyper.polynomial.Polynomial.quantize`).
+    qubo_cache : dict[tuple[str, tuple[float, ...]], qml.Hamiltonian]
         Cache for QUBO.
+    parametric_qubos : dict[str, ParametricQubo]
+        QUBOs of the problems as functions of the penalty weights, keyed
+        by the fingerprint of the problem.
+    problem_fingerprint : tuple[Problem, str] | None
+        The last problem passed to the cost operator and its fingerprint,
+        so the fingerprint is computed once per problem.
     dev : qml.devices.LegacyDevice
         PennyLane device instance.
+    pruning_error : float
+        Bound of the energy error introduced by the pruning and the
+        quantization of the last created Hamiltonian.
     """
 
     problem: Problem
@@ -64,9 +82,17 @@ class WF_QAOA(QAOA):
     backend: str = "default.qubit"
     mixer: str = "pl_x_mixer"
     limit_results: int | None = None
-    qubo_cache: dict[tuple[float, ...], qml.Hamiltonian] = field(
+    prune_abs_tol: float = 0
+    prune_rel_tol: float = 0
+    quantization_levels: int | None = None
+    qubo_cache: dict[tuple[str, tuple[float, ...]], qml.Hamiltonian] = field(
         default_factory=dict, init=False)
+    parametric_qubos: dict[str, ParametricQubo] = field(
+        default_factory=dict, init=False)
+    problem_fingerprint: tuple[Problem, str] | None = field(
+        default=None, init=False)
     dev: qml.devices.LegacyDevice | None = field(default=None, init=False)
+    pruning_error: float = field(default=0., init=False)
 
     def __init__(
             self,
@@ -80,6 +106,9 @@ class WF_QAOA(QAOA):
             mixer: str = "pl_x_mixer",
             limit_results: int | None = None,
             optimizer: Optimizer = Dummy(),
+            prune_abs_tol: float = 0,
+            prune_rel_tol: float = 0,
+            quantization_levels: int | None = None,
     ) -> None:
         self.problem = problem
         self.optimizer = optimizer
@@ -91,13 +120,18 @@ class WF_QAOA(QAOA):
         self.layers = layers
         self.backend = backend
         self.mixer = mixer
+        self.prune_abs_tol = prune_abs_tol
+        self.prune_rel_tol = prune_rel_tol
+        self.quantization_levels = quantization_levels
         self.qubo_cache = {}
+        self.parametric_qubos = {}
+        self.problem_fingerprint = None
 
     def get_expval_circuit(self, penalty_weights: list[float]
                            ) -> Callable[[list[float]], float]:
         cost_operator = self.create_cost_operator(self.problem, penalty_weights)
 
-        self.dev = qml.device(self.backend, wires=cost_operator.wires)
+        self.dev = self._create_device(self.problem, cost_operator)
 
         probs_func = self.get_probs_func(self.problem, penalty_weights)
 
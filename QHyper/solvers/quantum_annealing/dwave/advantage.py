@@ -2,13 +2,13 @@ import os
 from typing import Any
 import numpy as np
 import numpy.typing as npt
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from collections import defaultdict
 
 from QHyper.problems.base import Problem
 from QHyper.solvers.base import Solver, SolverResult
-from QHyper.converter import Converter
-from QHyper.constraint import Polynomial
+from QHyper.converter import Converter, ParametricQubo
+from QHyper.quadratize import quadratize
 
 from dwave.system import DWaveSampler, EmbeddingComposite
 from dwave.system.composites import FixedEmbeddingComposite
@@ -42,6 +42,17 @@ class Advantage(Solver):
         The initial parameter settings.
     use_clique_embedding: bool, default False
         Find clique for the embedding
+    prune_abs_tol : float, default 0
+        Terms of the QUBO with absolute coefficients not greater than this
+        value are removed before sampling.
+    prune_rel_tol : float, default 0
+        Same as prune_abs_tol, but relative to the largest coefficient.
+    quantization_levels : int | None, default None
+        If provided, coefficients of the QUBO are rounded to this number
+        of levels, which limits the impact of the precision of the device.
+    parametric_qubo : ParametricQubo
+        QUBO of the problem expanded once and created for the penalty
+        weights of every run from the arrays of the coefficients.
     """
 
     problem: Problem
@@ -51,6 +62,10 @@ class Advantage(Solver):
     num_reads: int = 1
     chain_strength: float | None = None
     token: str | None = None
+    prune_abs_tol: float = 0
+    prune_rel_tol: float = 0
+    quantization_levels: int | None = None
+    parametric_qubo: ParametricQubo = field(init=False)
 
     def __init__(self,
                  problem: Problem,
@@ -60,7 +75,10 @@ class Advantage(Solver):
                  num_reads: int = 1,
                  chain_strength: float | None = None,
                  use_clique_embedding: bool = False,
-                 token: str | None = None) -> None:
+                 token: str | None = None,
+                 prune_abs_tol: float = 0,
+                 prune_rel_tol: float = 0,
+                 quantization_levels: int | None = None) -> None:
         self.problem = problem
         self.penalty_weights = penalty_weights
         self.version = version
@@ -72,22 +90,49 @@ class Advantage(Solver):
             solver=self.version, region=self.region,
             token=token or DWAVE_API_TOKEN)
         self.token = token
+        self.prune_abs_tol = prune_abs_tol
+        self.prune_rel_tol = prune_rel_tol
+        self.quantization_levels = quantization_levels
+        self.parametric_qubo = Converter.create_parametric_qubo(problem)
 
         if use_clique_embedding:
-            args = self.weigths if self.weigths else []
-            qubo = Converter.create_qubo(self.problem, args)
-            qubo_terms, offset = convert_qubo_keys(qubo)
-            bqm = BinaryQuadraticModel.from_qubo(qubo_terms, offset=offset)
-
+            bqm, _, _ = self._create_bqm(self._get_penalty_weights(None))
             self.embedding = find_clique_embedding(
                 bqm.to_networkx_graph(),
                 target_graph=self.sampler.to_networkx_graph()
             )
 
+    def _get_penalty_weights(self, penalty_weights: list[float] | None
+                             ) -> list[float]:
+        if penalty_weights is not None:
+            return penalty_weights
+        if self.penalty_weights is not None:
+            return self.penalty_weights
+        return [1.] * (len(self.problem.constraints) + 1)
+
+    def _create_bqm(self, penalty_weights: list[float]
+                    ) -> tuple[BinaryQuadraticModel,
+                               dict[str, tuple[str, ...]], float]:
+        qubo = self.parametric_qubo(penalty_weights)
+        qubo, pruning_error = Converter.prune_qubo(
+            qubo, self.prune_abs_tol, self.prune_rel_tol,
+            self.quantization_levels)
+        auxiliaries: dict[str, tuple[str, ...]] = {}
+        if qubo.degree() > 2:
+            quadratization = quadratize(qubo)
+            qubo, auxiliaries = quadratization.qubo, quadratization.auxiliaries
+        variables = qubo.get_variables()
+        # auxiliary variables are placed at the end, they are not
+        # registered in the problem
+        registry = self.problem.variable_registry.copy()
+        order = (
+            registry.sort(variables - auxiliaries.keys())
+            + [v for v in auxiliaries if v in variables])
+        bqm = Converter.polynomial_to_bqm(qubo, order)
+        return bqm, auxiliaries, pruning_error
+
     def solve(self, penalty_weights: list[float] | None = None) -> Any:
-        if penalty_weights is None and self.penalty_weights is None:
-            penalty_weights = [1.] * (len(self.problem.constraints) + 1)
-        penalty_weights = self.penalty_weights if penalty_weights is None else penalty_weights
+        penalty_weights = self._get_penalty_weights(penalty_weights)
 
         if not self.use_clique_embedding:
             embedding_compose = EmbeddingComposite(self.sampler)
@@ -95,30 +140,34 @@ class Advantage(Solver):
             embedding_compose = FixedEmbeddingComposite(
                 self.sampler, self.embedding)
 
-        qubo = Converter.create_qubo(self.problem, penalty_weights)
-        qubo_terms, offset = convert_qubo_keys(qubo)
-        bqm = BinaryQuadraticModel.from_qubo(qubo_terms, offset=offset)
+        bqm, auxiliaries, pruning_error = self._create_bqm(penalty_weights)
         sampleset = embedding_compose.sample(
             bqm, num_reads=self.num_reads, chain_strength=self.chain_strength
         )
 
+        variables = self.problem.variable_registry.copy().sort(
+            v for v in sampleset.variables if v not in auxiliaries)
         result = np.recarray(
             (len(sampleset),),
-            dtype=([(v, int) for v in sampleset.variables]
+            dtype=([(v, int) for v in variables]
                    + [('probability', float)]
                    + [('energy', float)])
         )
 
-        num_of_shots = sampleset.record.num_occurrences.sum()
-        for i, solution in enumerate(sampleset.data()):
-            for var in sampleset.variables:
-                result[var][i] = solution.sample[var]
-
-            result['probability'][i] = (
-                solution.num_occurrences / num_of_shots)
-            result['energy'][i] = solution.energy
-
-        return SolverResult(result, {"penalty_weights": penalty_weights}, [])
+        record = sampleset.record
+        columns = {v: i for i, v in enumerate(sampleset.variables)}
+        for var in variables:
+            result[var] = record.sample[:, columns[var]]
+        result['probability'] = (
+            record.num_occurrences / record.num_occurrences.sum())
+        result['energy'] = record.energy
+
+        return SolverResult(
+            result,
+            {"penalty_weights": penalty_weights,
+             "pruning_error": pruning_error},
+            [],
+        )
 
     def prepare_solver_result(self, result: defaultdict, arguments: npt.NDArray) -> SolverResult:
         sorted_keys = sorted(result.keys(), key=lambda x: int(''.join(filter(str.isdigit, x))))
@@ -128,20 +177,3 @@ class Advantage(Solver):
 
         return SolverResult(probabilities, parameters)
 
-
-def convert_qubo_keys(qubo: Polynomial) -> tuple[dict[tuple, float], float]:
-    new_qubo = defaultdict(float)
-    offset = 0.0
-
-    qubo, offset = qubo.separate_const()
-    for k, v in qubo.terms.items():
-        if len(k) == 1:
-            new_key = (k[0], k[0])
-        elif len(k) > 2:
-            raise ValueError("Only supports quadratic model")
-        else:
-            new_key = k
-
-        new_qubo[new_key] += v
-
-    return (new_qubo, offset)
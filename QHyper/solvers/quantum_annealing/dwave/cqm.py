@@ -49,22 +49,23 @@ class CQM(Solver):
         sampler = LeapHybridCQMSampler(token=self.token or DWAVE_API_TOKEN)
         solutions = sampler.sample_cqm(cqm, self.time).aggregate()
 
+        variables = self.problem.variable_registry.copy().sort(
+            solutions.variables)
         recarray = np.recarray(
             (len(solutions),),
-            dtype=([(v, int) for v in solutions.variables]
+            dtype=([(v, int) for v in variables]
                    + [('probability', float)]
                    + [('energy', float)]
                    + [('is_feasible', bool)])
         )
 
-        num_of_shots = solutions.record.num_occurrences.sum()
-        for i, solution in enumerate(solutions.data()):
-            for var in solutions.variables:
-                recarray[var][i] = solution.sample[var]
-
-            recarray['probability'][i] = (
-                solution.num_occurrences / num_of_shots)
-            recarray['energy'][i] = solution.energy
-            recarray['is_feasible'][i] = solution.is_feasible
+        record = solutions.record
+        columns = {v: i for i, v in enumerate(solutions.variables)}
+        for var in variables:
+            recarray[var] = record.sample[:, columns[var]]
+        recarray['probability'] = (
+            record.num_occurrences / record.num_occurrences.sum())
+        recarray['energy'] = record.energy
+        recarray['is_feasible'] = record.is_feasible
 
         return SolverResult(recarray, {}, [])
@@ -0,0 +1,146 @@
+# This work was supported by the EuroHPC PL infrastructure funded at the
+# Smart Growth Operational Programme (2014-2020), Measure 4.2
+# under the grant agreement no. POIR.04.02.00-00-D014/20-00
+
+
+"""Module with the registry of the variables.
+
+Variables in QHyper are identified by their names e.g. x0, s_1.
+The registry assigns dense integer ids to the names once, so the
+polynomials, constraints and solvers of one problem can share the same,
+stable order of the variables (e.g. order of the qubits) and refer to the
+variables by ids instead of strings.
+
+.. rubric:: Main class
+
+.. autosummary::
+    :toctree: generated
+
+    VariableRegistry  -- registry of the variables.
+
+.. rubric:: Functions
+
+.. autofunction:: natural_key
+
+"""
+
+import re
+from typing import Iterable, Iterator
+
+import numpy as np
+import numpy.typing as npt
+
+
+_NAME_PATTERN = re.compile(r'^(.*?)(\d+)$')
+
+
+def natural_key(name: str) -> tuple[str, int, str]:
+    """Key for sorting variable names by prefix and numeric suffix,
+    so x2 is placed before x10.
+
+    Parameters
+    ----------
+    name : str
+        Name of the variable.
+
+    Returns
+    -------
+    tuple[str, int, str]
+        Prefix, number (-1 if there is no numeric suffix) and the name.
+    """
+    match = _NAME_PATTERN.match(name)
+    if match is None:
+        return name, -1, name
+    return match.group(1), int(match.group(2)), name
+
+
+class VariableRegistry:
+    """
+    Class assigning dense integer ids to the variable names.
+
+    Ids are assigned in the order of registration and never change,
+    new variables (e.g. slack variables created by the converter)
+    are appended at the end.
+
+    Parameters
+    ----------
+    variables : Iterable[str], optional
+        Variables to be registered in the given order.
+    """
+
+    def __init__(self, variables: Iterable[str] = ()) -> None:
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+        for variable in variables:
+            self.register(variable)
+
+    @classmethod
+    def from_variables(cls, variables: Iterable[str]) -> 'VariableRegistry':
+        """Creates registry with variables sorted by
+        :py:func:`natural_key`."""
+        return cls(sorted(set(variables), key=natural_key))
+
+    def copy(self) -> 'VariableRegistry':
+        """Returns an independent copy of the registry, e.g. for ordering
+        slack variables without registering them in the problem."""
+        registry = VariableRegistry()
+        registry._ids = dict(self._ids)
+        registry._names = list(self._names)
+        return registry
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, variable: object) -> bool:
+        return variable in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __repr__(self) -> str:
+        return f"VariableRegistry({self._names})"
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Names of the registered variables ordered by their ids."""
+        return tuple(self._names)
+
+    def register(self, variable: str) -> int:
+        """Registers the variable if needed and returns its id."""
+        if variable not in self._ids:
+            self._ids[variable] = len(self._names)
+            self._names.append(variable)
+        return self._ids[variable]
+
+    def register_many(self, variables: Iterable[str]
+                      ) -> npt.NDArray[np.int64]:
+        """Registers the variables and returns their ids.
+        Unknown variables are registered in the natural order."""
+        variables = list(variables)
+        for variable in sorted(set(variables) - self._ids.keys(),
+                               key=natural_key):
+            self.register(variable)
+        return self.indices(variables)
+
+    def index(self, variable: str) -> int:
+        """Returns id of the registered variable."""
+        try:
+            return self._ids[variable]
+        except KeyError:
+            raise ValueError(f"Variable {variable} is not registered")
+
+    def indices(self, variables: Iterable[str]) -> npt.NDArray[np.int64]:
+        """Returns ids of the registered variables."""
+        variables = list(variables)
+        try:
+            return np.fromiter(
+                (self._ids[variable] for variable in variables),
+                dtype=np.int64, count=len(variables))
+        except KeyError as e:
+            raise ValueError(f"Variable {e.args[0]} is not registered")
+
+    def sort(self, variables: Iterable[str]) -> list[str]:
+        """Sorts the variables by their ids, registering unknown ones."""
+        variables = list(variables)
+        order = np.argsort(self.register_many(variables), kind='stable')
+        return [variables[i] for i in order]
@@ -1,8 +1,13 @@
+import itertools
+
+import numpy as np
+import pytest
 import sympy
 from dimod import ConstrainedQuadraticModel, DiscreteQuadraticModel, BinaryPolynomial, make_quadratic_cqm, BINARY
 
-from QHyper.polynomial import Polynomial
-from QHyper.problems.base import Problem
+from QHyper.polynomial import Polynomial, CompiledPolynomial
+from QHyper.problems.base import Problem, ProblemException
+from QHyper.problems.tsp import TravelingSalesmanProblem
 from QHyper.parser import from_sympy
 from QHyper.converter import Converter
 from QHyper.constraint import Constraint, Operator, MethodsForInequalities
@@ -267,6 +272,326 @@ def test_to_cqm():
         created_cqm.add_variable(BINARY, str(variable))
 
     lhs = [tuple([*key, value]) for key, value in constraint_le.lhs.terms.items()]
-    created_cqm.add_constraint(lhs, constraint_le.operator.value, label=0)
+    created_cqm.add_constraint(
+        lhs, constraint_le.operator.value, rhs=1, label=0)
+
+    assert cqm.is_equal(created_cqm)
+    assert list(cqm.variables) == ["x0", "x1"]
+
+
+def test_create_qubo_from_compiled():
+    objective_function = Polynomial({("x0",): 5, ("x1",): 2, ("x0", "x1"): 1})
+    constraint_eq = Constraint(
+        Polynomial({("x0",): 1, ("x1",): 1}).compile(), Polynomial(1))
+
+    problem = SimpleProblem(
+        objective_function, [constraint_eq],
+        MethodsForInequalities.UNBALANCED_PENALIZATION)
+    compiled_problem = SimpleProblem(
+        objective_function.compile(), [constraint_eq],
+        MethodsForInequalities.UNBALANCED_PENALIZATION)
+
+    qubo = Converter.create_qubo(problem, [1., 6.])
+    compiled_qubo = Converter.create_qubo(compiled_problem, [1., 6.])
+
+    assert isinstance(compiled_qubo, CompiledPolynomial)
+    assert compiled_qubo == qubo
+
+
+def test_create_binary_qubo():
+    objective_function = Polynomial({("x0",): 5, ("x1",): 2, ("x0", "x1"): 1})
+    constraint_eq = Constraint(
+        Polynomial({("x0",): 1, ("x1",): 1}), Polynomial(1), Operator.EQ)
+
+    problem = SimpleProblem(
+        objective_function, [constraint_eq],
+        MethodsForInequalities.UNBALANCED_PENALIZATION)
+    qubo = Converter.create_qubo(problem, [1., 6.], binary=True)
+
+    assert qubo.binary
+    assert qubo == {
+        ("x0", "x1"): 13,
+        ("x0",): -1,
+        ("x1",): -4,
+        (): 6,
+    }
+
+
+def test_parametric_qubo():
+    objective_function = Polynomial(
+        {("x0",): 5, ("x1",): -2, ("x0", "x2"): 1, ("x2", "x2"): 3})
+    constraints = [
+        Constraint(Polynomial({("x0",): 1, ("x1",): 1}).compile(),
+                   Polynomial(1), Operator.EQ),
+        Constraint(Polynomial({("x1",): 2, ("x2",): 1}), Polynomial(2),
+                   Operator.LE, MethodsForInequalities.SLACKS_LOG_2,
+                   label="s"),
+        Constraint(Polynomial({("x0",): 1, ("x2",): 1}), Polynomial(1),
+                   Operator.LE,
+                   MethodsForInequalities.UNBALANCED_PENALIZATION,
+                   group=1),
+        Constraint(Polynomial({("x1",): 1, ("x2",): 1}), Polynomial(1),
+                   Operator.LE,
+                   MethodsForInequalities.UNBALANCED_PENALIZATION,
+                   group=1),
+    ]
+    problem = SimpleProblem(objective_function, constraints, None)
+
+    for binary in [False, True]:
+        parametric_qubo = Converter.create_parametric_qubo(problem, binary)
+        assert parametric_qubo.num_weights == 5
+        for weights in [[1., 2., 3., 4., 5.], [0.5, 0., 1., -1., 2.]]:
+            qubo = parametric_qubo(weights)
+            expected = Converter.create_qubo(problem, weights, binary)
+            assert qubo.binary == binary
+            assert qubo.to_polynomial().terms.keys() == expected.terms.keys()
+            for term, coefficient in expected.terms.items():
+                assert qubo.terms[term] == pytest.approx(coefficient)
+
+    # slack variables aren't registered in the problem
+    Converter.to_bqm(problem, [1.] * 5)
+    Converter.to_ising(problem, [1.] * 5)
+    assert problem.variable_registry.names == ("x0", "x1", "x2")
+
+
+def test_square():
+    linear = Polynomial({("x0",): 2, ("x1",): -1, ("y",): 3, (): -4})
+    for polynomial in [linear, linear.as_binary(), linear - linear,
+                       Polynomial({("x0", "x1"): 1, ("x2",): 2}),
+                       linear.compile()]:
+        assert Converter.square(polynomial) == polynomial ** 2
+
+
+def test_to_bqm():
+    objective_function = Polynomial(
+        {("x10",): 5, ("x2",): -2, ("x2", "x10"): 1, ("x3", "x3"): 3})
+    constraint_eq = Constraint(
+        Polynomial({("x10",): 1, ("x2",): 1}), Polynomial(1), Operator.EQ)
+    problem = SimpleProblem(objective_function, [constraint_eq], None)
+
+    bqm = Converter.to_bqm(problem, [1., 2.])
+    assert list(bqm.variables) == ["x2", "x3", "x10"]
+
+    qubo = Converter.create_qubo(problem, [1., 2.])
+    variables = list(bqm.variables)
+    samples = np.array(list(itertools.product([0, 1], repeat=3)))
+    energies = bqm.energies((samples, variables))
+    assert np.allclose(energies, qubo.evaluate_batch(samples, variables))
+
+    with pytest.raises(ValueError):
+        Converter.polynomial_to_bqm(Polynomial({("x0", "x1", "x2"): 1}))
+
+
+def test_to_cqm_rhs_and_higher_order():
+    objective_function = Polynomial({("x0", "x1", "x2"): 2, ("x1",): -1})
+    constraint = Constraint(
+        Polynomial({("x0",): 2, ("x1", "x1"): 1, (): 1}),
+        Polynomial({("x2",): 1, (): 2}), Operator.LE,
+        MethodsForInequalities.SLACKS_LOG_2)
+    problem = SimpleProblem(objective_function, [constraint], None)
+
+    cqm = Converter.to_cqm(problem)
+
+    assert cqm.constraints[0].lhs.linear == {"x0": 2, "x1": 1, "x2": -1}
+    assert cqm.constraints[0].rhs == 1
+    assert cqm.objective.energy({v: 1 for v in cqm.variables}) == 1
 
-    assert created_cqm.variables == cqm.variables
+
+def test_to_dqm_cases():
+    objective_function = Polynomial({
+        ("x0",): 1, ("x1",): 2, ("x3",): -1,
+        ("x0", "x2"): 3, ("x1", "x3"): 3, ("x2", "x4"): -2, (): 5,
+    })
+    problem = SimpleProblem(objective_function, [], None)
+
+    dqm = Converter.to_dqm(problem, cases=2)
+
+    assert list(dqm.variables) == ["x0", "x1", "x2"]
+    assert dqm.num_cases("x0") == 2
+    assert list(dqm.get_linear("x0")) == [2, 2]
+    assert list(dqm.get_linear("x1")) == [-1, -1]
+    assert dqm.get_quadratic("x0", "x1") == {(0, 0): 3, (1, 1): 3}
+    assert dqm.get_quadratic("x1", "x2") == {(0, 0): -2, (1, 1): -2}
+    assert dqm.offset == 5
+
+
+def test_to_ising():
+    objective_function = Polynomial({
+        ("x0",): 1, ("x0", "x1"): 2, ("x1", "x2", "x10"): -3,
+        ("x10", "x10"): 1.5, ("x2",): -1, (): 2,
+    })
+    constraint_eq = Constraint(
+        Polynomial({("x0",): 1, ("x1",): 1}), Polynomial(1), Operator.EQ)
+    problem = SimpleProblem(objective_function, [constraint_eq], None)
+
+    ising = Converter.to_ising(problem, [1., 2.])
+    assert ising.variables == ["x0", "x1", "x2", "x10"]
+    assert ising.higher_order == {(1, 2, 3): 0.375}
+
+    qubo = Converter.create_qubo(problem, [1., 2.], binary=True)
+    bits = np.array(list(itertools.product([0, 1], repeat=4)))
+    assert np.allclose(ising.energies(1 - 2 * bits),
+                       qubo.evaluate_batch(bits, ising.variables))
+
+
+def test_bounded_slacks():
+    x0, x1, x2 = (Polynomial({(f"x{i}",): 1}) for i in range(3))
+    method = MethodsForInequalities.BOUNDED_SLACKS
+
+    # never violated, no penalty and no slack variables
+    always = Constraint(x0 + 2 * x1, Polynomial(5), Operator.LE, method, "a")
+    assert Converter.apply_bounded_slacks(always, [1.]) == Polynomial(0)
+
+    # rhs is 4, but the left hand side is at least 3
+    shifted = Constraint(x0 + x1 + 3, Polynomial(4), Operator.LE, method, "s")
+    penalty = Converter.apply_bounded_slacks(shifted, [2.])
+    slack = Polynomial({("s_0",): 1})
+    assert penalty == 2 * (x0 + x1 + slack + Polynomial(-1)) ** 2
+
+    constraints = [
+        shifted,
+        Constraint(x0 + x1 + x2, Polynomial(2), Operator.GE, method, "t"),
+        Constraint(3 * x0 - 2 * x1 + x2, Polynomial(1), Operator.LE,
+                   method, "u"),
+    ]
+    for constraint in constraints:
+        penalty = Converter.apply_bounded_slacks(constraint, [1.])
+        slacks = sorted(penalty.get_variables() - {"x0", "x1", "x2"})
+        for values in itertools.product([0, 1], repeat=3):
+            assignment = dict(zip(["x0", "x1", "x2"], values))
+            lhs = constraint.lhs.substitute(assignment).separate_const()[1]
+            feasible = (lhs <= 4 if constraint.label == "s"
+                        else lhs >= 2 if constraint.label == "t"
+                        else lhs <= 1)
+            minimum = min(
+                penalty.as_binary().substitute(
+                    {**assignment, **dict(zip(slacks, bits))}
+                ).separate_const()[1]
+                for bits in itertools.product([0, 1], repeat=len(slacks)))
+            assert (minimum == 0) == feasible
+
+
+def test_eliminate_equalities():
+    x = {name: Polynomial({(name,): 1}) for name in
+         ["x0", "x1", "x2", "y0", "y1", "y2"]}
+    objective = (2 * x["x0"] + 3 * x["x1"] + x["x0"] * x["y2"]
+                 + x["x2"] * x["y1"] - x["y0"])
+    one_hot = Constraint(x["x0"] + x["x1"], Polynomial(1))
+    rows = [
+        Constraint(x["x2"] + x["y0"] + x["y1"], Polynomial(1)),
+        Constraint(x["y1"] + x["y2"], Polynomial(1)),
+    ]
+    problem = SimpleProblem(objective, [one_hot] + rows, None)
+    reduced = Converter.eliminate_equalities(problem)
+
+    # x1 is in fewer terms of the objective than x0
+    assert reduced.substitutions["x1"] == 1 - x["x0"]
+    # y1 = 1 - y2 is substituted into x2 = 1 - y0 - y1
+    assert reduced.substitutions["x2"] == x["y2"] - x["y0"]
+    assert reduced.substitutions["y1"] == 1 - x["y2"]
+    assert not reduced.objective_function.get_variables() & set(
+        reduced.substitutions)
+    # x2 = y2 - y0 can be negative, the other expressions can't
+    assert [c.label for c in reduced.constraints] == ["x2_lower"]
+
+    variables = list(reduced.variable_registry)
+    for values in itertools.product([0, 1], repeat=len(variables)):
+        assignment = dict(zip(variables, values))
+        lifted = {
+            **assignment,
+            **{pivot: expression.substitute(assignment).separate_const()[1]
+               for pivot, expression in reduced.substitutions.items()}
+        }
+        binary = all(value in (0, 1) for value in lifted.values())
+        satisfied = all(
+            constraint.lhs.substitute(assignment).separate_const()[1]
+            <= constraint.rhs.separate_const()[1]
+            for constraint in reduced.constraints)
+        assert binary == satisfied
+        for constraint in problem.constraints:
+            assert constraint.lhs.substitute(lifted).separate_const()[1] == 1
+        assert (objective.substitute(lifted).separate_const()[1]
+                == reduced.objective_function.substitute(
+                    assignment).separate_const()[1])
+
+    contradiction = SimpleProblem(objective, [
+        Constraint(x["x0"], Polynomial(1)),
+        Constraint(x["x0"], Polynomial(0)),
+    ], None)
+    with pytest.raises(ProblemException):
+        Converter.eliminate_equalities(contradiction)
+
+
+def test_estimate_penalty_weights():
+    x0, x1, x2 = (Polynomial({(f"x{i}",): 1}) for i in range(3))
+    objective = -(2 * x0 + 5 * x1 + x0 * x1) + 3 * x2
+    problem = SimpleProblem(objective, [
+        Constraint(x0 + x1, Polynomial(1)),
+        Constraint(2 * x1 + 2 * x2, Polynomial(2)),
+    ], None)
+
+    # flipping x1 changes the objective by at most 6
+    assert Converter.estimate_penalty_weights(problem, "vlm") == [1, 6, 6]
+    assert Converter.estimate_penalty_weights(problem, "mqc") == [1, 5, 5]
+    assert Converter.estimate_penalty_weights(
+        problem, "upper_bound") == [1, 11, 11]
+    # the second constraint is violated at least by 2 ** 2
+    weights = Converter.estimate_penalty_weights(problem, "momc")
+    assert weights == [1, 6, 1.5]
+
+    qubo = Converter.create_qubo(problem, weights).compile()
+    variables = ["x0", "x1", "x2"]
+    bits = np.array(list(itertools.product([0, 1], repeat=3)))
+    best = bits[np.argmin(qubo.evaluate_batch(bits, variables))]
+    assert best.tolist() == [0, 1, 0]
+
+    grouped = SimpleProblem(objective, [
+        Constraint(x0 + x1, Polynomial(1), group=0),
+        Constraint(x1 + x2, Polynomial(1), group=0),
+    ], None)
+    assert len(Converter.estimate_penalty_weights(grouped)) == 2
+
+    with pytest.raises(ValueError):
+        Converter.estimate_penalty_weights(problem, "unknown")
+
+
+def test_eliminate_equalities_removes_qubits():
+    def qubits(problem):
+        parametric_qubo = Converter.create_parametric_qubo(problem)
+        return len(parametric_qubo([1.] * parametric_qubo.num_weights)
+                   .get_variables())
+
+    x = [Polynomial({(f"x{i}",): 1}) for i in range(4)]
+    one_hot = SimpleProblem(
+        2 * x[0] + x[1] * x[2] - x[3],
+        [Constraint(x[0] + x[1] + x[2] + x[3], Polynomial(1))], None)
+    tsp = TravelingSalesmanProblem(
+        3, cities_coords=[(0., 0.), (3., 0.), (0., 4.)])
+
+    for problem in [one_hot, tsp]:
+        assert qubits(Converter.eliminate_equalities(problem)) < qubits(
+            problem)
+        # slacks would replace the pivots, nothing is eliminated
+        reduced = Converter.eliminate_equalities(
+            problem, MethodsForInequalities.BOUNDED_SLACKS)
+        assert qubits(reduced) <= qubits(problem)
+
+    reduced = Converter.eliminate_equalities(one_hot)
+    assert qubits(reduced) == 3
+    assert [c.method_for_inequalities for c in reduced.constraints] == [
+        MethodsForInequalities.UNBALANCED_PENALIZATION]
+
+
+def test_eliminate_equalities_lift_missing_variables():
+    x = [Polynomial({(f"x{i}",): 1}) for i in range(4)]
+    problem = SimpleProblem(
+        x[2] - x[3], [Constraint(x[0] + x[1], Polynomial(1))], None)
+    reduced = Converter.eliminate_equalities(problem)
+    assert reduced.substitutions == {"x0": 1 - x[1]}
+
+    # x1 isn't in the QUBO, so the sampler doesn't return it
+    bqm = Converter.to_bqm(reduced, [1.])
+    assert set(bqm.variables) == {"x2", "x3"}
+    solution = np.rec.array([(0, 1, 1.)], dtype=[
+        ("x2", "i4"), ("x3", "i4"), ("probability", "f8")])
+    assert tuple(reduced.lift(solution)[0]) == (1, 0, 0, 1, 1.)
@@ -0,0 +1,101 @@
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+
+from QHyper.problems.maxcut import MaxCutProblem
+from QHyper.problems.base import Problem
+from QHyper.solvers.base import Solver, SolverResult
+from QHyper.solvers.decomposition import DecompositionSolver, split_components
+from QHyper.solvers.gate_based.pennylane.qaoa import QAOA
+from QHyper.optimizers import OptimizationParameter
+
+
+@dataclass
+class BruteForce(Solver):
+    problem: Problem
+
+    def solve(self) -> SolverResult:
+        variables = list(self.problem.variable_registry)
+        bits = np.array(list(itertools.product((0, 1), repeat=len(variables))))
+        energies = self.problem.objective_function.evaluate_batch(
+            bits, variables)
+        best = bits[energies == energies.min()]
+        recarray = np.recarray(
+            (len(best),),
+            dtype=[(v, 'i4') for v in variables] + [('probability', 'f8')])
+        for i, row in enumerate(best):
+            recarray[i] = *row, 1 / len(best)
+        return SolverResult(recarray, {})
+
+
+def test_split_components():
+    problem = MaxCutProblem([(0, 1), (1, 2), (3, 4)])
+    components, constant = split_components(problem.objective_function)
+
+    assert constant == 0
+    assert [component.get_variables() for component in components] == [
+        {'x0', 'x1', 'x2'}, {'x3', 'x4'}]
+    assert sum(components[1:], components[0]) == problem.objective_function
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_decomposition_solver(processes):
+    problem = MaxCutProblem([(0, 1), (1, 2), (3, 4)])
+    result = DecompositionSolver(
+        problem, BruteForce, processes=processes).solve()
+
+    assert result.probabilities.dtype.names == (
+        'x0', 'x1', 'x2', 'x3', 'x4', 'probability')
+    assert len(result.probabilities) == 4
+    assert result.probabilities.probability.sum() == pytest.approx(1)
+    for record in result.probabilities:
+        assert problem.get_score(record) == -3
+
+
+def test_decomposition_with_qaoa():
+    problem = MaxCutProblem([(0, 1), (2, 3)])
+    solver_args = {
+        'layers': 1,
+        'gamma': OptimizationParameter(init=[0.5]),
+        'beta': OptimizationParameter(init=[0.5]),
+    }
+    result = DecompositionSolver(problem, QAOA, solver_args).solve()
+    full = QAOA(problem, **solver_args).solve()
+
+    assert len(result.probabilities) == 16
+    expected = {tuple(record)[:4]: record.probability
+                for record in full.probabilities}
+    for record in result.probabilities:
+        assert record.probability == pytest.approx(
+            expected[tuple(record)[:4]])
+
+
+def test_combine_most_probable():
+    problem = MaxCutProblem([(0, 1), (2, 3)])
+    solver = DecompositionSolver(
+        problem, BruteForce, limit_results=3)
+    components = solver.get_components([1.])
+    results = []
+    for component, probabilities in zip(components, [[.5, .3, .2], [.6, .4]]):
+        variables = list(component.variable_registry)
+        recarray = np.recarray(
+            (3,), dtype=[(v, 'i4') for v in variables]
+            + [('probability', 'f8')])
+        for i, probability in enumerate(probabilities):
+            recarray[i] = i & 1, i >> 1, probability
+        results.append(SolverResult(recarray[:len(probabilities)], {}))
+
+    combined = solver._combine(components, results)
+    assert combined.probability.tolist() == pytest.approx([.3, .2, .18])
+
+    solver.limit_results = None
+    assert len(solver._combine(components, results)) == 6
+
+    # without components every variable is set to 0
+    for limit_results in [None, 3]:
+        solver.limit_results = limit_results
+        combined = solver._combine([], [])
+        assert len(combined) == 1 and combined.probability[0] == 1
+        assert combined[['x0', 'x1', 'x2', 'x3']][0].tolist() == (0,) * 4
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from QHyper.energy_tracker import EnergyTracker
+from QHyper.polynomial import Polynomial
+
+
+QUBO = Polynomial({
+    ('x0',): 2, ('x1',): -3, ('x2',): 1, ('x3', 'x3'): -1,
+    ('x0', 'x1'): 4, ('x1', 'x2'): -2, ('x0', 'x3'): 1.5, ('x2', 'x3'): -1,
+    (): 0.5,
+})
+VARIABLES = ['x0', 'x1', 'x2', 'x3']
+
+
+def energy(state):
+    return QUBO.evaluate_batch(np.array([state]), VARIABLES)[0]
+
+
+def test_energy_tracker():
+    rng = np.random.default_rng(0)
+    tracker = EnergyTracker(QUBO, variable_order=VARIABLES)
+    assert tracker.energy == pytest.approx(0.5)
+
+    for i in rng.integers(len(tracker), size=50):
+        state = tracker.state.copy()
+        expected = energy(state ^ np.eye(4, dtype=np.int8)[i]) - energy(state)
+        assert tracker.delta(i) == pytest.approx(expected)
+        assert tracker.flip(i) == pytest.approx(expected)
+        assert tracker.energy == pytest.approx(energy(tracker.state))
+        assert all(
+            tracker.deltas[j] == pytest.approx(
+                energy(tracker.state ^ np.eye(4, dtype=np.int8)[j])
+                - tracker.energy)
+            for j in range(4))
+
+    tracker.reset([1, 0, 1, 1])
+    assert tracker.energy == pytest.approx(energy([1, 0, 1, 1]))
+    assert tracker.assignment() == {'x0': 1, 'x1': 0, 'x2': 1, 'x3': 1}
+
+
+def test_energy_tracker_invalid():
+    with pytest.raises(ValueError):
+        EnergyTracker(Polynomial({('x0', 'x1', 'x2'): 1}))
+    with pytest.raises(ValueError):
+        EnergyTracker(QUBO, state=[0, 1])
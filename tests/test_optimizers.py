@@ -68,3 +68,12 @@ def test_grid():
         step=[0.5, 0.5, 0.5], min=[-1, -1, -1], max=[1, 1, 1])
     result = minimizer.minimize(function, init)
     assert result.value == pytest.approx(0, rel=1e-6, abs=1e-6)
+
+
+def test_grid_parallel():
+    init = OptimizationParameter(
+        step=[0.5, 0.5, 0.5], min=[-1, -1, -1], max=[1, 1, 1])
+    serial = GridSearch(processes=1).minimize(function, init)
+    parallel = GridSearch(processes=2).minimize(function, init)
+    assert parallel.value == serial.value
+    assert np.array_equal(parallel.params, serial.params)
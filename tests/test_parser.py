@@ -0,0 +1,39 @@
+import ast
+
+import pytest
+import sympy
+
+from QHyper.parser import Parser, ParserException, from_str, from_sympy
+from QHyper.polynomial import Polynomial
+
+
+def parse_with_ast(equation: str) -> Polynomial:
+    parser = Parser()
+    parser.visit(ast.parse(equation))
+    return parser.polynomial
+
+
+@pytest.mark.parametrize("equation", [
+    "x0*x1 + 2*x0 - 3",
+    "-x**2*y + 2.5e-1*x - -3 + 2**3",
+    "+x0 - x1*x2*x0 - 0.5",
+    "4",
+    "2*(x + 1) - y",
+])
+def test_from_str(equation):
+    assert from_str(equation) == parse_with_ast(equation)
+
+
+def test_from_str_invalid():
+    with pytest.raises(ParserException):
+        from_str("x / y")
+
+
+def test_from_sympy():
+    x, y, z = sympy.symbols("x y z")
+    for expression in [(x + 2*y - 1)**2, x*y*z - 3*z + 7,
+                       (x + y) * (x - y) * z, sympy.Integer(3)]:
+        assert from_sympy(expression) == parse_with_ast(
+            str(sympy.expand(expression)))
+    assert from_sympy(x / 2 + sympy.Rational(1, 4)) == {
+        ('x',): 0.5, (): 0.25}
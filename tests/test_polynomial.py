@@ -0,0 +1,269 @@
+import pickle
+
+import numpy as np
+import pytest
+import scipy.sparse
+
+from QHyper.polynomial import (
+    Polynomial, CompiledPolynomial, FrozenPolynomial, PolynomialBuilder)
+from QHyper.variables import VariableRegistry, natural_key
+
+
+P = Polynomial({('x0',): 2, ('x0', 'x1'): -1, ('x2',): 3, (): 4})
+Q = Polynomial({('x1',): 1, ('x2', 'x3'): 2, (): -1})
+
+
+def test_compile_roundtrip():
+    compiled = P.compile()
+
+    assert compiled.variables == ('x0', 'x1', 'x2')
+    assert compiled.degree() == 2
+    assert len(compiled) == 4
+    assert compiled.to_polynomial() == P
+
+
+def test_compiled_arithmetic():
+    p, q = P.compile(), Q.compile()
+
+    assert p + q == P + Q
+    assert p - q == P - Q
+    assert p * q == P * Q
+    assert -p == -P
+    assert 2.5 * p == 2.5 * P
+    assert p ** 2 == P ** 2
+    assert P + q == P + Q
+    assert P * q == P * Q
+
+
+def test_merge_duplicates():
+    compiled = CompiledPolynomial(
+        ('a', 'b'),
+        np.array([[1, 0], [0, 1], [0, -1], [-1, -1]]),
+        np.array([1., 2., 3., 0.])
+    ).merge_duplicates()
+
+    assert compiled.terms == {('a',): 3., ('a', 'b'): 3.}
+    assert compiled.separate_const() == ({('a',): 3., ('a', 'b'): 3.}, 0.)
+
+
+def test_inplace_accumulation():
+    polynomial = Polynomial({('x0',): 1})
+    same = polynomial
+    polynomial += Polynomial({('x1', 'x0'): 2, ('x0',): -1})
+    polynomial -= 3
+
+    assert polynomial is same
+    assert polynomial == {('x0', 'x1'): 2, (): -3}
+
+    polynomial += polynomial
+    assert polynomial == {('x0', 'x1'): 4, (): -6}
+
+    for first, second in [(True, False), (False, True)]:
+        a = Polynomial({('x', 'x'): 2, ('x', 'y'): 1}, binary=first)
+        b = Polynomial({('x',): -1, ('y', 'y'): 3}, binary=second)
+        expected = a + b
+        a += b
+        assert a == expected
+        assert a.binary == expected.binary
+
+
+def test_polynomial_builder():
+    builder = PolynomialBuilder()
+    builder.add_term(('x1', 'x0'), 2).add_term(('x0', 'x1'), -1)
+    builder.add_terms([(('x2',), 1), (('x2',), -1)]).add_constant(5)
+    builder.add_polynomial(P, scale=2)
+
+    assert len(builder) == 9
+    assert builder.build() == {
+        ('x0', 'x1'): -1, ('x0',): 4, ('x2',): 6, (): 13}
+    assert Polynomial.from_canonical({('x0',): 1.}) == {('x0',): 1.}
+
+
+def test_square():
+    assert P.square() == P * P
+    assert P ** 3 == P * P * P
+    assert P.compile().square() == P * P
+
+    power = P ** 1
+    power += Q
+    assert power == P + Q
+    assert P == {('x0',): 2, ('x0', 'x1'): -1, ('x2',): 3, (): 4}
+    with pytest.raises(ValueError):
+        P ** -1
+
+
+def test_binary_polynomial():
+    polynomial = Polynomial({('x', 'x'): 2, ('x',): 1, ('x', 'y'): 1},
+                            binary=True)
+    assert polynomial == {('x',): 3, ('x', 'y'): 1}
+
+    one_hot = Polynomial({('x',): 1, ('y',): 1, (): -1}, binary=True)
+    assert one_hot ** 2 == {('x', 'y'): 2, ('x',): -1, ('y',): -1, (): 1}
+    assert (one_hot * P).binary
+    assert P.as_binary() * P == (P * P).as_binary()
+    assert P.compile().as_binary().square() == (P * P).as_binary()
+
+
+def test_evaluate_batch():
+    variable_order = ['x2', 'x0', 'x1']
+    bits = np.array([
+        [0, 0, 0],
+        [1, 0, 0],
+        [0, 1, 1],
+        [1, 1, 1],
+    ], dtype=np.uint8)
+
+    assert np.allclose(P.evaluate_batch(bits, variable_order), [4, 7, 5, 8])
+    assert np.allclose(
+        P.compile().evaluate_batch(bits, variable_order, chunk_size=3),
+        [4, 7, 5, 8])
+
+
+def test_variable_registry():
+    registry = VariableRegistry.from_variables(['x10', 'x2', 's0', 'x1'])
+    assert registry.names == ('s0', 'x1', 'x2', 'x10')
+
+    assert registry.sort(['x10', 'y', 'x1']) == ['x1', 'x10', 'y']
+    assert registry.index('y') == 4
+    assert natural_key('x2') < natural_key('x10')
+
+    copy = registry.copy()
+    copy.register('z')
+    assert 'z' in copy and 'z' not in registry
+
+    p = P.compile(registry)
+    q = Q.compile(registry)
+    assert q.variables == registry.names
+    assert q.variables[:len(p.variables)] == p.variables
+    assert p + q == P + Q
+    assert p * q == P * Q
+
+
+def test_fingerprint():
+    reordered = Polynomial({(): 4, ('x2',): 3, ('x1', 'x0'): -1, ('x0',): 2})
+    assert P.fingerprint() == reordered.fingerprint()
+    assert P.fingerprint() == P.compile().fingerprint()
+    assert P.fingerprint() == (P + 1e-13).fingerprint()
+    assert P.fingerprint() != (P + 1e-3).fingerprint()
+    assert P.fingerprint() != Q.fingerprint()
+
+
+def test_frozen_polynomial():
+    frozen = P.freeze()
+    assert isinstance(frozen, FrozenPolynomial)
+    assert frozen == P
+    assert {frozen: 1}[FrozenPolynomial(P.terms)] == 1
+
+    with pytest.raises(TypeError):
+        frozen.terms[('x0',)] = 5
+    with pytest.raises(AttributeError):
+        frozen.binary = True
+
+    same = frozen
+    frozen += Q
+    assert same == P and frozen == P + Q
+    assert pickle.loads(pickle.dumps(same)) == P
+
+    # reading a missing term doesn't insert it
+    with pytest.raises(KeyError):
+        same.terms[('y',)]
+    assert ('y',) not in same.terms
+    assert same == P and hash(same) == hash(P.freeze())
+    assert same - Q == P - Q and same.separate_const()[1] == 4
+
+
+def test_qubo_matrix():
+    matrix = np.array([[1., 2., 0.], [3., 0., -1.], [0., 1., 0.]])
+    polynomial = Polynomial.from_qubo_matrix(
+        matrix, linear=[0, 4, 0], offset=2, names=['a', 'b', 'c'])
+    assert polynomial == {
+        ('a', 'a'): 1, ('a', 'b'): 5, ('b',): 4, (): 2}
+    assert Polynomial.from_qubo_matrix(
+        scipy.sparse.csr_matrix(matrix), names=['a', 'b', 'c'],
+        binary=True) == {('a',): 1, ('a', 'b'): 5}
+
+    qubo = Polynomial({('x10', 'x2'): 3, ('x2', 'x2'): 1, ('x1',): -2,
+                       (): 0.5})
+    upper, linear, offset, order = qubo.to_sparse_qubo()
+    assert order == ['x1', 'x2', 'x10']
+    assert np.array_equal(upper.toarray(),
+                          [[0, 0, 0], [0, 1, 3], [0, 0, 0]])
+    assert np.array_equal(linear, [-2, 0, 0]) and offset == 0.5
+    assert Polynomial.from_qubo_matrix(upper, linear, offset, order) == qubo
+
+    with pytest.raises(ValueError):
+        (P * Q).to_sparse_qubo()
+
+
+def test_save_and_load(tmp_path):
+    path = tmp_path / "polynomial.npz"
+    P.as_binary().save(path)
+
+    for mmap in (True, False):
+        loaded = Polynomial.load(path, mmap=mmap)
+        assert isinstance(loaded, CompiledPolynomial)
+        assert loaded.binary
+        assert loaded.to_polynomial() == P.as_binary()
+        assert loaded + Q == P + Q
+        assert loaded.square().merge_duplicates() == (P * P).as_binary()
+        assert -loaded == -P
+
+    Polynomial(0).save(path)
+    assert Polynomial.load(path) == Polynomial(0)
+
+
+def test_substitute():
+    assert P.substitute({'x0': 1}) == {('x1',): -1, ('x2',): 3, (): 6}
+    assert P.substitute({'x0': 0, 'x2': 1}) == {(): 7}
+    assert P.substitute({'y': 1}) == P
+    assert P.as_binary().substitute({'x0': 1}).binary
+    assert P.compile().substitute({'x0': 1}) == P.substitute({'x0': 1})
+    assert (P * P).substitute({'x1': 1}) == (P.substitute({'x1': 1})) ** 2
+
+
+def test_prune_and_quantize():
+    poly = Polynomial({('x0',): 10, ('x0', 'x1'): -0.01, ('x2',): 0.4,
+                       ('x1',): -3, (): 0.001})
+    pruned, error = poly.prune(abs_tol=0.1)
+    assert pruned == {('x0',): 10, ('x2',): 0.4, ('x1',): -3, (): 0.001}
+    assert error == pytest.approx(0.01)
+    pruned, error = poly.prune(rel_tol=0.05)
+    assert pruned == {('x0',): 10, ('x1',): -3, (): 0.001}
+    assert error == pytest.approx(0.41)
+
+    quantized, error = poly.quantize(5)
+    assert quantized == {('x0',): 10, ('x1',): -4, (): 0.001}
+    assert error == pytest.approx(0.01 + 0.4 + 1)
+
+    compiled = poly.compile()
+    for (expected, bound), (result, compiled_bound) in [
+            (poly.prune(0.1, 0.05), compiled.prune(0.1, 0.05)),
+            (poly.quantize(5), compiled.quantize(5))]:
+        assert result.to_polynomial() == expected
+        assert compiled_bound == pytest.approx(bound)
+
+    bits = np.array([[0, 1, 1], [1, 1, 0], [1, 0, 1]])
+    variables = ['x0', 'x1', 'x2']
+    quantized, error = poly.quantize(5)
+    assert np.all(np.abs(poly.evaluate_batch(bits, variables)
+                         - quantized.evaluate_batch(bits, variables))
+                  <= error)
+
+    for levels in [0, -1]:
+        with pytest.raises(ValueError):
+            poly.quantize(levels)
+        with pytest.raises(ValueError):
+            compiled.quantize(levels)
+
+
+def test_pickle():
+    poly = P * Q + Polynomial({('x0', 'x0', 'x5'): 1.5})
+    for polynomial in [poly, poly.as_binary(), Polynomial(0), poly.freeze()]:
+        restored = pickle.loads(pickle.dumps(polynomial))
+        assert type(restored) is type(polynomial)
+        assert restored == polynomial
+        assert restored.binary == polynomial.binary
+
+    compiled = pickle.loads(pickle.dumps(poly.compile()))
+    assert compiled.indices.dtype == np.int64
+    assert compiled.to_polynomial() == poly
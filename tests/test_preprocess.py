@@ -0,0 +1,76 @@
+import itertools
+
+import numpy as np
+
+from QHyper.parser import from_str
+from QHyper.polynomial import Polynomial
+from QHyper.preprocess import find_persistencies, preprocess
+from QHyper.problems.base import Problem
+from QHyper.problems.knapsack import KnapsackProblem
+
+
+def minimum(polynomial, variables):
+    bits = np.array(list(itertools.product((0, 1), repeat=len(variables))))
+    return polynomial.evaluate_batch(bits, variables).min()
+
+
+def test_find_persistencies():
+    qubo = Polynomial({('a',): 3, ('a', 'b'): -1, ('b',): -2,
+                       ('b', 'c'): 1, ('c',): -0.5, ('c', 'd'): 2,
+                       ('d',): -1})
+    assignment = find_persistencies(qubo)
+
+    assert assignment == {'a': 0, 'b': 1, 'c': 0, 'd': 1}
+    assert qubo.substitute(assignment) == {(): -3}
+    assert minimum(qubo, ['a', 'b', 'c', 'd']) == -3
+
+
+def test_find_persistencies_random():
+    rng = np.random.default_rng(0)
+    variables = [f"x{i}" for i in range(8)]
+    for _ in range(20):
+        matrix = rng.integers(-3, 4, (8, 8)) * (rng.random((8, 8)) < 0.3)
+        qubo = Polynomial.from_qubo_matrix(
+            matrix, linear=rng.integers(-4, 5, 8), names=variables,
+            binary=True)
+        assignment = find_persistencies(qubo)
+        reduced = qubo.substitute(assignment)
+        assert minimum(reduced, variables) == minimum(qubo, variables)
+
+
+def test_preprocess():
+    problem = KnapsackProblem(max_weight=1, item_weights=[1, 2],
+                              item_values=[1, 1])
+    reduced = preprocess(problem, [1, 2, 2])
+
+    assert reduced.substitutions == {'x2': {(): 1.}}
+    assert reduced.constraints == []
+    assert reduced.objective_function.get_variables() == {'x0', 'x1'}
+
+    solution = np.rec.array([(1, 0, 1.)], dtype=[
+        ('x0', 'i4'), ('x1', 'i4'), ('probability', 'f8')])
+    assert tuple(reduced.lift(solution)[0]) == (1, 0, 1, 1.)
+    assert reduced.get_score(solution[0]) == -1
+
+
+def test_preprocess_lift_missing_variables():
+    class QuboProblem(Problem):
+        def __init__(self, objective_function):
+            self.objective_function = objective_function
+            self.constraints = []
+
+        def get_score(self, result, penalty=0):
+            return 0
+
+    problem = QuboProblem(from_str(
+        '5*x0 - 2*x0*x1 + 3*x0*x1*x2 + x2*x3 - 3*x3 - x2'))
+    reduced = preprocess(problem)
+
+    # x0 = 0 removes all terms of x1 and x3 = 1 removes all terms of x2
+    assert reduced.substitutions == {'x0': {}, 'x3': {(): 1.}}
+    assert reduced.objective_function.get_variables() == set()
+
+    solution = np.rec.array([(0.5,), (0.5,)], dtype=[('probability', 'f8')])
+    lifted = reduced.lift(solution)
+    assert lifted.dtype.names == ('x0', 'x1', 'x2', 'x3', 'probability')
+    assert [tuple(record) for record in lifted] == [(0, 0, 0, 1, 0.5)] * 2
@@ -1,10 +1,12 @@
 import numpy as np
 import networkx as nx
+import pytest
 
 from QHyper.problems.tsp import TravelingSalesmanProblem
 from QHyper.problems.community_detection import (
     CommunityDetectionProblem, Network)
 from QHyper.problems.knapsack import Item, KnapsackProblem
+from QHyper.problems.base import ProblemException
 
 np.random.seed(1244)
 
@@ -125,3 +127,40 @@ def test_CDP():
     }
 
     assert problem_no_one_hot.constraints == []
+
+
+def test_problem_fingerprint():
+    knapsack = KnapsackProblem(max_weight=2, item_weights=[1, 1],
+                               item_values=[2, 2])
+    same = KnapsackProblem(max_weight=2, item_weights=[1, 1],
+                           item_values=[2, 2])
+    other = KnapsackProblem(max_weight=2, item_weights=[1, 1],
+                            item_values=[2, 3])
+
+    assert knapsack.fingerprint() == same.fingerprint()
+    assert knapsack.fingerprint() != other.fingerprint()
+
+
+def test_fix_variables():
+    problem = KnapsackProblem(max_weight=2, item_weights=[1, 1, 1],
+                              item_values=[2, 2, 1])
+    reduced = problem.fix_variables({'x0': 1, 'x3': 0})
+
+    assert reduced.objective_function == {('x1',): -2, ('x2',): -1, (): -2}
+    assert [constraint.lhs for constraint in reduced.constraints] == [
+        {('x4',): -1, (): 1},
+        {('x1',): -1, ('x2',): -1, ('x4',): 2, (): -1}
+    ]
+    assert list(reduced.variable_registry) == ['x1', 'x2', 'x4']
+
+    solution = np.rec.array([(1, 0, 1, 0.5)], dtype=[
+        ('x1', 'i4'), ('x2', 'i4'), ('x4', 'i4'), ('probability', 'f8')])
+    lifted = reduced.lift(solution)
+    assert lifted.dtype.names == ('x0', 'x1', 'x2', 'x3', 'x4',
+                                  'probability')
+    assert tuple(lifted[0]) == (1, 1, 0, 0, 1, 0.5)
+    assert reduced.get_score(solution[0]) == problem.get_score(lifted[0])
+    assert reduced.get_score(solution[0]) == -4
+
+    with pytest.raises(ProblemException):
+        reduced.fix_variables({'x4': 0, 'x1': 0, 'x2': 0})
@@ -0,0 +1,64 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from QHyper.polynomial import Polynomial
+from QHyper.quadratize import quadratize, ROSENBERG, PAIRWISE
+
+
+HUBO = Polynomial({
+    ('x0', 'x1', 'x2'): 3, ('x0', 'x1', 'x3'): 2, ('x1', 'x2', 'x3'): -4,
+    ('x0', 'x1', 'x2', 'x3'): 1.5, ('x0', 'x2'): -1, ('x3',): 2, (): 1
+})
+
+
+def minimum_over_auxiliaries(quadratization, assignment):
+    auxiliaries = list(quadratization.auxiliaries)
+    qubo = quadratization.qubo
+    return min(
+        qubo.evaluate_batch(
+            np.array([list(assignment.values()) + list(values)]),
+            list(assignment) + auxiliaries)[0]
+        for values in itertools.product((0, 1), repeat=len(auxiliaries))
+    )
+
+
+@pytest.mark.parametrize("method", [ROSENBERG, PAIRWISE])
+@pytest.mark.parametrize("reduce_negative_terms", [True, False])
+def test_quadratize(method, reduce_negative_terms):
+    quadratization = quadratize(HUBO, method, reduce_negative_terms)
+    assert quadratization.qubo.degree() == 2
+
+    variables = sorted(HUBO.get_variables())
+    for values in itertools.product((0, 1), repeat=len(variables)):
+        assignment = dict(zip(variables, values))
+        expected = HUBO.evaluate_batch(np.array([values]), variables)[0]
+        assert minimum_over_auxiliaries(
+            quadratization, assignment) == pytest.approx(expected)
+
+        extended = quadratization.extend(assignment)
+        assert quadratization.qubo.evaluate_batch(
+            np.array([list(extended.values())]), list(extended)
+        )[0] == pytest.approx(expected)
+        assert quadratization.recover(extended) == assignment
+
+
+def test_pairwise_shares_auxiliaries():
+    polynomial = Polynomial({('a', 'c', 'd'): 1, ('b', 'c', 'd'): 1,
+                             ('c', 'd', 'e'): 1})
+    assert len(quadratize(polynomial, ROSENBERG).auxiliaries) == 3
+    assert len(quadratize(polynomial, PAIRWISE).auxiliaries) == 1
+    assert len(quadratize(-polynomial).auxiliaries) == 3
+    assert len(quadratize(-polynomial, reduce_negative_terms=False
+                          ).auxiliaries) == 1
+
+
+def test_recover_recarray():
+    quadratization = quadratize(HUBO)
+    dtype = ([(v, 'i4') for v in sorted(HUBO.get_variables())]
+             + [(v, 'i4') for v in quadratization.auxiliaries]
+             + [('probability', 'f8')])
+    recarray = np.recarray((1,), dtype=dtype)
+    assert quadratization.recover(recarray).dtype.names == (
+        'x0', 'x1', 'x2', 'x3', 'probability')
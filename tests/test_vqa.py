@@ -203,3 +203,60 @@ def test_hqaoa():
         '11110': 0.039326178,
         '11111': 0.041361077,
     })
+
+
+def test_qaoa_pruned_wires():
+    from QHyper.optimizers import OptimizationParameter
+    from QHyper.parser import from_str
+    from QHyper.problems.base import Problem
+    from QHyper.solvers.gate_based.pennylane.qaoa import QAOA
+
+    class QuboProblem(Problem):
+        def __init__(self, objective_function):
+            self.objective_function = objective_function
+            self.constraints = []
+
+        def get_score(self, result, penalty=0):
+            return 0
+
+    problem = QuboProblem(from_str('0.000001*x0 + x1*x2 - x1 + 2*x2'))
+    qaoa = QAOA(problem, layers=1, gamma=OptimizationParameter(init=[0.5]),
+                beta=OptimizationParameter(init=[0.5]), prune_abs_tol=1e-3)
+    cost_operator = qaoa.create_cost_operator(problem, [1.])
+    assert sorted(cost_operator.wires.tolist()) == ['x1', 'x2']
+
+    constant = QuboProblem(from_str('0.000001*x0 + 3'))
+    cost_operator = qaoa.create_cost_operator(constant, [1.])
+    assert cost_operator.wires.tolist() == ['x0']
+
+
+def test_qaoa_fingerprint_cached():
+    from QHyper.optimizers import OptimizationParameter
+    from QHyper.parser import from_str
+    from QHyper.problems.base import Problem
+    from QHyper.solvers.gate_based.pennylane.qaoa import QAOA
+
+    class QuboProblem(Problem):
+        def __init__(self, objective_function):
+            self.objective_function = objective_function
+            self.constraints = []
+            self.fingerprint_calls = 0
+
+        def fingerprint(self):
+            self.fingerprint_calls += 1
+            return super().fingerprint()
+
+        def get_score(self, result, penalty=0):
+            return 0
+
+    problem = QuboProblem(from_str('x0*x1 - x0 + 2*x1'))
+    qaoa = QAOA(problem, layers=1, gamma=OptimizationParameter(init=[0.5]),
+                beta=OptimizationParameter(init=[0.5]))
+    first = qaoa.create_cost_operator(problem, [1.])
+    qaoa.create_cost_operator(problem, [2.])
+    assert qaoa.create_cost_operator(problem, [1.]) is first
+    assert problem.fingerprint_calls == 1
+
+    other = QuboProblem(from_str('x0*x1 - x0 + 2*x1'))
+    assert qaoa.create_cost_operator(other, [1.]) is first
+    assert other.fingerprint_calls == 1